@@ -0,0 +1,13 @@
+document.addEventListener('DOMContentLoaded', function () {
+  var toastEl = document.querySelector('.flash-toast');
+  if (toastEl && window.bootstrap && bootstrap.Alert) {
+    setTimeout(function () {
+      try {
+        var alert = bootstrap.Alert.getOrCreateInstance(toastEl);
+        alert.close();
+      } catch (e) {
+        // ignore
+      }
+    }, 4000);
+  }
+});
@@ -0,0 +1,298 @@
+function showSection(section) {
+    // Hide all sections
+    document.querySelectorAll('.service-section').forEach(el => el.style.display = 'none');
+    // Show selected section
+    document.getElementById(section + '-section').style.display = 'block';
+    // Scroll to section
+    document.getElementById(section + '-section').scrollIntoView({ behavior: 'smooth' });
+}
+
+// Loan Form Handler
+document.getElementById('loan-form').addEventListener('submit', async function(e) {
+    e.preventDefault();
+    const formData = new FormData(this);
+    const resultsDiv = document.getElementById('loan-results');
+    resultsDiv.innerHTML = '<div class="text-center"><div class="spinner-border text-primary" role="status"></div><p class="mt-2">Checking eligibility...</p></div>';
+
+    try {
+        const response = await fetch('/fintech/check-loan', {
+            method: 'POST',
+            body: formData
+        });
+        const data = await response.json();
+        if (data.error) {
+            resultsDiv.innerHTML = `<div class="alert alert-danger">${data.error}</div>`;
+        } else {
+            displayLoanResults(data);
+        }
+    } catch (error) {
+        resultsDiv.innerHTML = '<div class="alert alert-danger">Error checking eligibility. Please try again.</div>';
+    }
+});
+
+// Insurance Form Handler
+document.getElementById('insurance-form').addEventListener('submit', async function(e) {
+    e.preventDefault();
+    const formData = new FormData(this);
+    const resultsDiv = document.getElementById('insurance-results');
+    resultsDiv.innerHTML = '<div class="text-center"><div class="spinner-border text-warning" role="status"></div><p class="mt-2">Analyzing risk...</p></div>';
+
+    try {
+        const response = await fetch('/fintech/analyze-insurance', {
+            method: 'POST',
+            body: formData
+        });
+        const data = await response.json();
+        if (data.error) {
+            resultsDiv.innerHTML = `<div class="alert alert-danger">${data.error}</div>`;
+        } else {
+            displayInsuranceResults(data);
+        }
+    } catch (error) {
+        resultsDiv.innerHTML = '<div class="alert alert-danger">Error analyzing insurance. Please try again.</div>';
+    }
+});
+
+// Subsidy Form Handler
+document.getElementById('subsidy-form').addEventListener('submit', async function(e) {
+    e.preventDefault();
+    const formData = new FormData(this);
+    const resultsDiv = document.getElementById('subsidy-results');
+    resultsDiv.innerHTML = '<div class="text-center"><div class="spinner-border text-success" role="status"></div><p class="mt-2">Finding subsidies...</p></div>';
+
+    try {
+        const response = await fetch('/fintech/get-subsidies', {
+            method: 'POST',
+            body: formData
+        });
+        const data = await response.json();
+        if (data.error) {
+            resultsDiv.innerHTML = `<div class="alert alert-danger">${data.error}</div>`;
+        } else {
+            displaySubsidyResults(data);
+        }
+    } catch (error) {
+        resultsDiv.innerHTML = '<div class="alert alert-danger">Error finding subsidies. Please try again.</div>';
+    }
+});
+
+function displayLoanResults(data) {
+    const resultsDiv = document.getElementById('loan-results');
+    let html = '<h5 class="fw-bold mb-3"><i class="fas fa-list me-2"></i>Loan Options for You</h5>';
+
+    data.loans.forEach((loan, index) => {
+        const eligibleClass = loan.eligible ? 'eligible' : 'not-eligible';
+        const badgeClass = loan.eligible ? 'bg-success' : 'bg-danger';
+        const badgeText = loan.eligible ? 'ELIGIBLE' : 'NOT ELIGIBLE';
+
+        html += `
+            <div class="card loan-card ${eligibleClass} mb-3">
+                <div class="card-body">
+                    <div class="d-flex justify-content-between align-items-start mb-2">
+                        <h5 class="card-title mb-0">${loan.loan_name}</h5>
+                        <span class="badge ${badgeClass}">${badgeText}</span>
+                    </div>
+                    <p class="text-muted mb-2"><i class="fas fa-building me-1"></i> ${loan.provider}</p>
+                    ${loan.eligible ? `
+                        <div class="row g-2 mb-3">
+                            <div class="col-md-3">
+                                <div class="bg-light rounded p-2 text-center">
+                                    <small class="text-muted d-block">Max Amount</small>
+                                    <strong class="text-primary">₹${loan.max_eligible_amount.toLocaleString()}</strong>
+                                </div>
+                            </div>
+                            <div class="col-md-3">
+                                <div class="bg-light rounded p-2 text-center">
+                                    <small class="text-muted d-block">Interest Rate</small>
+                                    <strong class="text-success">${loan.interest_rate}% p.a.</strong>
+                                </div>
+                            </div>
+                            <div class="col-md-3">
+                                <div class="bg-light rounded p-2 text-center">
+                                    <small class="text-muted d-block">Monthly EMI</small>
+                                    <strong>₹${loan.monthly_emi.toLocaleString()}</strong>
+                                </div>
+                            </div>
+                            <div class="col-md-3">
+                                <div class="bg-light rounded p-2 text-center">
+                                    <small class="text-muted d-block">Tenure</small>
+                                    <strong>${loan.tenure_months} months</strong>
+                                </div>
+                            </div>
+                        </div>
+                    ` : ''}
+                    <p class="mb-2"><i class="fas fa-info-circle text-info me-1"></i> ${loan.reason}</p>
+                    ${loan.eligible ? `
+                        <details class="mt-2" ontoggle="loadSchedule(this, ${loan.max_eligible_amount}, ${loan.interest_rate}, ${loan.tenure_months})">
+                            <summary class="text-primary" style="cursor: pointer;">View Repayment Schedule</summary>
+                            <div class="schedule-body mt-2"><small class="text-muted">Loading...</small></div>
+                        </details>
+                    ` : ''}
+                    <details class="mt-2">
+                        <summary class="text-primary" style="cursor: pointer;">View Documents Required</summary>
+                        <ul class="mt-2 mb-0">
+                            ${loan.documents_required.map(doc => `<li>${doc}</li>`).join('')}
+                        </ul>
+                        <p class="mt-2 mb-0"><strong>Apply at:</strong> ${loan.apply_at}</p>
+                    </details>
+                </div>
+            </div>
+        `;
+    });
+
+    resultsDiv.innerHTML = html;
+}
+
+async function loadSchedule(details, principal, rate, tenure) {
+    if (!details.open || details.dataset.loaded) return;
+    details.dataset.loaded = '1';
+    const body = details.querySelector('.schedule-body');
+    const formData = new FormData();
+    formData.append('principal', principal);
+    formData.append('annual_rate', rate);
+    formData.append('tenure_months', tenure);
+
+    try {
+        const response = await fetch('/fintech/amortization', { method: 'POST', body: formData });
+        const data = await response.json();
+        if (data.error) {
+            body.innerHTML = `<div class="alert alert-danger">${data.error}</div>`;
+            return;
+        }
+        const s = data.schedule;
+        let rows = '';
+        s.month.forEach((m, i) => {
+            rows += `<tr><td>${m}</td><td>₹${s.payment[i].toLocaleString()}</td><td>₹${s.principal[i].toLocaleString()}</td><td>₹${s.interest[i].toLocaleString()}</td><td>₹${s.balance[i].toLocaleString()}</td></tr>`;
+        });
+        body.innerHTML = `
+            <p class="mb-2 small">Total interest: <strong>₹${data.total_interest.toLocaleString()}</strong> &middot; Total payment: <strong>₹${data.total_payment.toLocaleString()}</strong></p>
+            <div class="table-responsive" style="max-height: 300px;">
+                <table class="table table-sm table-striped mb-0">
+                    <thead class="table-light"><tr><th>Month</th><th>EMI</th><th>Principal</th><th>Interest</th><th>Balance</th></tr></thead>
+                    <tbody>${rows}</tbody>
+                </table>
+            </div>`;
+    } catch (error) {
+        body.innerHTML = '<div class="alert alert-danger">Error loading schedule. Please try again.</div>';
+        delete details.dataset.loaded;
+    }
+}
+
+function displayInsuranceResults(data) {
+    const resultsDiv = document.getElementById('insurance-results');
+
+    // Check if data has required fields
+    if (!data.overall_risk || !data.recommendations) {
+        resultsDiv.innerHTML = '<div class="alert alert-danger">Invalid response from server. Please try again.</div>';
+        return;
+    }
+
+    let html = '';
+
+    // Risk Assessment Header
+    const riskClass = data.overall_risk.includes('HIGH') ? 'risk-high' : (data.overall_risk.includes('MEDIUM') ? 'risk-medium' : 'risk-low');
+    html += `
+        <div class="alert alert-${data.overall_risk.includes('HIGH') ? 'danger' : (data.overall_risk.includes('MEDIUM') ? 'warning' : 'success')} mb-4">
+            <h5 class="alert-heading"><i class="fas fa-exclamation-triangle me-2"></i>Risk Assessment</h5>
+            <span class="badge ${riskClass} risk-badge">${data.overall_risk}</span>
+            <p class="mb-0 mt-2">${data.risk_factors}</p>
+        </div>
+    `;
+
+    html += '<h5 class="fw-bold mb-3"><i class="fas fa-shield-alt me-2"></i>Insurance Recommendations</h5>';
+
+    data.recommendations.forEach(ins => {
+        html += `
+            <div class="card mb-3 border-warning">
+                <div class="card-body">
+                    <h5 class="card-title text-warning"><i class="fas fa-umbrella me-2"></i>${ins.scheme_name}</h5>
+                    <p class="text-muted mb-3">${ins.provider}</p>
+                    <div class="row g-2 mb-3">
+                        <div class="col-md-4">
+                            <div class="bg-warning bg-opacity-10 rounded p-3 text-center">
+                                <small class="text-muted d-block">Premium to Pay</small>
+                                <strong class="text-warning fs-5">₹${ins.premium_amount.toLocaleString()}</strong>
+                            </div>
+                        </div>
+                        <div class="col-md-4">
+                            <div class="bg-success bg-opacity-10 rounded p-3 text-center">
+                                <small class="text-muted d-block">Sum Insured</small>
+                                <strong class="text-success fs-5">₹${ins.sum_insured.toLocaleString()}</strong>
+                            </div>
+                        </div>
+                        <div class="col-md-4">
+                            <div class="bg-primary bg-opacity-10 rounded p-3 text-center">
+                                <small class="text-muted d-block">Coverage Ratio</small>
+                                <strong class="text-primary fs-5">${Math.round(ins.sum_insured / ins.premium_amount)}x</strong>
+                            </div>
+                        </div>
+                    </div>
+                    <p class="mb-2"><i class="fas fa-lightbulb text-warning me-1"></i> <strong>Recommendation:</strong> ${ins.recommendation}</p>
+                    <details>
+                        <summary class="text-primary" style="cursor: pointer;">Coverage Details & Documents</summary>
+                        <div class="mt-2">
+                            <strong>What's Covered:</strong>
+                            <ul class="mb-2">
+                                ${ins.coverage.map(c => `<li>${c}</li>`).join('')}
+                            </ul>
+                            <strong>Documents Needed:</strong>
+                            <ul class="mb-0">
+                                ${ins.documents.map(d => `<li>${d}</li>`).join('')}
+                            </ul>
+                        </div>
+                    </details>
+                </div>
+            </div>
+        `;
+    });
+
+    resultsDiv.innerHTML = html;
+}
+
+function displaySubsidyResults(data) {
+    const resultsDiv = document.getElementById('subsidy-results');
+    let html = `
+        <div class="alert alert-success mb-4">
+            <h5 class="alert-heading"><i class="fas fa-check-circle me-2"></i>Great News!</h5>
+            <p class="mb-0">You are eligible for <strong>${data.subsidies.length} government schemes</strong>. Apply now to maximize your benefits!</p>
+        </div>
+        <h5 class="fw-bold mb-3"><i class="fas fa-gift me-2"></i>Available Subsidies & Benefits</h5>
+    `;
+
+    data.subsidies.forEach((subsidy, index) => {
+        const statusClass = subsidy.eligibility_status.includes('ELIGIBLE') ? 'success' : 'warning';
+        html += `
+            <div class="card mb-3 border-${statusClass}">
+                <div class="card-body">
+                    <div class="d-flex justify-content-between align-items-start mb-2">
+                        <h5 class="card-title text-${statusClass}"><i class="fas fa-rupee-sign me-2"></i>${subsidy.scheme_name}</h5>
+                        <span class="badge bg-${statusClass}">${subsidy.eligibility_status}</span>
+                    </div>
+                    <div class="bg-${statusClass} bg-opacity-10 rounded p-3 mb-3">
+                        <h4 class="mb-0 text-${statusClass}"><i class="fas fa-gift me-2"></i>${subsidy.potential_benefit}</h4>
+                    </div>
+                    <p class="mb-2">${subsidy.description}</p>
+                    <p class="mb-2"><i class="fas fa-clipboard-list text-primary me-1"></i> <strong>How to Apply:</strong> ${subsidy.how_to_apply}</p>
+                    <details>
+                        <summary class="text-primary" style="cursor: pointer;">Documents Required</summary>
+                        <ul class="mt-2 mb-0">
+                            ${subsidy.documents.map(d => `<li>${d}</li>`).join('')}
+                        </ul>
+                    </details>
+                </div>
+            </div>
+        `;
+    });
+
+    // Total Benefits Summary
+    html += `
+        <div class="card bg-success text-white mt-4">
+            <div class="card-body text-center">
+                <h5><i class="fas fa-calculator me-2"></i>Apply for all eligible schemes to maximize your farming income!</h5>
+                <p class="mb-0">Visit your nearest Krishi Bhavan or apply online through respective portals.</p>
+            </div>
+        </div>
+    `;
+
+    resultsDiv.innerHTML = html;
+}
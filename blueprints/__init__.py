@@ -0,0 +1,16 @@
+"""
+Route Blueprints for Kerala Smart Farmer
+Routes are grouped by feature. Blueprint modules only import Flask at load
+time; each view imports its service module on first use, so a cold start
+(e.g. a serverless function serving /login) does not pay for the
+knowledge tables of features it never touches.
+"""
+
+from blueprints import advisory, assets, auth, community, compression, fintech, metrics, pages, static_pages
+
+
+def register_blueprints(app) -> None:
+    for module in (assets, auth, pages, advisory, community, fintech, metrics):
+        app.register_blueprint(module.bp)
+    static_pages.init_app(app)
+    compression.init_app(app)
@@ -0,0 +1,354 @@
+"""
+Advisory Routes
+Crop advisor, weather, soil, market, irrigation, growth and pest pages plus
+their batch APIs. Service modules are imported on first use.
+"""
+
+from dataclasses import asdict
+
+from flask import Blueprint, Response, render_template, request, jsonify, stream_with_context
+
+bp = Blueprint("advisory", __name__)
+
+
+@bp.route("/crop-advisor", methods=["GET", "POST"])
+def crop_advisor_view():
+    from services.crop_advisor import recommend_crops
+
+    result = None
+    submitted = False
+    if request.method == "POST":
+        submitted = True
+        soil_type = request.form["soil_type"]
+        land_size = float(request.form["land_size"])
+        district = request.form["district"]
+        season = request.form["season"]
+        result = recommend_crops(soil_type, land_size, district, season)
+    return render_template("crop_advisor.html", result=result, submitted=submitted)
+
+
+# Upper bound on plots per batch request to keep a single call bounded.
+MAX_BATCH_PLOTS = 10000
+
+
+@bp.route("/api/crop-advisor/batch", methods=["POST"])
+def crop_advisor_batch():
+    """API endpoint to score many plots (e.g. an FPO's members) in one request.
+
+    Expects JSON: {"plots": [{"soil_type", "land_size_acres", "district", "season"}, ...]}
+    """
+    from services.crop_advisor import recommend_crops_batch
+
+    try:
+        payload = request.get_json(silent=True) or {}
+        plots = payload.get("plots")
+        if not isinstance(plots, list) or not plots:
+            return jsonify({"error": "Please provide a non-empty list of plots."}), 400
+        if len(plots) > MAX_BATCH_PLOTS:
+            return jsonify({"error": f"At most {MAX_BATCH_PLOTS} plots are allowed per request."}), 400
+
+        cleaned = []
+        for i, plot in enumerate(plots):
+            try:
+                cleaned.append({
+                    "soil_type": str(plot["soil_type"]),
+                    "land_size_acres": float(plot["land_size_acres"]),
+                    "district": str(plot["district"]),
+                    "season": str(plot["season"]),
+                })
+            except (KeyError, TypeError, ValueError):
+                return jsonify({"error": f"Plot {i} is missing a field or has an invalid land size."}), 400
+
+        results = recommend_crops_batch(cleaned)
+        return jsonify({"results": [[asdict(s) for s in suggestions] for suggestions in results]})
+
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@bp.route("/weather", methods=["GET", "POST"])
+def weather_view():
+    from services.alert_snapshots import current_snapshot
+    from services.memo import normalize_district
+    from services.weather_risk import KERALA_DISTRICTS
+
+    alerts = None
+    submitted = False
+    snapshot = None
+    known_district = False
+    if request.method == "POST":
+        submitted = True
+        district = request.form["district"]
+        crop = request.form["crop"]
+        known_district = normalize_district(district).lower() in KERALA_DISTRICTS
+        # Alerts are precomputed for every district x crop in the background.
+        snapshot = current_snapshot()
+        alerts = snapshot.lookup(district, crop)
+    return render_template(
+        "weather.html", alerts=alerts, submitted=submitted, snapshot=snapshot, known_district=known_district
+    )
+
+
+@bp.route("/soil", methods=["GET", "POST"])
+def soil_view():
+    from services.soil_fertilizer import calculate_fertilizer
+
+    plan = None
+    if request.method == "POST":
+        crop = request.form["crop"]
+        om = request.form["organic_matter"]
+        land = float(request.form["land_size"])
+        plan = calculate_fertilizer(crop, om, land)
+    return render_template("soil.html", plan=plan)
+
+
+@bp.route("/market", methods=["GET", "POST"])
+def market_view():
+    from services.market_intel import get_best_market, get_price_trend
+
+    markets = None
+    trend = None
+    if request.method == "POST":
+        crop = request.form["crop"]
+        district = request.form["district"]
+        markets = get_best_market(crop, district)
+        trend = get_price_trend(crop)
+    return render_template("market.html", markets=markets, trend=trend)
+
+
+@bp.route("/irrigation", methods=["GET", "POST"])
+def irrigation_view():
+    import math
+
+    from services.irrigation import MAX_PLOT_AREA_M2, plan_irrigation
+
+    plan = None
+    error = None
+    if request.method == "POST":
+        crop = request.form["crop"]
+        stage = request.form["stage"]
+        soil_type = request.form["soil_type"]
+        rain = request.form["rain_chance"]
+        district = request.form.get("district", "").strip() or None
+        try:
+            area = float(request.form.get("area_m2") or 100)
+        except ValueError:
+            area = math.nan
+        if math.isfinite(area) and 0 < area <= MAX_PLOT_AREA_M2:
+            plan = plan_irrigation(crop, stage, soil_type, rain, area, district)
+        else:
+            error = f"Please enter a plot area between 1 and {MAX_PLOT_AREA_M2:,} m²."
+    return render_template("irrigation.html", plan=plan, error=error)
+
+
+@bp.route("/api/irrigation/schedule", methods=["POST"])
+def irrigation_schedule_batch():
+    """API endpoint for irrigation cooperatives: season-long irrigation dates and volumes for many plots.
+
+    Expects JSON: {"start_date": "YYYY-MM-DD", "days": 180, "plots": [{"crop", "soil_type",
+    "area_m2", "days_after_planting" or "stage", "district" (optional)}, ...]}
+    """
+    import math
+    from datetime import date
+
+    from services.evapotranspiration import stage_day
+    from services.soil_water import MAX_SEASON_DAYS, simulate_season
+
+    try:
+        payload = request.get_json(silent=True) or {}
+        plots = payload.get("plots")
+        if not isinstance(plots, list) or not plots:
+            return jsonify({"error": "Please provide a non-empty list of plots."}), 400
+        if len(plots) > MAX_BATCH_PLOTS:
+            return jsonify({"error": f"At most {MAX_BATCH_PLOTS} plots are allowed per request."}), 400
+        try:
+            start = date.fromisoformat(payload["start_date"]) if payload.get("start_date") else None
+            days = int(payload.get("days", 180))
+        except (TypeError, ValueError):
+            return jsonify({"error": "Please give start_date as YYYY-MM-DD and days as a number."}), 400
+        if not 1 <= days <= MAX_SEASON_DAYS:
+            return jsonify({"error": f"days must be between 1 and {MAX_SEASON_DAYS}."}), 400
+
+        columns = {"crops": [], "soil": [], "area_m2": [], "days_after_planting": [], "districts": []}
+        for i, plot in enumerate(plots):
+            try:
+                crop = str(plot["crop"])
+                area = float(plot["area_m2"])
+                if "days_after_planting" in plot:
+                    age = int(plot["days_after_planting"])
+                else:
+                    age = stage_day(crop, str(plot.get("stage", "vegetative")))
+                if not (math.isfinite(area) and area > 0) or not 0 <= age <= MAX_SEASON_DAYS:
+                    raise ValueError
+                columns["crops"].append(crop)
+                columns["soil"].append(str(plot["soil_type"]))
+                columns["area_m2"].append(area)
+                columns["days_after_planting"].append(age)
+                columns["districts"].append(str(plot["district"]) if plot.get("district") else None)
+            except (KeyError, TypeError, ValueError):
+                return jsonify({"error": f"Plot {i} is missing a field or has an invalid area or age."}), 400
+
+        schedule = simulate_season(**columns, start=start, days=days)
+        return jsonify(schedule.to_columns())
+
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+# Rotation records per chunk of the streamed canal allocation
+CANAL_STREAM_CHUNK = 1000
+
+
+@bp.route("/api/irrigation/canal-allocation", methods=["POST"])
+def canal_allocation():
+    """API endpoint for irrigation societies: split one rotation's canal supply across member plots.
+
+    Expects JSON: {"supply_liters" (or "flow_lps" and "hours"), "mode": "fair" | "yield",
+    "rotation_days": 7, "start_date", "plots": [{"crop", "soil_type", "area_m2",
+    "days_after_planting" or "stage", "district", "rotation", "demand_liters"}, ...]}
+    Streams NDJSON: a summary line, then one line per plot in rotation order.
+    """
+    import json
+    import math
+    from datetime import date
+
+    from services.canal_allocation import ALLOCATION_MODES, MAX_CANAL_PLOTS, allocate_canal
+    from services.evapotranspiration import stage_day
+    from services.soil_water import MAX_SEASON_DAYS
+
+    try:
+        payload = request.get_json(silent=True) or {}
+        plots = payload.get("plots")
+        if not isinstance(plots, list) or not plots:
+            return jsonify({"error": "Please provide a non-empty list of plots."}), 400
+        if len(plots) > MAX_CANAL_PLOTS:
+            return jsonify({"error": f"At most {MAX_CANAL_PLOTS} plots are allowed per request."}), 400
+        mode = payload.get("mode", "fair")
+        if mode not in ALLOCATION_MODES:
+            return jsonify({"error": f"mode must be one of: {', '.join(ALLOCATION_MODES)}."}), 400
+        try:
+            flow_lps = float(payload["flow_lps"]) if payload.get("flow_lps") else None
+            if payload.get("supply_liters") is not None:
+                supply = float(payload["supply_liters"])
+            else:
+                hours = float(payload["hours"])
+                if not math.isfinite(hours):
+                    raise ValueError
+                supply = flow_lps * 3600 * hours
+            start = date.fromisoformat(payload["start_date"]) if payload.get("start_date") else None
+            rotation_days = int(payload.get("rotation_days", 7))
+        except (KeyError, TypeError, ValueError):
+            return jsonify({"error": "Please give supply_liters, or flow_lps and hours, as numbers."}), 400
+        if (
+            not math.isfinite(supply) or supply < 0
+            or (flow_lps is not None and not (math.isfinite(flow_lps) and flow_lps > 0))
+            or not 1 <= rotation_days <= 30
+        ):
+            return jsonify({"error": "Supply and flow must be positive and rotation_days 1 to 30."}), 400
+
+        columns = {
+            "crops": [], "soil": [], "area_m2": [], "days_after_planting": [],
+            "districts": [], "rotation": [], "demand_liters": [],
+        }
+        for i, plot in enumerate(plots):
+            try:
+                crop = str(plot["crop"])
+                area = float(plot["area_m2"])
+                if "days_after_planting" in plot:
+                    age = int(plot["days_after_planting"])
+                else:
+                    age = stage_day(crop, str(plot.get("stage", "vegetative")))
+                demand = float(plot["demand_liters"]) if plot.get("demand_liters") is not None else None
+                rotation = float(plot.get("rotation", i))
+                if (
+                    not (math.isfinite(area) and area > 0) or not 0 <= age <= MAX_SEASON_DAYS
+                    or (demand is not None and not (math.isfinite(demand) and demand >= 0))
+                    or not math.isfinite(rotation)
+                ):
+                    raise ValueError
+                columns["crops"].append(crop)
+                columns["soil"].append(str(plot["soil_type"]))
+                columns["area_m2"].append(area)
+                columns["days_after_planting"].append(age)
+                columns["districts"].append(str(plot["district"]) if plot.get("district") else None)
+                columns["rotation"].append(rotation)
+                columns["demand_liters"].append(demand)
+            except (KeyError, TypeError, ValueError):
+                return jsonify({"error": f"Plot {i} is missing a field or has an invalid number."}), 400
+
+        allocation = allocate_canal(
+            **columns, supply_liters=supply, mode=mode, flow_lps=flow_lps, start=start, rotation_days=rotation_days
+        )
+        # Built before streaming starts, so any error still gets a proper status code.
+        summary = allocation.summary()
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+    def generate():
+        yield json.dumps(summary) + "\n"
+        lines = []
+        for record in allocation.iter_rotation():
+            lines.append(json.dumps(record))
+            if len(lines) == CANAL_STREAM_CHUNK:
+                yield "\n".join(lines) + "\n"
+                lines = []
+        if lines:
+            yield "\n".join(lines) + "\n"
+
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+
+@bp.route("/growth", methods=["GET", "POST"])
+def growth_view():
+    from services.growth_prediction import predict_growth
+
+    prediction = None
+    if request.method == "POST":
+        crop = request.form["crop"].strip()
+        land = float(request.form["land_size"])
+        if land >= 0.1:
+            prediction = predict_growth(crop, land)
+    return render_template("growth.html", prediction=prediction)
+
+
+@bp.route("/pest", methods=["GET", "POST"])
+def pest_view():
+    from services.pest_diagnosis import diagnose_pest_mock
+
+    diagnosis = None
+    if request.method == "POST":
+        crop = request.form.get("crop", "").strip()
+        # Symptoms text box has been removed from the UI; we
+        # keep this parameter for compatibility but default to empty.
+        symptoms = request.form.get("symptoms", "")
+        diagnosis = diagnose_pest_mock(crop, symptoms)
+    return render_template("pest.html", diagnosis=diagnosis)
+
+
+@bp.route("/api/pest/batch", methods=["POST"])
+def pest_batch():
+    """API endpoint to diagnose many crop/symptom reports in one request.
+
+    Expects JSON: {"cases": [{"crop": "...", "symptoms": "..."}, ...]}
+    """
+    from services.pest_diagnosis import diagnose_pest_batch
+
+    try:
+        payload = request.get_json(silent=True) or {}
+        cases = payload.get("cases")
+        if not isinstance(cases, list) or not cases:
+            return jsonify({"error": "Please provide a non-empty list of cases."}), 400
+        if len(cases) > MAX_BATCH_PLOTS:
+            return jsonify({"error": f"At most {MAX_BATCH_PLOTS} cases are allowed per request."}), 400
+
+        pairs = []
+        for i, case in enumerate(cases):
+            if not isinstance(case, dict) or not case.get("crop"):
+                return jsonify({"error": f"Case {i} must include a crop."}), 400
+            pairs.append((str(case["crop"]), str(case.get("symptoms") or "")))
+
+        diagnoses = diagnose_pest_batch(pairs)
+        return jsonify({"results": [asdict(d) for d in diagnoses]})
+
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
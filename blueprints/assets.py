@@ -0,0 +1,114 @@
+"""
+Static Asset Bundles
+Serves the CSS/JS bundles written by ``scripts/build_assets.py``.
+
+Built bundles have content-hashed names, so they are served with an
+immutable one-year cache and a pre-compressed (brotli / gzip) variant when
+the browser accepts one. Before the first build, ``asset_url`` points at
+the source files in ``assets/`` (revalidated on every use), and at the
+public CDN for vendor libraries that have not been fetched yet.
+"""
+
+import json
+import mimetypes
+import os
+from functools import lru_cache
+
+from flask import Blueprint, abort, request, send_from_directory, url_for
+from werkzeug.security import safe_join
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ASSET_SOURCE_DIR = os.path.join(ROOT, "assets")
+ASSET_BUILD_DIR = os.path.join(ROOT, "static", "dist")
+MANIFEST_PATH = os.path.join(ASSET_BUILD_DIR, "manifest.json")
+
+# Bundle name -> source file under assets/
+BUNDLES = {
+    "bootstrap.css": "vendor/bootstrap/bootstrap.min.css",
+    "bootstrap.js": "vendor/bootstrap/bootstrap.bundle.min.js",
+    "fontawesome.css": "vendor/fontawesome/css/all.min.css",
+    "base.css": "css/base.css",
+    "base.js": "js/base.js",
+    "login_otp.css": "css/login_otp.css",
+    "login_otp.js": "js/login_otp.js",
+    "fintech.css": "css/fintech.css",
+    "fintech.js": "js/fintech.js",
+    "voice_assistant.css": "css/voice_assistant.css",
+    "voice_assistant.js": "js/voice_assistant.js",
+}
+
+_BOOTSTRAP = "https://cdn.jsdelivr.net/npm/bootstrap@5.3.2/dist"
+_FONTAWESOME = "https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0"
+
+# Vendor files to self-host (fetched by ``build_assets.py --fetch-vendor``): path under assets/ -> URL
+VENDOR_SOURCES = {
+    "vendor/bootstrap/bootstrap.min.css": f"{_BOOTSTRAP}/css/bootstrap.min.css",
+    "vendor/bootstrap/bootstrap.bundle.min.js": f"{_BOOTSTRAP}/js/bootstrap.bundle.min.js",
+    "vendor/fontawesome/css/all.min.css": f"{_FONTAWESOME}/css/all.min.css",
+    **{
+        f"vendor/fontawesome/webfonts/{font}.{ext}": f"{_FONTAWESOME}/webfonts/{font}.{ext}"
+        for font in ("fa-brands-400", "fa-regular-400", "fa-solid-900", "fa-v4compatibility")
+        for ext in ("woff2", "ttf")
+    },
+}
+
+# Served for hashed bundle files: the name changes whenever the content does.
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# Served for unbuilt source files, which keep the same URL across edits.
+SOURCE_CACHE_CONTROL = "no-cache"
+
+bp = Blueprint("assets", __name__)
+
+
+@lru_cache(maxsize=1)
+def load_manifest() -> dict:
+    """Bundle name -> {"file", "bytes", "gzip_bytes", "br_bytes"} from the last build ({} before the first build)."""
+    try:
+        with open(MANIFEST_PATH, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def asset_url(name: str) -> str:
+    """URL of a bundle, for use in templates."""
+    entry = load_manifest().get(name)
+    if entry:
+        return url_for("assets.bundle", filename=entry["file"])
+    source = BUNDLES[name]
+    if source in VENDOR_SOURCES and not os.path.exists(os.path.join(ASSET_SOURCE_DIR, source)):
+        return VENDOR_SOURCES[source]
+    return url_for("assets.source", filename=source)
+
+
+@bp.app_context_processor
+def _inject_asset_url():
+    return {"asset_url": asset_url}
+
+
+@bp.route("/assets/<path:filename>")
+def bundle(filename: str):
+    """A built file, pre-compressed when the browser accepts it."""
+    accepted = request.accept_encodings
+    for encoding, suffix in (("br", ".br"), ("gzip", ".gz")):
+        path = safe_join(ASSET_BUILD_DIR, filename + suffix)
+        if accepted[encoding] and path and os.path.isfile(path):
+            response = send_from_directory(ASSET_BUILD_DIR, filename + suffix, max_age=None)
+            response.content_encoding = encoding
+            response.mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+            break
+    else:
+        response = send_from_directory(ASSET_BUILD_DIR, filename)
+    response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+    response.vary.add("Accept-Encoding")
+    return response
+
+
+@bp.route("/assets/src/<path:filename>")
+def source(filename: str):
+    """An unbuilt source file (development, before ``build_assets.py`` has run)."""
+    if filename not in BUNDLES.values() and not filename.startswith("vendor/"):
+        abort(404)
+    response = send_from_directory(ASSET_SOURCE_DIR, filename)
+    response.headers["Cache-Control"] = SOURCE_CACHE_CONTROL
+    return response
@@ -0,0 +1,173 @@
+"""
+Login Routes
+OTP login / signup pages and APIs, plus the login requirement for every page.
+"""
+
+from flask import Blueprint, render_template, request, redirect, url_for, session, flash, jsonify
+
+bp = Blueprint("auth", __name__)
+
+# Endpoints reachable without logging in
+LOGIN_EXEMPT_ENDPOINTS = {
+    "auth.login_view", "auth.logout_view", "auth.send_otp", "auth.verify_otp",
+    "metrics.auth_metrics", "metrics.cache_metrics", "metrics.compression_metrics", "metrics.alert_metrics",
+    "assets.bundle", "assets.source", "static"
+}
+
+
+def _is_strong_password(pw: str) -> bool:
+    """Check that password has letters, digits and special characters."""
+    if not pw:
+        return False
+    has_letter = any(c.isalpha() for c in pw)
+    has_digit = any(c.isdigit() for c in pw)
+    has_special = any(not c.isalnum() for c in pw)
+    return has_letter and has_digit and has_special
+
+
+@bp.before_app_request
+def require_login():
+    """Force login before accessing any page, except login and static files."""
+    # request.endpoint can be None for some special cases
+    if request.endpoint in LOGIN_EXEMPT_ENDPOINTS or request.endpoint is None:
+        return
+    if "username" not in session:
+        return redirect(url_for("auth.login_view"))
+
+
+@bp.route("/login", methods=["GET"])
+def login_view():
+    """Mobile number-based login/signup page with OTP verification."""
+    # If already logged in, redirect to home
+    if "username" in session:
+        return redirect(url_for("pages.index"))
+    return render_template("login_otp.html")
+
+
+@bp.route("/auth/send-otp", methods=["POST"])
+def send_otp():
+    """API endpoint to send OTP to mobile number."""
+    from services.auth import validate_mobile_number, normalize_mobile_number, check_otp_rate_limit, initiate_auth
+
+    try:
+        mobile = normalize_mobile_number(request.form.get("mobile", ""))
+        
+        # Validate mobile number
+        is_valid, msg = validate_mobile_number(mobile)
+        if not is_valid:
+            return jsonify({
+                "success": False,
+                "message": msg
+            })
+        
+        # Rate limit per client IP and per mobile number
+        allowed, limit_msg, retry_after = check_otp_rate_limit(mobile, request.remote_addr or "unknown")
+        if not allowed:
+            response = jsonify({
+                "success": False,
+                "message": limit_msg
+            })
+            response.headers["Retry-After"] = str(retry_after)
+            return response, 429
+        
+        # Initiate authentication (send OTP)
+        result = initiate_auth(mobile)
+        
+        response_data = {
+            "success": result.success,
+            "message": result.message,
+            "is_registered": result.is_registered,
+            "requires_otp": result.requires_otp
+        }
+        
+        # Include OTP for demo purposes (remove in production!)
+        if result.user_data and "otp_for_demo" in result.user_data:
+            response_data["otp_for_demo"] = result.user_data["otp_for_demo"]
+        
+        return jsonify(response_data)
+    
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "message": f"An error occurred: {str(e)}"
+        }), 500
+
+
+@bp.route("/auth/verify-otp", methods=["POST"])
+def verify_otp():
+    """API endpoint to verify OTP and complete login/signup."""
+    from services.auth import complete_auth, normalize_mobile_number
+
+    try:
+        mobile = normalize_mobile_number(request.form.get("mobile", ""))
+        otp = request.form.get("otp", "").strip()
+        name = request.form.get("name", "").strip()
+        district = request.form.get("district", "").strip()
+        crops = request.form.get("crops", "").split(",")
+        
+        # Validate inputs
+        if not mobile or not otp:
+            return jsonify({
+                "success": False,
+                "message": "Mobile number and OTP are required."
+            })
+        
+        if len(otp) != 6 or not otp.isdigit():
+            return jsonify({
+                "success": False,
+                "message": "Please enter a valid 6-digit OTP."
+            })
+        
+        # Optional alert subscription for new users
+        profile = None
+        if district:
+            from services.alert_dispatch import normalize_alert_profile
+
+            profile = normalize_alert_profile(district, crops)
+            if profile is None:
+                return jsonify({
+                    "success": False,
+                    "message": "Please select a valid Kerala district."
+                })
+
+        # Complete authentication
+        result = complete_auth(mobile, otp, name, profile)
+        
+        if result.success:
+            # Set session
+            session["username"] = mobile
+            session["user_name"] = result.user_data.get("name", f"Farmer_{mobile[-4:]}") if result.user_data else f"Farmer_{mobile[-4:]}"
+            session["is_verified"] = True
+        
+        return jsonify({
+            "success": result.success,
+            "message": result.message,
+            "is_registered": result.is_registered
+        })
+    
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "message": f"An error occurred: {str(e)}"
+        }), 500
+
+
+@bp.route("/logout")
+def logout_view():
+    """Clear the session and send user back to the login page."""
+    session.clear()
+    flash("Logged out successfully.")
+    return redirect(url_for("auth.login_view"))
+
+
+@bp.route("/profile/alerts", methods=["POST"])
+def update_alert_profile():
+    """API endpoint to set the district and crops a farmer receives SMS weather alerts for."""
+    from services.alert_dispatch import normalize_alert_profile
+    from services.auth import update_user_profile
+
+    profile = normalize_alert_profile(request.form.get("district", ""), request.form.get("crops", "").split(","))
+    if profile is None:
+        return jsonify({"success": False, "message": "Please select a valid Kerala district."}), 400
+    success, message = update_user_profile(session["username"], profile)
+    return jsonify({"success": success, "message": message, **profile}), (200 if success else 404)
@@ -0,0 +1,124 @@
+"""
+Farmer Community Routes
+Posts, likes and comments backed by the SQLite community store.
+"""
+
+from functools import lru_cache
+
+from flask import Blueprint, render_template, request, redirect, url_for, session, flash, jsonify
+
+bp = Blueprint("community", __name__)
+
+COMMUNITY_PAGE_SIZE = 20
+MAX_COMMUNITY_PAGE_SIZE = 50
+COMMUNITY_COMMENTS_PAGE_SIZE = 20
+
+
+@lru_cache(maxsize=None)
+def community_store():
+    """Persistent community posts storage (SQLite), opened on first use."""
+    from services.community_store import CommunityStore
+
+    return CommunityStore()
+
+
+@bp.route("/community", methods=["GET", "POST"])
+def community_view():
+    """Farmer Knowledge-Sharing Community - share problems, photos, and solutions."""
+    user = session.get("username", "Anonymous")
+
+    if request.method == "POST":
+        action = request.form.get("action", "")
+        
+        if action == "new_post":
+            # Create a new post
+            title = request.form.get("title", "").strip()
+            content = request.form.get("content", "").strip()
+            category = request.form.get("category", "general")
+            image_url = request.form.get("image_url", "").strip()
+            
+            if title and content:
+                community_store().create_post(user, title, content, category, image_url)
+                flash("Your post has been shared with the community!")
+        
+        elif action == "add_comment":
+            post_id = int(request.form.get("post_id", 0))
+            comment_text = request.form.get("comment_text", "").strip()
+            
+            if comment_text:
+                community_store().add_comment(post_id, user, comment_text)
+        
+        elif action == "like_post":
+            post_id = int(request.form.get("post_id", 0))
+            community_store().like_post(post_id, user)
+        
+        elif action == "delete_post":
+            post_id = int(request.form.get("post_id", 0))
+            if community_store().delete_post(post_id, user):
+                flash("Your post has been deleted.")
+        
+        elif action == "delete_comment":
+            post_id = int(request.form.get("post_id", 0))
+            comment_id = int(request.form.get("comment_id", 0))
+            if community_store().delete_comment(post_id, comment_id, user):
+                flash("Your comment has been deleted.")
+        
+        return redirect(url_for("community.community_view"))
+    
+    category_filter = request.args.get("category", "all")
+    cursor = request.args.get("cursor", type=int)
+    posts, next_cursor = _community_page(user, category_filter, cursor, COMMUNITY_PAGE_SIZE)
+    
+    return render_template(
+        "community.html",
+        posts=posts,
+        next_cursor=next_cursor,
+        current_category=category_filter
+    )
+
+
+@bp.route("/api/community/posts")
+def community_posts_api():
+    """JSON endpoint returning the next page of posts for infinite scroll."""
+    user = session.get("username", "Anonymous")
+    category_filter = request.args.get("category", "all")
+    cursor = request.args.get("cursor", type=int)
+    limit = max(1, min(request.args.get("limit", COMMUNITY_PAGE_SIZE, type=int), MAX_COMMUNITY_PAGE_SIZE))
+
+    posts, next_cursor = _community_page(user, category_filter, cursor, limit)
+    html = "".join(render_template("_community_post.html", post=post) for post in posts)
+
+    return jsonify({
+        "posts": posts,
+        "html": html,
+        "next_cursor": next_cursor,
+        "next_url": url_for("community.community_posts_api", category=category_filter, cursor=next_cursor, limit=limit) if next_cursor else None,
+        "next_page_url": url_for("community.community_view", category=category_filter, cursor=next_cursor) if next_cursor else None
+    })
+
+
+@bp.route("/api/community/posts/<int:post_id>/comments")
+def community_comments_api(post_id: int):
+    """JSON endpoint returning one page of a post's comments (loaded on demand)."""
+    after = request.args.get("after", 0, type=int)
+    comments, next_cursor = community_store().list_comments(post_id, after, COMMUNITY_COMMENTS_PAGE_SIZE)
+
+    return jsonify({
+        "comments": comments,
+        "html": render_template("_community_comments.html", comments=comments),
+        "next_cursor": next_cursor,
+        "next_url": url_for("community.community_comments_api", post_id=post_id, after=next_cursor) if next_cursor else None
+    })
+
+
+def _community_page(user: str, category_filter: str, cursor, limit: int):
+    """Load one page of posts and mark which ones the current user has liked."""
+    posts, next_cursor = community_store().list_posts(
+        category=None if category_filter == "all" else category_filter,
+        before_id=cursor,
+        limit=limit
+    )
+    liked = community_store().liked_post_ids(user, [p["id"] for p in posts])
+    for post in posts:
+        post["liked"] = post["id"] in liked
+    return posts, next_cursor
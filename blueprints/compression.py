@@ -0,0 +1,177 @@
+"""
+Response Compression for Kerala Smart Farmer
+Compresses HTML / JSON / text responses with brotli or gzip, whichever the
+browser prefers, once they are large enough to be worth it.
+
+Identical bodies (the same page or JSON rendered again) are served from a
+small LRU of compressed bodies instead of being compressed again. Time
+spent compressing is counted per encoding so the levels can be tuned.
+"""
+
+import gzip
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Smaller bodies fit in one packet anyway; compressing them only adds latency.
+MIN_COMPRESS_BYTES = 500
+
+COMPRESSIBLE_MIMETYPES = {
+    "text/html", "text/css", "text/plain", "text/javascript", "text/xml",
+    "application/json", "application/javascript", "application/xml", "image/svg+xml",
+}
+
+# Levels can be tuned per deployment from the timings in /metrics/compression.
+GZIP_LEVEL = int(os.environ.get("AGRIVISION_GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.environ.get("AGRIVISION_BROTLI_QUALITY", "5"))
+
+# Compressed-body cache bounds
+CACHE_MAX_ENTRIES = 256
+CACHE_MAX_BODY_BYTES = 512 * 1024
+
+
+class CompressedBodyCache:
+    """LRU of compressed bodies keyed by (encoding, SHA-256 of the uncompressed body)."""
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> Optional[bytes]:
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+            return body
+
+    def put(self, key: tuple, body: bytes) -> None:
+        with self._lock:
+            self._entries[key] = body
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class CompressionStats:
+    """Counters per encoding: responses, cache hits, bytes in/out and compression time."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.skipped = 0
+        self.by_encoding: Dict[str, Dict[str, float]] = {}
+
+    def record(self, encoding: str, bytes_in: int, bytes_out: int, seconds: float, cache_hit: bool) -> None:
+        with self._lock:
+            stats = self.by_encoding.setdefault(encoding, {
+                "responses": 0, "cache_hits": 0, "bytes_in": 0, "bytes_out": 0, "compress_seconds": 0.0,
+            })
+            stats["responses"] += 1
+            stats["cache_hits"] += int(cache_hit)
+            stats["bytes_in"] += bytes_in
+            stats["bytes_out"] += bytes_out
+            stats["compress_seconds"] += seconds
+
+    def record_skip(self) -> None:
+        with self._lock:
+            self.skipped += 1
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            encodings = {}
+            for encoding, stats in self.by_encoding.items():
+                compressed = stats["responses"] - stats["cache_hits"]
+                encodings[encoding] = {
+                    **stats,
+                    "compress_seconds": round(stats["compress_seconds"], 6),
+                    "avg_compress_ms": round(stats["compress_seconds"] * 1000 / compressed, 3) if compressed else 0.0,
+                    "ratio": round(stats["bytes_out"] / stats["bytes_in"], 3) if stats["bytes_in"] else None,
+                }
+            return {"skipped": self.skipped, "encodings": encodings}
+
+
+BODY_CACHE = CompressedBodyCache()
+STATS = CompressionStats()
+
+
+def _compress(encoding: str, body: bytes) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def _negotiate() -> Optional[str]:
+    """The accepted encoding with the highest quality; brotli wins ties."""
+    accepted = request.accept_encodings
+    options = [("br", accepted["br"])] if brotli is not None else []
+    options.append(("gzip", accepted["gzip"]))
+    encoding, quality = max(options, key=lambda option: option[1])
+    return encoding if quality > 0 else None
+
+
+def compress_response(response):
+    """``after_request`` hook: compress the body in place when it is worth it."""
+    if (
+        response.status_code < 200
+        or response.status_code in (204, 206, 304)
+        or response.direct_passthrough
+        or response.is_streamed
+        or "Content-Encoding" in response.headers
+        or response.mimetype not in COMPRESSIBLE_MIMETYPES
+    ):
+        return response
+
+    response.vary.add("Accept-Encoding")
+    encoding = _negotiate()
+    body = response.get_data()
+    if encoding is None or len(body) < MIN_COMPRESS_BYTES:
+        STATS.record_skip()
+        return response
+
+    key = (encoding, hashlib.sha256(body).digest())
+    compressed = BODY_CACHE.get(key)
+    cache_hit = compressed is not None
+    seconds = 0.0
+    if not cache_hit:
+        start = time.perf_counter()
+        compressed = _compress(encoding, body)
+        seconds = time.perf_counter() - start
+        if len(body) <= CACHE_MAX_BODY_BYTES:
+            BODY_CACHE.put(key, compressed)
+    STATS.record(encoding, len(body), len(compressed), seconds, cache_hit)
+
+    response.set_data(compressed)
+    response.content_encoding = encoding
+    # The compressed bytes differ from the identity representation, so a
+    # strong validator no longer applies.
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def get_compression_metrics() -> Dict:
+    return {
+        **STATS.snapshot(),
+        "cached_bodies": len(BODY_CACHE),
+        "gzip_level": GZIP_LEVEL,
+        "brotli_quality": BROTLI_QUALITY if brotli is not None else None,
+        "min_compress_bytes": MIN_COMPRESS_BYTES,
+    }
+
+
+def init_app(app) -> None:
+    app.after_request(compress_response)
@@ -0,0 +1,441 @@
+"""
+Agri-FinTech Routes
+Loans, insurance and subsidies for Kerala farmers, single and bulk.
+The large fintech tables are imported on the first API call, not at startup.
+"""
+
+import math
+from dataclasses import asdict
+
+from flask import Blueprint, request, jsonify
+
+from blueprints.static_pages import register_static_page, render_static_page
+
+bp = Blueprint("fintech", __name__)
+
+# Kerala districts for FinTech module
+KERALA_DISTRICTS = [
+    "Thiruvananthapuram", "Kollam", "Pathanamthitta", "Alappuzha",
+    "Kottayam", "Idukki", "Ernakulam", "Thrissur", "Palakkad",
+    "Malappuram", "Kozhikode", "Wayanad", "Kannur", "Kasaragod"
+]
+
+register_static_page("fintech", "fintech.html", districts=KERALA_DISTRICTS)
+
+
+def _flag(value, default: bool) -> bool:
+    """A JSON yes/no field: booleans as is, and strings like the form's "yes" / "on"."""
+    if value is None:
+        return default
+    if isinstance(value, str):
+        return value.strip().lower() in ("yes", "on", "true", "1")
+    return bool(value)
+
+
+@bp.route("/fintech")
+def fintech_view():
+    """Agri-FinTech Hub - Loans, Insurance, and Subsidies for Kerala Farmers."""
+    return render_static_page("fintech", "fintech.html", districts=KERALA_DISTRICTS)
+
+
+@bp.route("/fintech/check-loan", methods=["POST"])
+def check_loan():
+    """API endpoint to check loan eligibility."""
+    from services.fintech import check_loan_eligibility
+
+    try:
+        district = request.form.get("district", "")
+        crop = request.form.get("crop", "")
+        
+        # Validate and convert numeric inputs
+        try:
+            land_size = float(request.form.get("land_size", 0) or 0)
+            annual_income = int(request.form.get("annual_income", 0) or 0)
+            loan_amount = int(request.form.get("loan_amount", 0) or 0)
+            existing_loans = int(request.form.get("existing_loans", 0) or 0)
+        except (ValueError, TypeError):
+            return jsonify({"error": "Please enter valid numeric values."}), 400
+        
+        has_collateral = request.form.get("has_collateral", "no") == "yes"
+        
+        # Validate inputs
+        if not district:
+            return jsonify({"error": "Please select a district."}), 400
+        if not crop:
+            return jsonify({"error": "Please select a crop."}), 400
+        if land_size <= 0:
+            return jsonify({"error": "Please enter a valid land size."}), 400
+        if annual_income <= 0:
+            return jsonify({"error": "Please enter a valid annual income."}), 400
+        if loan_amount <= 0:
+            return jsonify({"error": "Please enter a valid loan amount."}), 400
+            
+        # Validate district
+        if district not in KERALA_DISTRICTS:
+            return jsonify({"error": "Please select a valid Kerala district."}), 400
+        
+        loans = check_loan_eligibility(
+            land_size_acres=land_size,
+            crop=crop,
+            district=district,
+            annual_income=annual_income,
+            existing_loans=existing_loans,
+            has_collateral=has_collateral,
+            loan_amount_needed=loan_amount
+        )
+        
+        # Convert dataclass objects to dicts
+        loan_data = []
+        for loan in loans:
+            loan_data.append({
+                "loan_name": loan.loan_name,
+                "provider": loan.provider,
+                "eligible": loan.eligible,
+                "max_eligible_amount": loan.max_eligible_amount,
+                "interest_rate": loan.interest_rate,
+                "tenure_months": loan.tenure_months,
+                "monthly_emi": loan.monthly_emi,
+                "total_repayment": loan.total_repayment,
+                "documents_required": loan.documents_required,
+                "apply_at": loan.apply_at,
+                "reason": loan.reason
+            })
+        
+        return jsonify({"loans": loan_data})
+    
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+# Applicant columns accepted by the bulk loan pre-screening API
+BULK_LOAN_COLUMNS = (
+    "land_size_acres", "annual_income", "existing_loans",
+    "has_collateral", "loan_amount_needed", "crop"
+)
+MAX_BULK_APPLICANTS = 200000
+
+
+@bp.route("/fintech/bulk-loan-screening", methods=["POST"])
+def bulk_loan_screening():
+    """API endpoint for banks to pre-screen many applicants against all loan products.
+
+    Expects JSON with one equal-length list per column in BULK_LOAN_COLUMNS and
+    returns a columnar table (applicants x loan products).
+    """
+    from services.loan_screening import screen_loans_bulk
+
+    try:
+        payload = request.get_json(silent=True) or {}
+        missing = [c for c in BULK_LOAN_COLUMNS if not isinstance(payload.get(c), list)]
+        if missing:
+            return jsonify({"error": f"Missing applicant columns: {', '.join(missing)}."}), 400
+        n = len(payload["crop"])
+        if any(len(payload[c]) != n for c in BULK_LOAN_COLUMNS):
+            return jsonify({"error": "All applicant columns must have the same length."}), 400
+        if n > MAX_BULK_APPLICANTS:
+            return jsonify({"error": f"At most {MAX_BULK_APPLICANTS} applicants are allowed per request."}), 400
+        
+        try:
+            land = [float(v) for v in payload["land_size_acres"]]
+            income = [int(v) for v in payload["annual_income"]]
+            existing = [int(v) for v in payload["existing_loans"]]
+            needed = [int(v) for v in payload["loan_amount_needed"]]
+        except (ValueError, TypeError, OverflowError) as e:
+            return jsonify({"error": f"Invalid applicant data: {e}"}), 400
+        for i in range(n):
+            if not (math.isfinite(land[i]) and land[i] > 0) or income[i] <= 0 or needed[i] <= 0 or existing[i] < 0:
+                return jsonify({
+                    "error": f"Applicant {i}: land size, annual income and loan amount must be positive."
+                }), 400
+        
+        try:
+            table = screen_loans_bulk(
+                land_size_acres=land,
+                annual_income=income,
+                existing_loans=existing,
+                has_collateral=[_flag(v, False) for v in payload["has_collateral"]],
+                loan_amount_needed=needed,
+                crop=payload["crop"]
+            )
+        except (ValueError, TypeError, OverflowError) as e:
+            return jsonify({"error": f"Invalid applicant data: {e}"}), 400
+        
+        return jsonify(table.to_columns())
+    
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+# Each bulk schedule returns every month of every loan, so this limit is far below MAX_BULK_APPLICANTS.
+MAX_AMORTIZATION_LOANS = 1000
+
+
+@bp.route("/fintech/amortization", methods=["POST"])
+def amortization():
+    """API endpoint returning full repayment schedules.
+
+    Form fields (principal, annual_rate, tenure_months) give one schedule for
+    the fintech UI; a JSON body {"loans": [{...}, ...]} gives many at once.
+    """
+    from services.amortization import MAX_ANNUAL_RATE_PCT, MAX_PRINCIPAL, MAX_TENURE_MONTHS, amortization_schedule, amortization_schedules
+
+    try:
+        payload = request.get_json(silent=True)
+        if payload is not None:
+            loans = payload.get("loans")
+            if not isinstance(loans, list) or not loans:
+                return jsonify({"error": "Please provide a non-empty list of loans."}), 400
+            if len(loans) > MAX_AMORTIZATION_LOANS:
+                return jsonify({"error": f"At most {MAX_AMORTIZATION_LOANS} loans are allowed per request."}), 400
+            try:
+                schedules = amortization_schedules(
+                    [int(loan["principal"]) for loan in loans],
+                    [float(loan["annual_rate"]) for loan in loans],
+                    [int(loan["tenure_months"]) for loan in loans]
+                )
+            except (KeyError, TypeError, ValueError, OverflowError) as e:
+                return jsonify({"error": f"Invalid loan data: {e}"}), 400
+            return jsonify({"schedules": [schedules.loan(i) for i in range(len(loans))]})
+        
+        try:
+            principal = int(float(request.form.get("principal", 0) or 0))
+            annual_rate = float(request.form.get("annual_rate", 0) or 0)
+            tenure_months = int(request.form.get("tenure_months", 0) or 0)
+        except (ValueError, TypeError, OverflowError):
+            return jsonify({"error": "Please enter valid numeric values."}), 400
+        
+        if not 0 < principal <= MAX_PRINCIPAL:
+            return jsonify({"error": f"Please enter a loan amount up to ₹{MAX_PRINCIPAL // 10**7} crore."}), 400
+        if not 0 <= annual_rate <= MAX_ANNUAL_RATE_PCT:
+            return jsonify({"error": f"Please enter an interest rate between 0 and {MAX_ANNUAL_RATE_PCT}%."}), 400
+        if tenure_months <= 0 or tenure_months > MAX_TENURE_MONTHS:
+            return jsonify({"error": f"Please enter a tenure between 1 and {MAX_TENURE_MONTHS} months."}), 400
+        
+        return jsonify(amortization_schedule(principal, annual_rate, tenure_months))
+    
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@bp.route("/fintech/analyze-insurance", methods=["POST"])
+def analyze_insurance():
+    """API endpoint to analyze crop insurance risk."""
+    from services.fintech import analyze_crop_insurance_risk, KERALA_DISTRICT_RISK
+
+    try:
+        district = request.form.get("district", "")
+        crop = request.form.get("crop", "")
+        land_size_str = request.form.get("land_size", "0")
+        season = request.form.get("season", "Kharif")
+        
+        # Validate inputs
+        if not district:
+            return jsonify({"error": "Please select a district."}), 400
+        if not crop:
+            return jsonify({"error": "Please select a crop."}), 400
+        if not season:
+            return jsonify({"error": "Please select a season."}), 400
+        
+        try:
+            land_size = float(land_size_str) if land_size_str else 0
+        except ValueError:
+            return jsonify({"error": "Please enter a valid land size."}), 400
+        
+        if land_size <= 0:
+            return jsonify({"error": "Land size must be greater than 0."}), 400
+        
+        # Validate district
+        if district not in KERALA_DISTRICTS:
+            return jsonify({"error": "Please select a valid Kerala district."}), 400
+        
+        recommendations = analyze_crop_insurance_risk(
+            crop=crop,
+            district=district,
+            land_size_acres=land_size,
+            season=season
+        )
+        
+        # Get risk factors for the district
+        district_risk = KERALA_DISTRICT_RISK.get(district, {})
+        risk_factors = f"District Risk Profile - Flood: {district_risk.get('flood', 'N/A').upper()}, Drought: {district_risk.get('drought', 'N/A').upper()}, Pest: {district_risk.get('pest', 'N/A').upper()}"
+        if recommendations:
+            volatility = recommendations[0]
+            risk_factors += f" | Market Price Volatility: {volatility.market_volatility.upper()}"
+            if volatility.price_volatility_pct is not None:
+                risk_factors += f" ({volatility.price_volatility_pct}% annualised)"
+        
+        # Convert dataclass objects to dicts
+        rec_data = []
+        overall_risk = "MEDIUM RISK"
+        for rec in recommendations:
+            rec_data.append({
+                "scheme_name": rec.scheme_name,
+                "provider": rec.provider,
+                "premium_amount": rec.premium_amount,
+                "sum_insured": rec.sum_insured,
+                "coverage": rec.coverage,
+                "risk_score": rec.risk_score,
+                "recommendation": rec.recommendation,
+                "documents": rec.documents,
+                "market_volatility": rec.market_volatility,
+                "price_volatility_pct": rec.price_volatility_pct
+            })
+            overall_risk = rec.risk_score  # Take from first recommendation
+        
+        return jsonify({
+            "recommendations": rec_data,
+            "overall_risk": overall_risk,
+            "risk_factors": risk_factors
+        })
+    
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+# Member columns accepted by the bulk insurance quoting API
+BULK_INSURANCE_COLUMNS = ("district", "crop", "land_size_acres", "season")
+
+
+@bp.route("/fintech/bulk-insurance-quotes", methods=["POST"])
+def bulk_insurance_quotes():
+    """API endpoint pricing PMFBY, Kerala State and coconut cover for a member list.
+
+    Expects JSON with one equal-length list per column in BULK_INSURANCE_COLUMNS.
+    """
+    from services.insurance_quotes import quote_insurance_bulk
+
+    try:
+        payload = request.get_json(silent=True) or {}
+        missing = [c for c in BULK_INSURANCE_COLUMNS if not isinstance(payload.get(c), list)]
+        if missing:
+            return jsonify({"error": f"Missing member columns: {', '.join(missing)}."}), 400
+        n = len(payload["district"])
+        if any(len(payload[c]) != n for c in BULK_INSURANCE_COLUMNS):
+            return jsonify({"error": "All member columns must have the same length."}), 400
+        if n > MAX_BULK_APPLICANTS:
+            return jsonify({"error": f"At most {MAX_BULK_APPLICANTS} members are allowed per request."}), 400
+        
+        try:
+            land = [float(v) for v in payload["land_size_acres"]]
+        except (ValueError, TypeError) as e:
+            return jsonify({"error": f"Invalid member data: {e}"}), 400
+        for i, district in enumerate(payload["district"]):
+            if district not in KERALA_DISTRICTS:
+                return jsonify({"error": f"Member {i}: please select a valid Kerala district."}), 400
+            if not isinstance(payload["crop"][i], str) or not isinstance(payload["season"][i], str):
+                return jsonify({"error": f"Member {i}: crop and season must be text."}), 400
+            if not (math.isfinite(land[i]) and land[i] > 0):
+                return jsonify({"error": f"Member {i}: land size must be greater than 0."}), 400
+        
+        try:
+            table = quote_insurance_bulk(
+                district=payload["district"],
+                crop=payload["crop"],
+                land_size_acres=land,
+                season=payload["season"]
+            )
+        except (ValueError, TypeError) as e:
+            return jsonify({"error": f"Invalid member data: {e}"}), 400
+        
+        return jsonify(table.to_columns())
+    
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@bp.route("/fintech/get-subsidies", methods=["POST"])
+def get_subsidies():
+    """API endpoint to get subsidy recommendations."""
+    from services.fintech import get_subsidy_recommendations
+
+    try:
+        district = request.form.get("district", "")
+        crop = request.form.get("crop", "")
+        category = request.form.get("category", "general")
+        has_irrigation = request.form.get("has_irrigation", "yes") == "yes"
+        organic_interest = request.form.get("organic_interest") == "on"
+        
+        # Validate and convert numeric inputs
+        try:
+            land_size = float(request.form.get("land_size", 0) or 0)
+        except (ValueError, TypeError):
+            return jsonify({"error": "Please enter a valid land size."}), 400
+        
+        # Validate inputs
+        if not district:
+            return jsonify({"error": "Please select a district."}), 400
+        if not crop:
+            return jsonify({"error": "Please select a crop."}), 400
+        if not (math.isfinite(land_size) and land_size > 0):
+            return jsonify({"error": "Please enter a valid land size."}), 400
+        
+        # Validate district
+        if district not in KERALA_DISTRICTS:
+            return jsonify({"error": "Please select a valid Kerala district."}), 400
+        
+        subsidies = get_subsidy_recommendations(
+            land_size_acres=land_size,
+            crop=crop,
+            district=district,
+            farmer_category=category,
+            has_irrigation=has_irrigation,
+            organic_interest=organic_interest
+        )
+        
+        # Convert dataclass objects to dicts
+        subsidy_data = []
+        for sub in subsidies:
+            subsidy_data.append({
+                "scheme_name": sub.scheme_name,
+                "potential_benefit": sub.potential_benefit,
+                "eligibility_status": sub.eligibility_status,
+                "description": sub.description,
+                "how_to_apply": sub.how_to_apply,
+                "documents": sub.documents
+            })
+        
+        return jsonify({"subsidies": subsidy_data})
+    
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@bp.route("/fintech/bulk-subsidies", methods=["POST"])
+def bulk_subsidies():
+    """API endpoint to evaluate subsidy eligibility for many farmers at once.
+
+    Expects JSON: {"farmers": [{"land_size_acres", "crop", "district", "farmer_category",
+    "has_irrigation", "organic_interest"}, ...]}
+    """
+    from services.fintech import get_subsidy_recommendations_batch
+
+    try:
+        payload = request.get_json(silent=True) or {}
+        farmers = payload.get("farmers")
+        if not isinstance(farmers, list) or not farmers:
+            return jsonify({"error": "Please provide a non-empty list of farmers."}), 400
+        if len(farmers) > MAX_BULK_APPLICANTS:
+            return jsonify({"error": f"At most {MAX_BULK_APPLICANTS} farmers are allowed per request."}), 400
+        
+        cleaned = []
+        for i, farmer in enumerate(farmers):
+            try:
+                cleaned.append({
+                    "land_size_acres": float(farmer["land_size_acres"]),
+                    "crop": str(farmer["crop"]),
+                    "district": str(farmer.get("district", "")),
+                    "farmer_category": str(farmer.get("farmer_category", "general")),
+                    "has_irrigation": _flag(farmer.get("has_irrigation"), True),
+                    "organic_interest": _flag(farmer.get("organic_interest"), False),
+                })
+            except (KeyError, TypeError, ValueError, AttributeError):
+                return jsonify({"error": f"Farmer {i} is missing crop or has an invalid land size."}), 400
+            land = cleaned[-1]["land_size_acres"]
+            if not (math.isfinite(land) and land > 0):
+                return jsonify({"error": f"Farmer {i}: land size must be greater than 0."}), 400
+        
+        results = get_subsidy_recommendations_batch(cleaned)
+        return jsonify({"results": [[asdict(sub) for sub in subsidies] for subsidies in results]})
+    
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
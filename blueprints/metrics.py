@@ -0,0 +1,57 @@
+"""
+Monitoring Routes
+JSON counters for production monitoring, protected by a token.
+"""
+
+import hmac
+import os
+
+from flask import Blueprint, request, abort, jsonify
+
+bp = Blueprint("metrics", __name__)
+
+# Token for the /metrics/* routes, sent by monitoring in X-Metrics-Token.
+# The routes are closed (403) until it is configured.
+METRICS_TOKEN = os.environ.get("AGRIVISION_METRICS_TOKEN", "")
+
+
+def _check_token() -> None:
+    if not METRICS_TOKEN or not hmac.compare_digest(request.headers.get("X-Metrics-Token", ""), METRICS_TOKEN):
+        abort(403)
+
+
+@bp.route("/metrics/auth")
+def auth_metrics():
+    """OTP store and rate limiter counters for production monitoring."""
+    _check_token()
+    from services.auth import get_auth_metrics
+
+    return jsonify(get_auth_metrics())
+
+
+@bp.route("/metrics/cache")
+def cache_metrics():
+    """Hit / miss / eviction counters of the advisory service caches."""
+    _check_token()
+    from services.memo import cache_stats
+
+    return jsonify(cache_stats())
+
+
+@bp.route("/metrics/compression")
+def compression_metrics():
+    """Response compression counters and timings, for tuning the compression levels."""
+    _check_token()
+    from blueprints.compression import get_compression_metrics
+
+    return jsonify(get_compression_metrics())
+
+
+@bp.route("/metrics/alerts")
+def alert_metrics():
+    """Age and build time of the precomputed weather alert snapshot, plus SMS dispatch counters."""
+    _check_token()
+    from services.alert_dispatch import get_dispatch_metrics
+    from services.alert_snapshots import get_alert_snapshot_metrics
+
+    return jsonify({**get_alert_snapshot_metrics(), "dispatch": get_dispatch_metrics()})
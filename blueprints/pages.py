@@ -0,0 +1,167 @@
+"""
+Home and Information Pages
+Home page, scheme details, schemes assistant, voice assistant and farm diary.
+"""
+
+from flask import Blueprint, render_template, request, redirect, url_for, session, abort
+
+from blueprints.static_pages import register_static_page, render_static_page
+
+bp = Blueprint("pages", __name__)
+
+
+# Static descriptions for key schemes shown on the home page
+SCHEME_DETAILS = {
+    "pm-kisan": {
+        "code": "pm-kisan",
+        "title": "PM-KISAN (Pradhan Mantri Kisan Samman Nidhi)",
+        "tagline": "Direct income support from Central Government",
+        "summary": (
+            "PM-KISAN provides an income support of ₹ 6,000 per year to all eligible "
+            "small and marginal farmer families across India, paid in three equal instalments "
+            "directly to the farmer's bank account."
+        ),
+        "benefits": [
+            "₹ 2,000 is transferred three times a year to the farmer's bank account.",
+            "Helps farmers manage input costs for seeds, fertilizers and small expenses.",
+            "Money is sent directly (DBT) without middlemen.",
+        ],
+        "eligibility": [
+            "Farmer families owning cultivable land as per state land records.",
+            "Certain higher-income and institutional categories are excluded.",
+            "Land ownership details must be updated and verified by local officials.",
+        ],
+        "how_to_apply": [
+            "Visit your local Krishi Bhavan or village agriculture office.",
+            "Carry Aadhaar card, bank passbook and land ownership documents.",
+            "You can also register and check status on the official PM-KISAN portal.",
+        ],
+        "note": "For latest rules, always confirm with your local agriculture office or the PM-KISAN website.",
+    },
+    "karshaka-insurance": {
+        "code": "karshaka-insurance",
+        "title": "Karshaka Insurance Scheme (Kerala)",
+        "tagline": "State-level crop insurance for Kerala farmers",
+        "summary": (
+            "Karshaka Insurance Scheme gives financial protection to registered Kerala farmers "
+            "when crops are damaged due to flood, drought, pests, diseases or other natural calamities."
+        ),
+        "benefits": [
+            "Compensation for crop loss due to notified natural calamities.",
+            "Encourages farmers to continue cultivation without fear of total loss.",
+            "Premium is partially supported by the Government of Kerala.",
+        ],
+        "eligibility": [
+            "Farmer must be registered with the Kerala agriculture department.",
+            "Crops and area should be enrolled under the scheme for the season.",
+            "Timely premium payment and accurate crop details are required.",
+        ],
+        "how_to_apply": [
+            "Contact your local Krishi Bhavan or agriculture officer.",
+            "Fill the enrolment form with crop, area and season details.",
+            "Submit any documents requested and pay the required premium, if applicable.",
+        ],
+        "note": "Compensation and coverage may change every year, so always check the latest circular from the department.",
+    },
+    "pm-kusum": {
+        "code": "pm-kusum",
+        "title": "PM-KUSUM / Solar Pump Support",
+        "tagline": "Support for solar pumps and small solar plants",
+        "summary": (
+            "PM-KUSUM aims to promote the use of solar energy in agriculture by helping farmers "
+            "install solar pumps and small solar power plants, reducing electricity cost for irrigation."
+        ),
+        "benefits": [
+            "Subsidy on installation of solar-powered irrigation pumps.",
+            "Less dependence on grid electricity and diesel.",
+            "Surplus power from certain components can be sold to the grid (as per scheme rules).",
+        ],
+        "eligibility": [
+            "Individual farmers and groups of farmers as per scheme guidelines.",
+            "Land and location must be suitable for installing solar equipment.",
+            "Additional conditions may be set by the state nodal agency (such as KSEB in Kerala).",
+        ],
+        "how_to_apply": [
+            "Check notifications from the state nodal agency (for example, KSEB / ANERT in Kerala).",
+            "Submit an application when registrations are open, with land and identity details.",
+            "Work with approved vendors for installation once your application is sanctioned.",
+        ],
+        "note": "Subsidy percentage and components under PM-KUSUM can change; always refer to the latest official guidelines.",
+    },
+}
+
+
+register_static_page("index", "index.html")
+register_static_page("voice_assistant", "voice_assistant.html")
+for _code, _scheme in SCHEME_DETAILS.items():
+    register_static_page(f"scheme:{_code}", "scheme_detail.html", scheme=_scheme)
+
+# Very simple in-memory farm diary store for demo
+FARM_DIARY_ENTRIES = []
+
+
+@bp.route("/")
+def index():
+    # If user is not logged in, send them to the login page first
+    if "username" not in session:
+        return redirect(url_for("auth.login_view"))
+    return render_static_page("index", "index.html")
+
+
+@bp.route("/schemes", methods=["GET", "POST"])
+def schemes_view():
+    from services.schemes import get_schemes_for_farmer
+
+    schemes = None
+    if request.method == "POST":
+        land = float(request.form["land_size"])
+        # Show schemes only for valid land size (0.1 acre and above)
+        if land >= 0.1:
+            is_small = land <= 2
+            schemes = get_schemes_for_farmer(land, is_small)
+    return render_template("schemes.html", schemes=schemes)
+
+
+@bp.route("/voice-assistant")
+def voice_assistant_view():
+    """Render a simple voice assistant UI. The actual speech recognition and
+    speech synthesis are handled on the browser side using JavaScript.
+    """
+    return render_static_page("voice_assistant", "voice_assistant.html")
+
+
+@bp.route("/farm-diary", methods=["GET", "POST"])
+def farm_diary_view():
+    """Simple farm diary / digital notebook.
+
+    Farmers can record key activities like seed purchase, fertilizer usage,
+    pesticide application and irrigation schedule. Entries are stored only
+    in memory for this demo (they reset when the server restarts).
+    """
+    if request.method == "POST":
+        entry = {
+            "date": request.form.get("date", "").strip(),
+            "crop": request.form.get("crop", "").strip(),
+            "seed": request.form.get("seed", "").strip(),
+            "fertilizer": request.form.get("fertilizer", "").strip(),
+            "pesticide": request.form.get("pesticide", "").strip(),
+            "irrigation": request.form.get("irrigation", "").strip(),
+        }
+        # Only add if something meaningful was entered
+        if any(entry.values()):
+            FARM_DIARY_ENTRIES.insert(0, entry)
+            # keep only recent 10 for display
+            del FARM_DIARY_ENTRIES[10:]
+    return render_template("farm_diary.html", entries=FARM_DIARY_ENTRIES)
+
+
+@bp.route("/scheme/<code>")
+def scheme_detail_view(code: str):
+    """Show a full explanation page for an important scheme.
+
+    Used when the user clicks a scheme card on the home page.
+    """
+    scheme = SCHEME_DETAILS.get(code)
+    if not scheme:
+        abort(404)
+    return render_static_page(f"scheme:{code}", "scheme_detail.html", scheme=scheme)
@@ -0,0 +1,77 @@
+"""
+Conditional GET for Static Pages
+Strong ETags for pages whose HTML only changes when the code is deployed.
+"""
+
+import hashlib
+import json
+import re
+
+from flask import current_app, make_response, render_template, request, session
+
+from blueprints.assets import load_manifest
+
+# Pages declared by the blueprints: key -> (template, context)
+_STATIC_PAGES = {}
+
+# Strong ETag per static page, computed once at startup from the template
+# sources (including extended/included templates), the page data and the
+# asset manifest (pages link hashed bundle names).
+# Restart the app after editing a template so the ETags change.
+STATIC_PAGE_ETAGS = {}
+
+# Pages show the logged-in farmer's name, so only the browser may cache them,
+# and it must revalidate (a cheap 304) before reuse.
+STATIC_PAGE_CACHE_CONTROL = "private, no-cache"
+
+# Literal {% extends / include / import / from "name" %} references. Scanning
+# for these is much cheaper at startup than parsing the templates with Jinja.
+_TEMPLATE_REF = re.compile(r"""{%-?\s*(?:extends|include|import|from)\s+["']([^"']+)["']""")
+
+
+def register_static_page(key: str, template: str, **context) -> None:
+    """Declare a page rendered from ``template`` with ``context``; its ETag is set by ``init_app``."""
+    _STATIC_PAGES[key] = (template, context)
+
+
+def _template_sources(env, name: str, seen: set) -> list:
+    """Source of a template followed by every template it extends or includes."""
+    if name in seen:
+        return []
+    seen.add(name)
+    source, _, _ = env.loader.get_source(env, name)
+    sources = [source]
+    for ref in _TEMPLATE_REF.findall(source):
+        sources.extend(_template_sources(env, ref, seen))
+    return sources
+
+
+def init_app(app) -> None:
+    """Precompute the ETag of every registered page."""
+    for key, (template, context) in _STATIC_PAGES.items():
+        digest = hashlib.sha256()
+        for source in _template_sources(app.jinja_env, template, set()):
+            digest.update(source.encode("utf-8"))
+        digest.update(json.dumps(context, sort_keys=True, default=str).encode("utf-8"))
+        digest.update(json.dumps(load_manifest(), sort_keys=True).encode("utf-8"))
+        STATIC_PAGE_ETAGS[key] = digest.hexdigest()[:32]
+
+
+def render_static_page(key: str, template: str, **context):
+    """Render a registered page, or answer 304 if the browser's copy is current.
+
+    The ETag also covers the user shown in the page header, and pages with
+    pending flash messages are always rendered. The comparison is weak because
+    compression turns the ETag of a compressed response into a weak one.
+    """
+    viewer = f"{session.get('username', '')}\0{session.get('user_name', '')}"
+    etag = STATIC_PAGE_ETAGS[key] + "-" + hashlib.sha256(viewer.encode("utf-8")).hexdigest()[:16]
+
+    if "_flashes" not in session and request.if_none_match.contains_weak(etag):
+        response = current_app.response_class(status=304)
+    else:
+        response = make_response(render_template(template, **context))
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = STATIC_PAGE_CACHE_CONTROL
+    response.vary.add("Cookie")
+    return response
@@ -0,0 +1,179 @@
+"""
+Asset Build Step for Kerala Smart Farmer
+Minifies the bundles listed in ``blueprints/assets.py`` and writes them to
+static/dist/ under content-hashed names, with pre-compressed .gz and .br
+variants and a manifest.json that ``asset_url`` reads.
+
+    python scripts/build_assets.py --fetch-vendor   # once: self-host Bootstrap / Font Awesome
+    python scripts/build_assets.py                  # after changing assets/; commit static/dist/
+
+Brotli output needs the optional ``Brotli`` package; without it only gzip
+variants are written. The deployment (vercel.json) runs no build step, so
+static/dist/ is committed with the sources.
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+import sys
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from blueprints.assets import ASSET_BUILD_DIR, ASSET_SOURCE_DIR, BUNDLES, MANIFEST_PATH, VENDOR_SOURCES
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Text formats worth pre-compressing (woff2 is already compressed)
+COMPRESSIBLE = (".css", ".js", ".svg", ".ttf", ".eot", ".json")
+
+_CSS_URL = re.compile(r"""url\(\s*(['"]?)([^'")]+)\1\s*\)""")
+
+
+# Comments, strings and url() tokens; strings and url() are set aside while minifying
+_CSS_TOKEN = re.compile(
+    r"""/\*.*?\*/|"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*'|url\(\s*(?:"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*'|[^)]*)\s*\)""",
+    re.S
+)
+
+
+def minify_css(text: str) -> str:
+    """Drop comments and redundant whitespace; strings and url() are left untouched."""
+    kept = []
+
+    def set_aside(match) -> str:
+        if match.group(0).startswith("/*"):
+            return ""
+        kept.append(match.group(0))
+        return f"\0{len(kept) - 1}\0"
+
+    text = _CSS_TOKEN.sub(set_aside, text)
+    text = re.sub(r"\s+", " ", text)
+    text = re.sub(r"\s*([{};,>])\s*", r"\1", text)
+    # "a :hover" and "a:hover" are different selectors, so only declarations lose the space.
+    text = re.sub(r"\{[^{}]*\}", lambda m: re.sub(r"\s*:\s*", ":", m.group(0)), text)
+    text = text.replace(";}", "}").strip()
+    return re.sub(r"\0(\d+)\0", lambda m: kept[int(m.group(1))], text)
+
+
+def minify_js(text: str) -> str:
+    """Drop indentation, blank lines and whole-line ``//`` comments.
+
+    Line breaks are kept, so automatic semicolon insertion behaves exactly
+    as in the source.
+    """
+    lines = (line.strip() for line in text.splitlines())
+    return "\n".join(line for line in lines if line and not line.startswith("//"))
+
+
+def fetch_vendor() -> None:
+    """Download the vendor files that are not in assets/ yet."""
+    for path, url in VENDOR_SOURCES.items():
+        target = os.path.join(ASSET_SOURCE_DIR, path)
+        if os.path.exists(target):
+            continue
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        print(f"fetching {url}")
+        with urllib.request.urlopen(url, timeout=30) as response, open(target, "wb") as f:
+            shutil.copyfileobj(response, f)
+
+
+class _Builder:
+    def __init__(self):
+        self.outputs = {}  # source path -> output file name
+
+    def _write(self, source: str, data: bytes) -> str:
+        stem, ext = os.path.splitext(os.path.basename(source))
+        if stem.endswith(".min"):
+            stem = stem[:-4]
+        name = f"{stem}.{hashlib.sha256(data).hexdigest()[:12]}{ext}"
+        path = os.path.join(ASSET_BUILD_DIR, name)
+        with open(path, "wb") as f:
+            f.write(data)
+        if ext in COMPRESSIBLE:
+            with open(path + ".gz", "wb") as f:
+                f.write(gzip.compress(data, compresslevel=9, mtime=0))
+            if brotli is not None:
+                with open(path + ".br", "wb") as f:
+                    f.write(brotli.compress(data, quality=11))
+        return name
+
+    def build(self, source: str) -> str:
+        """Write one source file (and anything its CSS references); returns the output name."""
+        if source in self.outputs:
+            return self.outputs[source]
+
+        with open(os.path.join(ASSET_SOURCE_DIR, source), "rb") as f:
+            data = f.read()
+        minified = ".min." in os.path.basename(source)
+        if source.endswith(".css"):
+            text = data.decode("utf-8")
+            text = _CSS_URL.sub(lambda m: self._rewrite_url(source, m), text)
+            data = (text if minified else minify_css(text)).encode("utf-8")
+        elif source.endswith(".js") and not minified:
+            data = minify_js(data.decode("utf-8")).encode("utf-8")
+
+        self.outputs[source] = self._write(source, data)
+        return self.outputs[source]
+
+    def _rewrite_url(self, css_source: str, match) -> str:
+        """Point a relative url() at the hashed copy of the file (all outputs share one folder)."""
+        ref = match.group(2).strip()
+        if re.match(r"^(?:[a-z]+:|/|#)", ref):
+            return match.group(0)
+        path = ref.split("?", 1)[0].split("#", 1)[0]
+        target = os.path.normpath(os.path.join(os.path.dirname(css_source), path)).replace(os.sep, "/")
+        return f"url({self.build(target)})"
+
+
+def build_assets() -> dict:
+    """Rebuild static/dist/ from scratch and return the manifest."""
+    shutil.rmtree(ASSET_BUILD_DIR, ignore_errors=True)
+    os.makedirs(ASSET_BUILD_DIR)
+
+    builder = _Builder()
+    manifest = {}
+    for name, source in BUNDLES.items():
+        if not os.path.exists(os.path.join(ASSET_SOURCE_DIR, source)):
+            print(f"skipping {name}: {source} not found (run with --fetch-vendor); the CDN copy is used",
+                  file=sys.stderr)
+            continue
+        output = builder.build(source)
+        path = os.path.join(ASSET_BUILD_DIR, output)
+        manifest[name] = {
+            "file": output,
+            "bytes": os.path.getsize(path),
+            "gzip_bytes": os.path.getsize(path + ".gz") if os.path.exists(path + ".gz") else None,
+            "br_bytes": os.path.getsize(path + ".br") if os.path.exists(path + ".br") else None,
+        }
+
+    with open(MANIFEST_PATH, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--fetch-vendor", action="store_true",
+                        help="download Bootstrap / Font Awesome into assets/vendor first")
+    args = parser.parse_args()
+
+    if args.fetch_vendor:
+        fetch_vendor()
+    if brotli is None:
+        print("Brotli is not installed; writing gzip variants only", file=sys.stderr)
+
+    for name, entry in build_assets().items():
+        print(f"{name:<22}{entry['file']:<36}{entry['bytes']:>9}{entry['gzip_bytes'] or '-':>9}{entry['br_bytes'] or '-':>9}")
+
+
+if __name__ == "__main__":
+    main()
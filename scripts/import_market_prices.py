@@ -0,0 +1,43 @@
+"""
+Market Price Import for Kerala Smart Farmer
+Streams a daily mandi price dump (CSV) into the columnar store format that
+``AGRIVISION_MARKET_DATA`` can point at, merging with any store already in
+the output directory.
+
+    python scripts/import_market_prices.py prices.csv --output data/market_store
+"""
+
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from services.market_store import MarketPriceStore, load_csv
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("csv", nargs="+", help="price dump(s): market, commodity, date, price columns")
+    parser.add_argument("--output", required=True, help="store directory (created or merged into)")
+    args = parser.parse_args()
+
+    store = None
+    if os.path.exists(os.path.join(args.output, "names.json")):
+        store = MarketPriceStore.load(args.output, mmap=False)
+
+    for path in args.csv:
+        start = time.perf_counter()
+        loaded = load_csv(path)
+        store = loaded if store is None else store.merged_with(loaded)
+        print(f"{path}: {len(loaded)} rows in {time.perf_counter() - start:.2f}s, "
+              f"{loaded.skipped_rows} malformed rows skipped")
+
+    store.save(args.output)
+    print(f"{args.output}: {len(store)} rows, {len(store.crops)} crops, {len(store.markets)} markets")
+
+
+if __name__ == "__main__":
+    main()
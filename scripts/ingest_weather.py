@@ -0,0 +1,39 @@
+"""
+Weather Grid Ingestion for Kerala Smart Farmer
+Converts gridded observation / forecast files (see services/weather_grid.py
+for the formats) into the memory-mapped arrays the weather alerts read.
+
+    python scripts/ingest_weather.py --source /data/imd/latest --output /var/lib/agrivision/weather
+
+Running app processes pick up a re-ingested dataset on the next
+``weather_risk.reload_weather()``.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from services.weather_grid import WEATHER_DATA_DIR, WEATHER_SOURCE_DIR, WeatherGrid, ingest
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--source", default=WEATHER_SOURCE_DIR, help="folder with observed.* and forecast.*")
+    parser.add_argument("--output", default=WEATHER_DATA_DIR, help="folder for the ingested arrays")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    ingest(args.source, args.output)
+    grid = WeatherGrid(args.output)
+    for dataset, dates in grid.dates.items():
+        spec = grid.grids[dataset]
+        print(f"{dataset:<10}{dates[0]} .. {dates[-1]}  {spec.nlat}x{spec.nlon} cells")
+    print(f"ingested in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Sample Weather Grid Generator
+Writes the synthetic 0.25 degree observation and forecast grids in
+data/weather/sample that stand in for real gridded products (e.g. IMD
+gridded rainfall, NWP forecasts) during development.
+
+    python scripts/make_weather_sample.py
+
+The fields follow the usual monsoon pattern: rain increases towards the
+Western Ghats and peaks over the Idukki and Wayanad high ranges, which are
+also the most humid.
+"""
+
+import csv
+import os
+import sys
+from datetime import date, timedelta
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from services.market_geo import DISTRICT_CENTROIDS
+from services.weather_grid import SAMPLE_SOURCE_DIR, WEATHER_VARIABLES, GridSpec
+
+GRID = GridSpec(lat0=8.25, lon0=74.75, step=0.25, nlat=19, nlon=12)
+DAYS_PER_DATASET = 7
+# A past week of observations followed by a forecast from today, as the alerts expect
+FIRST_OBSERVED_DAY = date.today() - timedelta(days=DAYS_PER_DATASET)
+HIGH_RANGES = ("Idukki", "Wayanad")
+
+
+def _fields(lat: np.ndarray, lon: np.ndarray, day: int, rng: np.random.Generator) -> dict:
+    ghats = sum(
+        np.exp(-((lat - DISTRICT_CENTROIDS[d][0]) ** 2 + (lon - DISTRICT_CENTROIDS[d][1]) ** 2) / (2 * 0.35 ** 2))
+        for d in HIGH_RANGES
+    )
+    pulse = 1.0 + 0.25 * np.sin(2 * np.pi * day / 7)
+    rain = (8.0 + 10.0 * (lon - GRID.lon0) / (GRID.nlon * GRID.step) + 85.0 * ghats) * pulse
+    rain *= rng.lognormal(0.0, 0.15, lat.shape)
+    rh = np.clip(78.0 + 14.0 * ghats + rng.normal(0.0, 1.5, lat.shape), 40.0, 100.0)
+    tmax = 31.0 - 7.0 * ghats + rng.normal(0.0, 0.8, lat.shape)
+    tmin = tmax - 7.5 + rng.normal(0.0, 0.5, lat.shape)
+    return {"rain_mm": rain, "rh_pct": rh, "tmax_c": tmax, "tmin_c": tmin}
+
+
+def main() -> None:
+    rng = np.random.default_rng(2025)
+    lat, lon = GRID.cell_centers()
+    os.makedirs(SAMPLE_SOURCE_DIR, exist_ok=True)
+    for k, dataset in enumerate(("observed", "forecast")):
+        path = os.path.join(SAMPLE_SOURCE_DIR, f"{dataset}.csv")
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["date", "lat", "lon", *WEATHER_VARIABLES])
+            for d in range(DAYS_PER_DATASET):
+                day = k * DAYS_PER_DATASET + d
+                fields = _fields(lat, lon, day, rng)
+                stamp = (FIRST_OBSERVED_DAY + timedelta(days=day)).isoformat()
+                for i in range(GRID.nlat):
+                    for j in range(GRID.nlon):
+                        writer.writerow([stamp, f"{lat[i, j]:.2f}", f"{lon[i, j]:.2f}",
+                                         *(f"{fields[v][i, j]:.1f}" for v in WEATHER_VARIABLES)])
+        print(f"wrote {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Cold-Start Benchmark for Kerala Smart Farmer
+Measures, for each route, the cost a fresh (serverless) process pays: the
+time to import ``app`` and the latency of the first and second request.
+
+Every route runs in its own new Python process so lazily imported service
+modules are charged to the route that needs them.
+
+    python scripts/startup_benchmark.py
+    python scripts/startup_benchmark.py --templates cold --output startup.jsonl
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ROUTES = [
+    "/login", "/", "/crop-advisor", "/weather", "/soil", "/market",
+    "/irrigation", "/pest", "/growth", "/schemes", "/voice-assistant",
+    "/farm-diary", "/scheme/pm-kisan", "/community", "/fintech",
+    "/metrics/auth",
+]
+
+
+def _measure(route: str) -> dict:
+    """Run inside the child process."""
+    start = time.perf_counter()
+    import app as app_module
+    imported = time.perf_counter()
+
+    client = app_module.app.test_client()
+    if route != "/login":
+        with client.session_transaction() as sess:
+            sess["username"] = "9000000000"
+            sess["user_name"] = "Benchmark"
+
+    before = time.perf_counter()
+    status = client.get(route).status_code
+    first = time.perf_counter()
+    client.get(route)
+    second = time.perf_counter()
+
+    return {
+        "route": route,
+        "status": status,
+        "import_ms": round((imported - start) * 1000, 2),
+        "first_request_ms": round((first - before) * 1000, 2),
+        "second_request_ms": round((second - first) * 1000, 2),
+        "service_modules": sorted(m for m in sys.modules if m.startswith("services.")),
+    }
+
+
+def _run_child(args: list, env: dict) -> str:
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__)] + args,
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    return result.stdout
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("routes", nargs="*", default=ROUTES, help="routes to measure (GET)")
+    parser.add_argument("--templates", choices=("warm", "cold"), default="warm",
+                        help="warm: compile templates into the bytecode cache first; cold: empty cache")
+    parser.add_argument("--output", help="append one JSON line per route to this file")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--warm-only", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    sys.path.insert(0, ROOT)
+    if args.warm_only:
+        from app import warm_template_cache
+        warm_template_cache()
+        return
+    if args.child:
+        print(json.dumps(_measure(args.child)))
+        return
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        env = dict(os.environ, AGRIVISION_JINJA_CACHE_DIR=cache_dir)
+        if args.templates == "warm":
+            _run_child(["--warm-only"], env)
+
+        rows = []
+        for route in args.routes:
+            row = json.loads(_run_child(["--child", route], env).strip().splitlines()[-1])
+            if args.templates == "cold":
+                # Each route starts from an empty bytecode cache
+                for name in os.listdir(cache_dir):
+                    os.remove(os.path.join(cache_dir, name))
+            row["templates"] = args.templates
+            rows.append(row)
+
+    print(f"{'route':<20}{'status':>7}{'import ms':>11}{'first ms':>10}{'second ms':>11}  services")
+    for row in rows:
+        services = ", ".join(m.split(".", 1)[1] for m in row["service_modules"]) or "-"
+        print(f"{row['route']:<20}{row['status']:>7}{row['import_ms']:>11}"
+              f"{row['first_request_ms']:>10}{row['second_request_ms']:>11}  {services}")
+
+    if args.output:
+        stamp = time.strftime("%Y-%m-%dT%H:%M:%S")
+        with open(args.output, "a", encoding="utf-8") as f:
+            for row in rows:
+                f.write(json.dumps({"timestamp": stamp, **row}) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+"""
+Weather Alert SMS Fan-out
+Pushes newly raised weather alerts to the registered farmers they affect.
+
+- SubscriberIndex groups users' mobile numbers (as int64 arrays) by
+  (district, crop), streamed from the auth backend.
+- diff_snapshots compares two alert snapshots and keeps only alerts that
+  are new, or whose level changed, for each district x crop.
+- AlertDispatcher merges the recipients of an alert across all crop keys of
+  its district, so each mobile gets an alert once, then chunks them into SMS
+  batches and feeds them through a bounded asyncio queue to a fixed number of sender
+  tasks, so at most ``concurrency`` gateway calls are in flight.
+
+Set AGRIVISION_SMS_GATEWAY=stub to enable dispatch with the recording stub
+gateway. Enable it in exactly one process, otherwise every worker sends.
+"""
+
+import asyncio
+import os
+from abc import ABC, abstractmethod
+import threading
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from services.alert_snapshots import SCHEDULER, SUPPORTED_CROPS, AlertSnapshot
+from services.memo import normalize_district, normalize_label
+from services.weather_grid import DISTRICTS
+from services.weather_risk import WeatherAlert
+
+SMS_GATEWAY = os.environ.get("AGRIVISION_SMS_GATEWAY", "").strip().lower()
+
+SMS_BATCH_SIZE = 500
+SMS_CONCURRENCY = 8
+SMS_QUEUE_SIZE = 64
+SMS_MAX_ATTEMPTS = 3
+SMS_RETRY_DELAY_SECONDS = 1.0
+
+# Rebuild the subscriber index from the user store at most this often.
+INDEX_REFRESH_SECONDS = 900
+
+_SUPPORTED = {c.lower() for c in SUPPORTED_CROPS}
+_DISTRICT_NAMES = {d.lower(): d for d in DISTRICTS}
+
+
+def normalize_alert_profile(district: str, crops: Iterable[str]) -> Optional[dict]:
+    """Profile fields to store for alerts, or None if the district is not in Kerala."""
+    district = normalize_district(district)
+    if district.lower() not in _DISTRICT_NAMES:
+        return None
+    names = [normalize_label(c) for c in crops if c.strip()]
+    return {"district": district, "crops": list(dict.fromkeys(names))}
+
+
+def _subscription_keys(user: dict) -> List[Tuple[str, str]]:
+    district = str(user.get("district", "")).lower()
+    if district not in _DISTRICT_NAMES:
+        return []
+    # Crops without their own snapshot entry receive the district's "other crop" alerts.
+    crops = {c.lower() if c.lower() in _SUPPORTED else "" for c in (str(c) for c in user.get("crops", ()))}
+    return [(district, crop) for crop in crops]
+
+
+class SubscriberIndex:
+    """(lower-case district, lower-case crop or "") -> mobile numbers as an int64 array."""
+
+    def __init__(self, groups: Dict[Tuple[str, str], np.ndarray], built_at: float):
+        self.groups = groups
+        self.built_at = built_at
+
+    @classmethod
+    def build(cls, users: Iterable[Tuple[str, dict]]) -> "SubscriberIndex":
+        pending: Dict[Tuple[str, str], List[int]] = defaultdict(list)
+        for mobile, user in users:
+            if not mobile.isdigit():
+                continue
+            for key in _subscription_keys(user):
+                pending[key].append(int(mobile))
+        groups = {key: np.unique(np.array(mobiles, dtype=np.int64)) for key, mobiles in pending.items()}
+        return cls(groups, time.time())
+
+    def subscribers(self, district: str, crop: str) -> np.ndarray:
+        return self.groups.get((district.lower(), crop.lower()), np.empty(0, dtype=np.int64))
+
+    def __len__(self) -> int:
+        return sum(len(m) for m in self.groups.values())
+
+
+def diff_snapshots(
+    previous: AlertSnapshot,
+    current: AlertSnapshot
+) -> Dict[Tuple[str, str], Tuple[WeatherAlert, ...]]:
+    """Alerts in ``current`` that ``previous`` did not have, per (district, crop) key."""
+    changes = {}
+    for key, alerts in current.alerts.items():
+        before = set(previous.alerts.get(key, ()))
+        new = tuple(a for a in alerts if a not in before)
+        if new:
+            changes[key] = new
+    return changes
+
+
+def format_alert_sms(district: str, crop: str, alert: WeatherAlert) -> str:
+    place = _DISTRICT_NAMES.get(district, district.title())
+    target = f"{place}, {crop.title()}" if crop else place
+    return f"AgriVision {alert.type} alert ({alert.level}) for {target}: {alert.message}"
+
+
+# ----------------------------------------------------------------------
+# SMS gateways
+# ----------------------------------------------------------------------
+
+class SmsGateway(ABC):
+    """Interface for a bulk SMS provider: one message to many recipients per call."""
+
+    @abstractmethod
+    async def send_batch(self, recipients: Sequence[str], message: str) -> None:
+        """Send or raise; a raised error makes the dispatcher retry the batch."""
+
+
+class StubSmsGateway(SmsGateway):
+    """Records batches instead of sending them (development and tests)."""
+
+    def __init__(self, latency: float = 0.0, keep_last: int = 100):
+        self.latency = latency
+        self.sent_batches = 0
+        self.sent_messages = 0
+        self.recent: "deque[Tuple[Tuple[str, ...], str]]" = deque(maxlen=keep_last)
+
+    async def send_batch(self, recipients: Sequence[str], message: str) -> None:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        self.sent_batches += 1
+        self.sent_messages += len(recipients)
+        self.recent.append((tuple(recipients), message))
+
+
+# ----------------------------------------------------------------------
+# Dispatcher
+# ----------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class DispatchReport:
+    changes: int
+    batches: int
+    messages: int
+    failed_batches: int
+    failed_messages: int
+    seconds: float
+
+
+class AlertDispatcher:
+    def __init__(
+        self,
+        gateway: SmsGateway,
+        batch_size: int = SMS_BATCH_SIZE,
+        concurrency: int = SMS_CONCURRENCY,
+        queue_size: int = SMS_QUEUE_SIZE
+    ):
+        self.gateway = gateway
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+        self.last_report: Optional[DispatchReport] = None
+        self.total_messages = 0
+        self.total_failed_messages = 0
+
+    def _batches(self, changes: Dict[Tuple[str, str], Tuple[WeatherAlert, ...]], index: SubscriberIndex):
+        # A district-wide alert appears under every crop key of the district; a
+        # farmer growing several crops must still get it only once.
+        crops_by_alert: Dict[Tuple[str, WeatherAlert], List[str]] = defaultdict(list)
+        for (district, crop), alerts in changes.items():
+            for alert in alerts:
+                crops_by_alert[(district, alert)].append(crop)
+
+        for (district, alert), crops in crops_by_alert.items():
+            recipients = np.unique(np.concatenate([index.subscribers(district, crop) for crop in crops]))
+            if not len(recipients):
+                continue
+            message = format_alert_sms(district, crops[0] if len(crops) == 1 else "", alert)
+            for start in range(0, len(recipients), self.batch_size):
+                chunk = recipients[start:start + self.batch_size]
+                yield [str(m) for m in chunk.tolist()], message
+
+    async def _send(self, recipients: List[str], message: str) -> bool:
+        for attempt in range(SMS_MAX_ATTEMPTS):
+            try:
+                await self.gateway.send_batch(recipients, message)
+                return True
+            except Exception:
+                if attempt + 1 < SMS_MAX_ATTEMPTS:
+                    await asyncio.sleep(SMS_RETRY_DELAY_SECONDS * (attempt + 1))
+        return False
+
+    async def dispatch(
+        self,
+        changes: Dict[Tuple[str, str], Tuple[WeatherAlert, ...]],
+        index: SubscriberIndex
+    ) -> DispatchReport:
+        start = time.perf_counter()
+        queue: "asyncio.Queue" = asyncio.Queue(maxsize=self.queue_size)
+        counts = {"batches": 0, "messages": 0, "failed_batches": 0, "failed_messages": 0}
+
+        async def sender() -> None:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    return
+                recipients, message = item
+                ok = await self._send(recipients, message)
+                counts["batches"] += 1
+                counts["messages"] += len(recipients)
+                if not ok:
+                    counts["failed_batches"] += 1
+                    counts["failed_messages"] += len(recipients)
+
+        senders = [asyncio.create_task(sender()) for _ in range(self.concurrency)]
+        # put() waits while the queue is full, so batches are built only as fast as they are sent.
+        for batch in self._batches(changes, index):
+            await queue.put(batch)
+        for _ in senders:
+            await queue.put(None)
+        await asyncio.gather(*senders)
+
+        report = DispatchReport(changes=len(changes), seconds=time.perf_counter() - start, **counts)
+        self.last_report = report
+        self.total_messages += report.messages
+        self.total_failed_messages += report.failed_messages
+        return report
+
+
+# ----------------------------------------------------------------------
+# Wiring to the alert scheduler
+# ----------------------------------------------------------------------
+
+_dispatcher: Optional[AlertDispatcher] = None
+_index: Optional[SubscriberIndex] = None
+_index_lock = threading.Lock()
+
+
+def subscriber_index(max_age: float = INDEX_REFRESH_SECONDS) -> SubscriberIndex:
+    """The subscriber index, rebuilt from the user store when older than ``max_age``."""
+    global _index
+    with _index_lock:
+        if _index is None or time.time() - _index.built_at > max_age:
+            from services.auth import get_backend
+
+            _index = SubscriberIndex.build(get_backend().iter_users())
+        return _index
+
+
+def on_snapshot_published(previous: Optional[AlertSnapshot], current: AlertSnapshot) -> None:
+    """Scheduler hook: send the alerts that changed since the previous snapshot.
+
+    The first snapshot after startup is only a baseline, so restarts do not
+    resend alerts that are already out. Alerts from a stale forecast are not
+    sent.
+    """
+    if previous is None or _dispatcher is None or current.stale:
+        return
+    changes = diff_snapshots(previous, current)
+    if changes:
+        asyncio.run(_dispatcher.dispatch(changes, subscriber_index()))
+
+
+def enable_dispatch(gateway: SmsGateway, **options) -> AlertDispatcher:
+    global _dispatcher
+    _dispatcher = AlertDispatcher(gateway, **options)
+    SCHEDULER.subscribe(on_snapshot_published)
+    return _dispatcher
+
+
+def get_dispatch_metrics() -> Optional[Dict]:
+    if _dispatcher is None:
+        return None
+    report = _dispatcher.last_report
+    return {
+        "gateway": type(_dispatcher.gateway).__name__,
+        "subscriptions": len(_index) if _index is not None else None,
+        "total_messages": _dispatcher.total_messages,
+        "total_failed_messages": _dispatcher.total_failed_messages,
+        "last_dispatch": {
+            "changes": report.changes,
+            "batches": report.batches,
+            "messages": report.messages,
+            "failed_batches": report.failed_batches,
+            "seconds": round(report.seconds, 3),
+        } if report else None,
+    }
+
+
+def start_dispatch_from_env() -> Optional[AlertDispatcher]:
+    """Enable dispatch per AGRIVISION_SMS_GATEWAY and start the alert scheduler (app startup)."""
+    if not SMS_GATEWAY:
+        return None
+    if SMS_GATEWAY != "stub":
+        raise ValueError(f"Unknown AGRIVISION_SMS_GATEWAY: {SMS_GATEWAY!r}")
+    dispatcher = enable_dispatch(StubSmsGateway())
+    SCHEDULER.current()
+    return dispatcher
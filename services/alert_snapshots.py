@@ -0,0 +1,190 @@
+"""
+Precomputed Weather Alert Snapshots
+A background scheduler evaluates the weather alerts for every Kerala
+district x supported crop and publishes them as an immutable snapshot.
+Publishing is a single reference swap, so a request reads either the old
+or the new snapshot, never a mix, and its lookup is one dict access.
+
+Snapshots are rebuilt every ALERT_REFRESH_SECONDS (reloading the weather
+data first, so newly ingested forecasts are picked up). If a rebuild
+fails, the previous snapshot stays in service and the error is reported.
+"""
+
+import os
+import threading
+import time
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timezone
+from types import MappingProxyType
+from typing import Callable, Dict, List, Mapping, Optional, Tuple
+
+from services.crop_advisor import CROPS_DB
+from services.memo import normalize_district
+from services.weather_grid import DISTRICTS
+from services.weather_risk import (
+    CROP_WEATHER_THRESHOLDS,
+    KERALA_DISTRICTS,
+    WeatherAlert,
+    get_weather_and_risk,
+    reload_weather,
+    weather_status,
+)
+
+ALERT_REFRESH_SECONDS = float(os.environ.get("AGRIVISION_ALERT_REFRESH_SECONDS", "900"))
+
+# Crops with their own alert entry; any other crop gets the district's default entry.
+SUPPORTED_CROPS = tuple(sorted(set(CROP_WEATHER_THRESHOLDS) | {c["name"] for c in CROPS_DB}))
+
+# Key for the alerts of crops outside SUPPORTED_CROPS
+_OTHER_CROP = ""
+
+
+@dataclass(frozen=True)
+class AlertSnapshot:
+    version: int
+    built_at: float  # time.time() when the build finished
+    build_seconds: float
+    # (lower-case district, lower-case crop or "") -> alerts
+    alerts: Mapping[Tuple[str, str], Tuple[WeatherAlert, ...]] = field(repr=False)
+    forecast_from: Optional[str] = None  # ISO date of the first forecast day the alerts use
+    stale: bool = False  # no forecast covers today; alerts come from the latest ingested one
+
+    @property
+    def age_seconds(self) -> float:
+        return time.time() - self.built_at
+
+    def lookup(self, district: str, crop: str) -> List[WeatherAlert]:
+        district = normalize_district(district).lower()
+        if district not in KERALA_DISTRICTS:
+            return []
+        crop = " ".join(crop.split()).lower()
+        alerts = self.alerts.get((district, crop))
+        if alerts is None:
+            alerts = self.alerts[(district, _OTHER_CROP)]
+        return list(alerts)
+
+
+def build_snapshot(
+    version: int,
+    compute: Callable[[str, str], List[WeatherAlert]] = get_weather_and_risk
+) -> AlertSnapshot:
+    """Evaluate ``compute`` for every district x supported crop (plus an "other crop" entry per district)."""
+    start = time.perf_counter()
+    alerts: Dict[Tuple[str, str], Tuple[WeatherAlert, ...]] = {}
+    for district in DISTRICTS:
+        for crop in (*SUPPORTED_CROPS, _OTHER_CROP):
+            alerts[(district.lower(), crop.lower())] = tuple(compute(district, crop))
+    status = weather_status()
+    return AlertSnapshot(
+        version=version,
+        built_at=time.time(),
+        build_seconds=time.perf_counter() - start,
+        alerts=MappingProxyType(alerts),
+        forecast_from=status["forecast_from"],
+        stale=status["stale"]
+    )
+
+
+class AlertScheduler:
+    """Rebuilds the alert snapshot on a background thread every ``interval`` seconds."""
+
+    def __init__(self, interval: float = ALERT_REFRESH_SECONDS):
+        self.interval = interval
+        self.snapshot: Optional[AlertSnapshot] = None
+        self.last_error: Optional[str] = None
+        self.failed_builds = 0
+        self.failed_deliveries = 0
+        self._lock = threading.RLock()
+        # Held from publish until every subscriber has run, so deliveries follow publish order.
+        self._dispatch_lock = threading.RLock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._subscribers: List[Callable[[Optional[AlertSnapshot], AlertSnapshot], None]] = []
+
+    def subscribe(self, callback: Callable[[Optional[AlertSnapshot], AlertSnapshot], None]) -> None:
+        """Call ``callback(previous, current)`` after each publish, on the publishing thread.
+
+        Callbacks see snapshots in publish order; an error is counted in
+        ``failed_deliveries`` and does not stop the other callbacks.
+        """
+        self._subscribers.append(callback)
+
+    def refresh(self) -> AlertSnapshot:
+        """Build and publish a new snapshot now."""
+        with self._lock:
+            start = time.perf_counter()
+            reload_weather()
+            version = self.snapshot.version + 1 if self.snapshot else 1
+            snapshot = build_snapshot(version)
+            snapshot = replace(snapshot, build_seconds=time.perf_counter() - start)
+            # Publish with one assignment; readers holding the old snapshot keep a consistent view.
+            previous, self.snapshot = self.snapshot, snapshot
+            self.last_error = None
+            # Taken before the build lock is released, so the next publish waits for these deliveries.
+            self._dispatch_lock.acquire()
+        try:
+            for callback in self._subscribers:
+                try:
+                    callback(previous, snapshot)
+                except Exception as e:  # a subscriber must not undo the publish
+                    self.failed_deliveries += 1
+                    self.last_error = f"{type(e).__name__} in {getattr(callback, '__name__', callback)}: {e}"
+        finally:
+            self._dispatch_lock.release()
+        return snapshot
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.refresh()
+            except Exception as e:  # keep serving the previous snapshot
+                self.failed_builds += 1
+                self.last_error = f"{type(e).__name__}: {e}"
+
+    def start(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="alert-snapshots", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def current(self) -> AlertSnapshot:
+        """The published snapshot; the first call builds one and starts the background refresh."""
+        snapshot = self.snapshot
+        if snapshot is None:
+            with self._lock:
+                snapshot = self.snapshot or self.refresh()
+            self.start()
+        return snapshot
+
+    def metrics(self) -> Dict:
+        snapshot = self.snapshot
+        return {
+            "version": snapshot.version if snapshot else None,
+            "built_at": (
+                datetime.fromtimestamp(snapshot.built_at, timezone.utc).isoformat() if snapshot else None
+            ),
+            "age_seconds": round(snapshot.age_seconds, 1) if snapshot else None,
+            "build_seconds": round(snapshot.build_seconds, 4) if snapshot else None,
+            "entries": len(snapshot.alerts) if snapshot else 0,
+            "forecast_from": snapshot.forecast_from if snapshot else None,
+            "stale": snapshot.stale if snapshot else None,
+            "refresh_interval_seconds": self.interval,
+            "scheduler_running": bool(self._thread and self._thread.is_alive()),
+            "failed_builds": self.failed_builds,
+            "failed_deliveries": self.failed_deliveries,
+            "last_error": self.last_error,
+        }
+
+
+SCHEDULER = AlertScheduler()
+
+
+def current_snapshot() -> AlertSnapshot:
+    return SCHEDULER.current()
+
+
+def get_alert_snapshot_metrics() -> Dict:
+    return SCHEDULER.metrics()
@@ -0,0 +1,162 @@
+"""
+Loan Amortization Engine for Kerala Agri Loans
+Full principal / interest / balance repayment schedules, one loan or many.
+
+Schedules use the same (truncated) EMI as ``calculate_emi``; the last
+instalment is adjusted so the balance closes at exactly zero.
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Sequence
+
+import numpy as np
+
+from services.fintech import annuity_growth
+
+# Longest repayment period accepted (30 years, beyond any Kerala agri loan
+# product); each schedule column is one month, so this also bounds memory.
+MAX_TENURE_MONTHS = 360
+# Highest annual rate (%) and principal (₹100 crore) accepted; beyond these the
+# compounded balances lose all precision and the EMI no longer fits in int64.
+MAX_ANNUAL_RATE_PCT = 100
+MAX_PRINCIPAL = 1_000_000_000
+
+
+@lru_cache(maxsize=256)
+def _growth_powers(annual_rate: float, tenure_months: int) -> np.ndarray:
+    """(1 + r) ** k for k = 0..n, cached per (rate, tenure) and read-only."""
+    monthly_rate, _ = annuity_growth(annual_rate, tenure_months)
+    powers = (1 + monthly_rate) ** np.arange(tenure_months + 1, dtype=np.float64)
+    powers.flags.writeable = False
+    return powers
+
+
+def emi_vector(principal: np.ndarray, annual_rate: float, tenure_months: int) -> np.ndarray:
+    """Vectorised ``calculate_emi`` for one (rate, tenure); same float operations, same result."""
+    principal = np.asarray(principal, dtype=np.int64)
+    if annual_rate == 0:
+        return principal // tenure_months
+    monthly_rate, growth = annuity_growth(annual_rate, tenure_months)
+    emi = principal * monthly_rate * growth / (growth - 1)
+    return np.trunc(emi).astype(np.int64)
+
+
+@dataclass
+class AmortizationSchedule:
+    """Repayment schedules for ``n`` loans.
+
+    ``payment``, ``interest``, ``principal`` and ``balance`` have shape
+    ``(n, max_tenure)``; month ``k`` of loan ``i`` is column ``k - 1``.
+    Columns past a loan's own tenure are zero.
+    """
+    emi: np.ndarray
+    tenure_months: np.ndarray
+    payment: np.ndarray
+    interest: np.ndarray
+    principal: np.ndarray
+    balance: np.ndarray
+
+    @property
+    def total_interest(self) -> np.ndarray:
+        return self.interest.sum(axis=1).round(2)
+
+    @property
+    def total_payment(self) -> np.ndarray:
+        return self.payment.sum(axis=1).round(2)
+
+    def loan(self, i: int) -> Dict:
+        """One loan's schedule as plain lists, ready for JSON."""
+        n = int(self.tenure_months[i])
+        return {
+            "emi": int(self.emi[i]),
+            "tenure_months": n,
+            "total_interest": float(self.total_interest[i]),
+            "total_payment": float(self.total_payment[i]),
+            "schedule": {
+                "month": list(range(1, n + 1)),
+                "payment": self.payment[i, :n].tolist(),
+                "interest": self.interest[i, :n].tolist(),
+                "principal": self.principal[i, :n].tolist(),
+                "balance": self.balance[i, :n].tolist(),
+            },
+        }
+
+
+def amortization_schedules(
+    principals: Sequence[int],
+    annual_rates: Sequence[float],
+    tenures_months: Sequence[int]
+) -> AmortizationSchedule:
+    """Build repayment schedules for many loans at once.
+
+    Loans are grouped by (rate, tenure) -- in practice a handful of loan
+    products -- and each group is computed as one array operation from the
+    closed-form balance  B_k = P (1+r)^k - EMI ((1+r)^k - 1) / r.
+    """
+    principal_arr = np.asarray(principals, dtype=np.int64)
+    rate_arr = np.asarray(annual_rates, dtype=np.float64)
+    tenure_arr = np.asarray(tenures_months, dtype=np.int64)
+
+    n = len(principal_arr)
+    if len(rate_arr) != n or len(tenure_arr) != n:
+        raise ValueError("principals, annual_rates and tenures_months must have the same length.")
+    if n and (tenure_arr.min() <= 0 or principal_arr.min() < 0 or rate_arr.min() < 0):
+        raise ValueError("Tenure must be positive; principal and rate must not be negative.")
+    if n and (tenure_arr.max() > MAX_TENURE_MONTHS or not np.isfinite(rate_arr).all()):
+        raise ValueError(f"Tenure must be at most {MAX_TENURE_MONTHS} months and the rate a finite number.")
+    if n and (rate_arr.max() > MAX_ANNUAL_RATE_PCT or principal_arr.max() > MAX_PRINCIPAL):
+        raise ValueError(f"Rate must be at most {MAX_ANNUAL_RATE_PCT}% and principal at most ₹{MAX_PRINCIPAL // 10**7} crore.")
+
+    width = int(tenure_arr.max()) if n else 0
+    emi = np.zeros(n, dtype=np.int64)
+    payment = np.zeros((n, width))
+    interest = np.zeros((n, width))
+    principal_paid = np.zeros((n, width))
+    balance = np.zeros((n, width))
+
+    pairs = np.unique(np.stack([rate_arr, tenure_arr.astype(np.float64)], axis=1), axis=0) if n else []
+    for rate, tenure in pairs:
+        rate, tenure = float(rate), int(tenure)
+        rows = np.flatnonzero((rate_arr == rate) & (tenure_arr == tenure))
+        p = principal_arr[rows].astype(np.float64)[:, None]
+        e = emi_vector(principal_arr[rows], rate, tenure)
+
+        if rate == 0:
+            months = np.arange(tenure + 1, dtype=np.float64)
+            bal = p - e[:, None] * months
+            month_interest = np.zeros((len(rows), tenure))
+        else:
+            monthly_rate, _ = annuity_growth(rate, tenure)
+            g = _growth_powers(rate, tenure)
+            bal = p * g - e[:, None] * ((g - 1) / monthly_rate)
+            month_interest = bal[:, :-1] * monthly_rate
+
+        opening = bal[:, :-1]
+        month_principal = e[:, None] - month_interest
+        month_payment = np.broadcast_to(e[:, None], month_interest.shape).astype(np.float64)
+
+        # Final instalment clears whatever the truncated EMI left over.
+        month_principal[:, -1] = opening[:, -1]
+        month_payment[:, -1] = opening[:, -1] + month_interest[:, -1]
+        closing = np.concatenate([bal[:, 1:-1], np.zeros((len(rows), 1))], axis=1)
+
+        emi[rows] = e
+        payment[rows, :tenure] = month_payment.round(2)
+        interest[rows, :tenure] = month_interest.round(2)
+        principal_paid[rows, :tenure] = month_principal.round(2)
+        balance[rows, :tenure] = closing.round(2)
+
+    return AmortizationSchedule(
+        emi=emi,
+        tenure_months=tenure_arr,
+        payment=payment,
+        interest=interest,
+        principal=principal_paid,
+        balance=balance
+    )
+
+
+def amortization_schedule(principal: int, annual_rate: float, tenure_months: int) -> Dict:
+    """Repayment schedule for a single loan, as plain lists."""
+    return amortization_schedules([principal], [annual_rate], [tenure_months]).loan(0)
@@ -9,21 +9,62 @@ from typing import Dict, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime
 
-# ============================================================================
-# IN-MEMORY DATABASE (In production, use a real database like SQLite/PostgreSQL)
-# ============================================================================
-
-# Registered users database: {mobile_number: user_data}
-REGISTERED_USERS: Dict[str, dict] = {}
-
-# Pending OTP verifications: {mobile_number: {"otp": str, "expires": float, "attempts": int}}
-PENDING_OTPS: Dict[str, dict] = {}
+from services.auth_backends import (
+    OTP_EXPIRED,
+    OTP_INVALID,
+    OTP_LOCKED,
+    OTP_MISSING,
+    AuthStateBackend,
+    create_backend_from_env,
+)
+from services.rate_limit import TokenBucketLimiter
 
 # OTP Configuration
 OTP_LENGTH = 6
 OTP_EXPIRY_SECONDS = 300  # 5 minutes
 MAX_OTP_ATTEMPTS = 3
 OTP_RESEND_COOLDOWN = 60  # 1 minute before resend
+MAX_PENDING_OTPS = 100000  # Hard cap on numbers waiting for verification
+OTP_SWEEP_INTERVAL = 30  # Seconds between background expiry sweeps
+
+# OTP rate limits (token buckets). Per mobile: burst of 5, then 1 every 5 minutes.
+# Per client IP: burst of 20, then 1 every 30 seconds, across all numbers.
+OTP_MOBILE_BURST = 5
+OTP_MOBILE_REFILL_SECONDS = 300
+OTP_IP_BURST = 20
+OTP_IP_REFILL_SECONDS = 30
+RATE_LIMIT_MAX_KEYS = 50000  # Buckets kept per limiter (least recently used dropped)
+
+OTP_IP_LIMITER = TokenBucketLimiter(
+    "otp_per_ip", OTP_IP_BURST, 1 / OTP_IP_REFILL_SECONDS, RATE_LIMIT_MAX_KEYS
+)
+OTP_MOBILE_LIMITER = TokenBucketLimiter(
+    "otp_per_mobile", OTP_MOBILE_BURST, 1 / OTP_MOBILE_REFILL_SECONDS, RATE_LIMIT_MAX_KEYS
+)
+
+# ============================================================================
+# STATE BACKEND
+# Registered users ({mobile_number: user_data}) and pending OTPs
+# ({mobile_number: {"otp": str, "expires": float, "attempts": int, "sent_at": float}}).
+# In-memory by default; set AGRIVISION_AUTH_BACKEND=sqlite to share state
+# between several worker processes.
+# ============================================================================
+
+_backend: AuthStateBackend = create_backend_from_env(
+    max_pending_otps=MAX_PENDING_OTPS,
+    otp_ttl=OTP_EXPIRY_SECONDS,
+    sweep_interval=OTP_SWEEP_INTERVAL
+)
+
+
+def get_backend() -> AuthStateBackend:
+    return _backend
+
+
+def set_backend(backend: AuthStateBackend) -> None:
+    """Swap the state backend (e.g. in tests or from app configuration)."""
+    global _backend
+    _backend = backend
 
 
 @dataclass
@@ -36,6 +77,11 @@ class AuthResult:
     user_data: Optional[dict] = None
 
 
+def normalize_mobile_number(mobile: str) -> str:
+    """Strip the spaces and dashes farmers type, so every form keys the same user."""
+    return mobile.strip().replace(" ", "").replace("-", "")
+
+
 def validate_mobile_number(mobile: str) -> Tuple[bool, str]:
     """
     Validate Indian mobile number format.
@@ -48,7 +94,7 @@ def validate_mobile_number(mobile: str) -> Tuple[bool, str]:
         return False, "Mobile number is required."
     
     # Remove any spaces or dashes
-    mobile = mobile.replace(" ", "").replace("-", "")
+    mobile = normalize_mobile_number(mobile)
     
     if not mobile.isdigit():
         return False, "Mobile number must contain only digits."
@@ -69,12 +115,29 @@ def generate_otp() -> str:
 
 def is_user_registered(mobile: str) -> bool:
     """Check if a mobile number is already registered."""
-    return mobile in REGISTERED_USERS
+    return _backend.get_user(mobile) is not None
 
 
 def get_user_data(mobile: str) -> Optional[dict]:
     """Get user data for a registered mobile number."""
-    return REGISTERED_USERS.get(mobile)
+    return _backend.get_user(mobile)
+
+
+def check_otp_rate_limit(mobile: str, client_ip: str) -> Tuple[bool, str, int]:
+    """
+    Check the per-IP and per-mobile OTP limits before sending an OTP.
+    
+    Returns: (allowed, message, retry_after_seconds)
+    """
+    allowed, retry_after = OTP_IP_LIMITER.allow(client_ip)
+    if not allowed:
+        return False, f"Too many OTP requests from your network. Please try again in {retry_after} seconds.", retry_after
+    
+    allowed, retry_after = OTP_MOBILE_LIMITER.allow(mobile)
+    if not allowed:
+        return False, f"Too many OTP requests for this number. Please try again in {retry_after} seconds.", retry_after
+    
+    return True, "", 0
 
 
 def send_otp(mobile: str) -> Tuple[bool, str, str]:
@@ -84,24 +147,20 @@ def send_otp(mobile: str) -> Tuple[bool, str, str]:
     
     Returns: (success, message, otp_for_demo)
     """
-    # Check cooldown
-    if mobile in PENDING_OTPS:
-        pending = PENDING_OTPS[mobile]
-        time_since_sent = time.time() - (pending.get("sent_at", 0))
-        if time_since_sent < OTP_RESEND_COOLDOWN:
-            remaining = int(OTP_RESEND_COOLDOWN - time_since_sent)
-            return False, f"Please wait {remaining} seconds before requesting a new OTP.", ""
-    
     # Generate OTP
     otp = generate_otp()
+    now = time.time()
     
-    # Store OTP with expiry
-    PENDING_OTPS[mobile] = {
+    # Store OTP with expiry, unless one was sent within the cooldown
+    pending = _backend.issue_otp(mobile, {
         "otp": otp,
-        "expires": time.time() + OTP_EXPIRY_SECONDS,
+        "expires": now + OTP_EXPIRY_SECONDS,
         "attempts": 0,
-        "sent_at": time.time()
-    }
+        "sent_at": now
+    }, ttl=OTP_EXPIRY_SECONDS, cooldown=OTP_RESEND_COOLDOWN)
+    if pending is not None:
+        remaining = int(OTP_RESEND_COOLDOWN - (now - pending["sent_at"]))
+        return False, f"Please wait {remaining} seconds before requesting a new OTP.", ""
     
     # In production, send SMS here using API
     # Example: send_sms_via_gateway(mobile, f"Your AgriVision OTP is: {otp}")
@@ -116,53 +175,41 @@ def verify_otp(mobile: str, entered_otp: str) -> Tuple[bool, str]:
     
     Returns: (success, message)
     """
-    if mobile not in PENDING_OTPS:
+    # Read, compare, count and consume happen in one backend operation, so
+    # concurrent guesses cannot all pass the attempts check.
+    status, remaining = _backend.check_otp(mobile, entered_otp, MAX_OTP_ATTEMPTS)
+    if status == OTP_MISSING:
         return False, "No OTP was sent to this number. Please request a new OTP."
-    
-    pending = PENDING_OTPS[mobile]
-    
-    # Check expiry
-    if time.time() > pending["expires"]:
-        del PENDING_OTPS[mobile]
+    if status == OTP_EXPIRED:
         return False, "OTP has expired. Please request a new OTP."
-    
-    # Check attempts
-    if pending["attempts"] >= MAX_OTP_ATTEMPTS:
-        del PENDING_OTPS[mobile]
+    if status == OTP_LOCKED:
         return False, "Too many failed attempts. Please request a new OTP."
-    
-    # Verify OTP
-    if entered_otp != pending["otp"]:
-        pending["attempts"] += 1
-        remaining = MAX_OTP_ATTEMPTS - pending["attempts"]
+    if status == OTP_INVALID:
         if remaining > 0:
             return False, f"Invalid OTP. {remaining} attempts remaining."
-        else:
-            del PENDING_OTPS[mobile]
-            return False, "Invalid OTP. Maximum attempts exceeded. Please request a new OTP."
+        return False, "Invalid OTP. Maximum attempts exceeded. Please request a new OTP."
     
-    # OTP verified successfully
-    del PENDING_OTPS[mobile]
     return True, "OTP verified successfully."
 
 
-def register_user(mobile: str, name: str = "") -> Tuple[bool, str]:
+def register_user(mobile: str, name: str = "", profile: Optional[dict] = None) -> Tuple[bool, str]:
     """
     Register a new user after OTP verification.
+    ``profile`` holds optional alert subscription fields (district, crops).
     
     Returns: (success, message)
     """
-    if is_user_registered(mobile):
-        return False, "This mobile number is already registered."
-    
     # Create user record
-    REGISTERED_USERS[mobile] = {
+    created = _backend.add_user_if_absent(mobile, {
         "mobile": mobile,
         "name": name if name else f"Farmer_{mobile[-4:]}",
         "registered_at": datetime.now().isoformat(),
         "verified": True,
-        "last_login": datetime.now().isoformat()
-    }
+        "last_login": datetime.now().isoformat(),
+        **(profile or {})
+    })
+    if not created:
+        return False, "This mobile number is already registered."
     
     return True, "Registration successful! Welcome to AgriVision."
 
@@ -173,11 +220,9 @@ def login_user(mobile: str) -> Tuple[bool, str]:
     
     Returns: (success, message)
     """
-    if not is_user_registered(mobile):
-        return False, "This mobile number is not registered. Please sign up first."
-    
     # Update last login
-    REGISTERED_USERS[mobile]["last_login"] = datetime.now().isoformat()
+    if not _backend.update_last_login(mobile, datetime.now().isoformat()):
+        return False, "This mobile number is not registered. Please sign up first."
     
     return True, "Login successful! Welcome back."
 
@@ -228,7 +273,7 @@ def initiate_auth(mobile: str) -> AuthResult:
     )
 
 
-def complete_auth(mobile: str, otp: str, name: str = "") -> AuthResult:
+def complete_auth(mobile: str, otp: str, name: str = "", profile: Optional[dict] = None) -> AuthResult:
     """
     Complete authentication after OTP verification.
     Handles both signup and login flows.
@@ -262,7 +307,7 @@ def complete_auth(mobile: str, otp: str, name: str = "") -> AuthResult:
         )
     else:
         # Register new user
-        reg_success, reg_msg = register_user(mobile, name)
+        reg_success, reg_msg = register_user(mobile, name, profile)
         user_data = get_user_data(mobile) if reg_success else None
         return AuthResult(
             success=reg_success,
@@ -274,14 +319,34 @@ def complete_auth(mobile: str, otp: str, name: str = "") -> AuthResult:
         )
 
 
+def update_user_profile(mobile: str, fields: dict) -> Tuple[bool, str]:
+    """Update profile fields such as the district and crops used for alerts."""
+    if _backend.update_user_profile(mobile, fields):
+        return True, "Profile updated."
+    return False, "User not found."
+
+
+def get_otp_store_metrics() -> Dict[str, int]:
+    """Live entry and eviction counters for the pending-OTP store."""
+    return _backend.metrics()
+
+
+def get_auth_metrics() -> Dict[str, Dict[str, int]]:
+    """OTP store and rate limiter counters, for monitoring."""
+    return {
+        "otp_store": get_otp_store_metrics(),
+        OTP_IP_LIMITER.name: OTP_IP_LIMITER.metrics(),
+        OTP_MOBILE_LIMITER.name: OTP_MOBILE_LIMITER.metrics(),
+    }
+
+
 def get_all_users() -> Dict[str, dict]:
     """Get all registered users (for admin purposes)."""
-    return REGISTERED_USERS.copy()
+    return _backend.all_users()
 
 
 def delete_user(mobile: str) -> Tuple[bool, str]:
     """Delete a user account."""
-    if mobile in REGISTERED_USERS:
-        del REGISTERED_USERS[mobile]
+    if _backend.delete_user(mobile):
         return True, "User account deleted successfully."
     return False, "User not found."
@@ -0,0 +1,432 @@
+"""
+Auth State Backends for Kerala Smart Farmer
+Where registered users and pending OTPs are kept.
+
+- MemoryAuthBackend: per-process dicts (default, good for one worker / demo).
+- SQLiteAuthBackend: a shared SQLite file, so any number of worker processes
+  on the same machine can send and verify OTPs for each other.
+
+Select with the AGRIVISION_AUTH_BACKEND environment variable
+("memory" or "sqlite"); the SQLite file path comes from AGRIVISION_AUTH_DB.
+"""
+
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple
+
+from services.expiring_store import ExpiringStore
+
+# check_otp outcomes
+OTP_VERIFIED = "verified"
+OTP_INVALID = "invalid"
+OTP_LOCKED = "locked"
+OTP_EXPIRED = "expired"
+OTP_MISSING = "missing"
+
+
+class AuthStateBackend(ABC):
+    """Interface for user and OTP state.
+
+    Every method is a single atomic operation, so callers never need a
+    read-modify-write across two calls to stay correct under concurrency.
+    """
+
+    # ---- Users -------------------------------------------------------
+
+    @abstractmethod
+    def get_user(self, mobile: str) -> Optional[dict]:
+        ...
+
+    @abstractmethod
+    def add_user_if_absent(self, mobile: str, data: dict) -> bool:
+        """Store a new user; returns False if the number is already registered."""
+
+    @abstractmethod
+    def update_last_login(self, mobile: str, timestamp: str) -> bool:
+        ...
+
+    @abstractmethod
+    def update_user_profile(self, mobile: str, fields: dict) -> bool:
+        """Set profile fields (e.g. district, crops) on an existing user."""
+
+    @abstractmethod
+    def delete_user(self, mobile: str) -> bool:
+        ...
+
+    @abstractmethod
+    def all_users(self) -> Dict[str, dict]:
+        ...
+
+    @abstractmethod
+    def iter_users(self, batch_size: int = 10_000) -> Iterator[Tuple[str, dict]]:
+        """(mobile, user) pairs without holding every user in memory at once."""
+
+    # ---- OTPs --------------------------------------------------------
+
+    @abstractmethod
+    def issue_otp(self, mobile: str, record: dict, ttl: float, cooldown: float) -> Optional[dict]:
+        """Store ``record`` as the pending OTP unless one was sent within ``cooldown``.
+
+        Returns None when stored, or the existing pending record when the
+        cooldown blocks a resend.
+        """
+
+    @abstractmethod
+    def get_otp(self, mobile: str) -> Optional[dict]:
+        ...
+
+    @abstractmethod
+    def check_otp(self, mobile: str, otp: str, max_attempts: int) -> Tuple[str, int]:
+        """Compare ``otp`` with the pending one, count a failure and consume it, all in one step.
+
+        Returns (status, attempts left): OTP_VERIFIED (consumed), OTP_INVALID
+        (wrong code; consumed once no attempts are left), OTP_LOCKED (already
+        out of attempts; consumed), OTP_EXPIRED or OTP_MISSING.
+        """
+
+    @abstractmethod
+    def delete_otp(self, mobile: str) -> bool:
+        """Remove the pending OTP; True only for the caller that actually removed it."""
+
+    @abstractmethod
+    def metrics(self) -> Dict[str, int]:
+        ...
+
+
+class MemoryAuthBackend(AuthStateBackend):
+    """In-process state: a users dict and an ExpiringStore of pending OTPs."""
+
+    def __init__(self, max_pending_otps: int, otp_ttl: float, sweep_interval: Optional[float] = None):
+        self.users: Dict[str, dict] = {}
+        self.pending_otps = ExpiringStore(max_entries=max_pending_otps, default_ttl=otp_ttl)
+        self._lock = threading.Lock()
+        if sweep_interval:
+            self.pending_otps.start_sweeper(sweep_interval)
+
+    def get_user(self, mobile: str) -> Optional[dict]:
+        user = self.users.get(mobile)
+        return dict(user) if user is not None else None
+
+    def add_user_if_absent(self, mobile: str, data: dict) -> bool:
+        with self._lock:
+            if mobile in self.users:
+                return False
+            self.users[mobile] = dict(data)
+            return True
+
+    def update_last_login(self, mobile: str, timestamp: str) -> bool:
+        with self._lock:
+            user = self.users.get(mobile)
+            if user is None:
+                return False
+            user["last_login"] = timestamp
+            return True
+
+    def update_user_profile(self, mobile: str, fields: dict) -> bool:
+        with self._lock:
+            user = self.users.get(mobile)
+            if user is None:
+                return False
+            user.update(fields)
+            return True
+
+    def delete_user(self, mobile: str) -> bool:
+        with self._lock:
+            return self.users.pop(mobile, None) is not None
+
+    def all_users(self) -> Dict[str, dict]:
+        with self._lock:
+            return {mobile: dict(user) for mobile, user in self.users.items()}
+
+    def iter_users(self, batch_size: int = 10_000) -> Iterator[Tuple[str, dict]]:
+        with self._lock:
+            mobiles = list(self.users)
+        for mobile in mobiles:
+            user = self.users.get(mobile)
+            if user is not None:
+                yield mobile, dict(user)
+
+    def issue_otp(self, mobile: str, record: dict, ttl: float, cooldown: float) -> Optional[dict]:
+        with self._lock:
+            existing = self.pending_otps.get(mobile)
+            if existing is not None and record["sent_at"] - existing["sent_at"] < cooldown:
+                return dict(existing)
+            self.pending_otps.set(mobile, dict(record), ttl)
+            return None
+
+    def get_otp(self, mobile: str) -> Optional[dict]:
+        record = self.pending_otps.get(mobile)
+        return dict(record) if record is not None else None
+
+    def check_otp(self, mobile: str, otp: str, max_attempts: int) -> Tuple[str, int]:
+        with self._lock:
+            record = self.pending_otps.get(mobile, expired=OTP_EXPIRED)
+            if record is None:
+                return OTP_MISSING, 0
+            if record is OTP_EXPIRED:
+                return OTP_EXPIRED, 0
+            if record["attempts"] >= max_attempts:
+                self.pending_otps.pop(mobile)
+                return OTP_LOCKED, 0
+            if otp == record["otp"]:
+                self.pending_otps.pop(mobile)
+                return OTP_VERIFIED, max_attempts - record["attempts"]
+            record["attempts"] += 1
+            remaining = max_attempts - record["attempts"]
+            if remaining <= 0:
+                self.pending_otps.pop(mobile)
+            return OTP_INVALID, remaining
+
+    def delete_otp(self, mobile: str) -> bool:
+        return self.pending_otps.pop(mobile) is not None
+
+    def metrics(self) -> Dict[str, int]:
+        stats = self.pending_otps.metrics()
+        stats["registered_users"] = len(self.users)
+        return stats
+
+
+class _ConnectionPool:
+    """Small fixed-size pool of SQLite connections shared by request threads."""
+
+    def __init__(self, db_path: str, size: int):
+        self._db_path = db_path
+        self._pool: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue(maxsize=size)
+        for _ in range(size):
+            self._pool.put(self._open())
+
+    def _open(self) -> sqlite3.Connection:
+        # isolation_level=None: we issue BEGIN IMMEDIATE ourselves so each
+        # compound operation takes the write lock up front.
+        conn = sqlite3.connect(self._db_path, timeout=10, isolation_level=None, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        conn = self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+
+_AUTH_SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    mobile TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pending_otps (
+    mobile TEXT PRIMARY KEY,
+    otp TEXT NOT NULL,
+    expires REAL NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    sent_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_pending_otps_expires ON pending_otps (expires);
+"""
+
+
+class SQLiteAuthBackend(AuthStateBackend):
+    """State shared through one SQLite database file (WAL mode).
+
+    Works across processes on the same host. Compound operations run inside
+    ``BEGIN IMMEDIATE`` transactions, so two workers cannot both issue or
+    both consume the same OTP.
+    """
+
+    def __init__(self, db_path: str, max_pending_otps: int = 100000, pool_size: int = 4, sweep_every: int = 500):
+        self._pool = _ConnectionPool(db_path, pool_size)
+        self.max_pending_otps = max_pending_otps
+        self._sweep_every = sweep_every
+        self._issued = 0
+        self.expired_evictions = 0
+        self.capacity_evictions = 0
+        with self._pool.connection() as conn:
+            conn.executescript(_AUTH_SCHEMA)
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._pool.connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    # ---- Users -------------------------------------------------------
+
+    def get_user(self, mobile: str) -> Optional[dict]:
+        with self._pool.connection() as conn:
+            row = conn.execute("SELECT data FROM users WHERE mobile = ?", (mobile,)).fetchone()
+        return json.loads(row["data"]) if row else None
+
+    def add_user_if_absent(self, mobile: str, data: dict) -> bool:
+        with self._pool.connection() as conn:
+            cur = conn.execute(
+                "INSERT OR IGNORE INTO users (mobile, data) VALUES (?, ?)", (mobile, json.dumps(data))
+            )
+        return cur.rowcount > 0
+
+    def update_last_login(self, mobile: str, timestamp: str) -> bool:
+        with self._pool.connection() as conn:
+            cur = conn.execute(
+                "UPDATE users SET data = json_set(data, '$.last_login', ?) WHERE mobile = ?",
+                (timestamp, mobile)
+            )
+        return cur.rowcount > 0
+
+    def update_user_profile(self, mobile: str, fields: dict) -> bool:
+        if not fields:
+            return self.get_user(mobile) is not None
+        with self._pool.connection() as conn:
+            cur = conn.execute(
+                "UPDATE users SET data = json_patch(data, ?) WHERE mobile = ?", (json.dumps(fields), mobile)
+            )
+        return cur.rowcount > 0
+
+    def delete_user(self, mobile: str) -> bool:
+        with self._pool.connection() as conn:
+            cur = conn.execute("DELETE FROM users WHERE mobile = ?", (mobile,))
+        return cur.rowcount > 0
+
+    def all_users(self) -> Dict[str, dict]:
+        with self._pool.connection() as conn:
+            rows = conn.execute("SELECT mobile, data FROM users").fetchall()
+        return {row["mobile"]: json.loads(row["data"]) for row in rows}
+
+    def iter_users(self, batch_size: int = 10_000) -> Iterator[Tuple[str, dict]]:
+        # Keyset pagination, so no connection is held between batches.
+        last = ""
+        while True:
+            with self._pool.connection() as conn:
+                rows = conn.execute(
+                    "SELECT mobile, data FROM users WHERE mobile > ? ORDER BY mobile LIMIT ?", (last, batch_size)
+                ).fetchall()
+            for row in rows:
+                yield row["mobile"], json.loads(row["data"])
+            if len(rows) < batch_size:
+                return
+            last = rows[-1]["mobile"]
+
+    # ---- OTPs --------------------------------------------------------
+
+    def issue_otp(self, mobile: str, record: dict, ttl: float, cooldown: float) -> Optional[dict]:
+        now = record["sent_at"]
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT otp, expires, attempts, sent_at FROM pending_otps WHERE mobile = ? AND expires > ?",
+                (mobile, now)
+            ).fetchone()
+            if row is not None and now - row["sent_at"] < cooldown:
+                return dict(row)
+            self._make_room(conn, mobile, now)
+            conn.execute(
+                "INSERT OR REPLACE INTO pending_otps (mobile, otp, expires, attempts, sent_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (mobile, record["otp"], now + ttl, record["attempts"], now)
+            )
+        self._issued += 1
+        if self._issued % self._sweep_every == 0:
+            self.sweep()
+        return None
+
+    def _make_room(self, conn: sqlite3.Connection, mobile: str, now: float) -> None:
+        """Keep at most max_pending_otps rows: drop expired rows, then the ones closest to expiry."""
+        if conn.execute("SELECT 1 FROM pending_otps WHERE mobile = ?", (mobile,)).fetchone():
+            return  # replacing this number's row does not grow the table
+        count = conn.execute("SELECT COUNT(*) FROM pending_otps").fetchone()[0]
+        if count < self.max_pending_otps:
+            return
+        cur = conn.execute("DELETE FROM pending_otps WHERE expires <= ?", (now,))
+        self.expired_evictions += cur.rowcount
+        excess = count - cur.rowcount - self.max_pending_otps + 1
+        if excess > 0:
+            cur = conn.execute(
+                "DELETE FROM pending_otps WHERE mobile IN "
+                "(SELECT mobile FROM pending_otps ORDER BY expires LIMIT ?)", (excess,)
+            )
+            self.capacity_evictions += cur.rowcount
+
+    def get_otp(self, mobile: str) -> Optional[dict]:
+        with self._pool.connection() as conn:
+            row = conn.execute(
+                "SELECT otp, expires, attempts, sent_at FROM pending_otps WHERE mobile = ? AND expires > ?",
+                (mobile, time.time())
+            ).fetchone()
+        return dict(row) if row else None
+
+    def check_otp(self, mobile: str, otp: str, max_attempts: int) -> Tuple[str, int]:
+        # One write transaction: concurrent guesses are serialised, so each
+        # sees the attempts the previous one recorded.
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT otp, expires, attempts FROM pending_otps WHERE mobile = ?", (mobile,)
+            ).fetchone()
+            if row is None:
+                return OTP_MISSING, 0
+            if row["expires"] <= time.time():
+                conn.execute("DELETE FROM pending_otps WHERE mobile = ?", (mobile,))
+                return OTP_EXPIRED, 0
+            if row["attempts"] >= max_attempts:
+                conn.execute("DELETE FROM pending_otps WHERE mobile = ?", (mobile,))
+                return OTP_LOCKED, 0
+            if otp == row["otp"]:
+                conn.execute("DELETE FROM pending_otps WHERE mobile = ?", (mobile,))
+                return OTP_VERIFIED, max_attempts - row["attempts"]
+            remaining = max_attempts - row["attempts"] - 1
+            if remaining <= 0:
+                conn.execute("DELETE FROM pending_otps WHERE mobile = ?", (mobile,))
+            else:
+                conn.execute("UPDATE pending_otps SET attempts = attempts + 1 WHERE mobile = ?", (mobile,))
+            return OTP_INVALID, remaining
+
+    def delete_otp(self, mobile: str) -> bool:
+        with self._pool.connection() as conn:
+            cur = conn.execute("DELETE FROM pending_otps WHERE mobile = ?", (mobile,))
+        return cur.rowcount > 0
+
+    def sweep(self) -> int:
+        """Delete expired OTP rows; returns how many were removed."""
+        with self._pool.connection() as conn:
+            cur = conn.execute("DELETE FROM pending_otps WHERE expires <= ?", (time.time(),))
+        self.expired_evictions += cur.rowcount
+        return cur.rowcount
+
+    def metrics(self) -> Dict[str, int]:
+        with self._pool.connection() as conn:
+            live = conn.execute(
+                "SELECT COUNT(*) FROM pending_otps WHERE expires > ?", (time.time(),)
+            ).fetchone()[0]
+            users = conn.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+        return {
+            "live_entries": live,
+            "max_entries": self.max_pending_otps,
+            "expired_evictions": self.expired_evictions,
+            "capacity_evictions": self.capacity_evictions,
+            "registered_users": users,
+        }
+
+
+def create_backend_from_env(max_pending_otps: int, otp_ttl: float, sweep_interval: float) -> AuthStateBackend:
+    """Build the backend named by AGRIVISION_AUTH_BACKEND (default: memory)."""
+    kind = os.environ.get("AGRIVISION_AUTH_BACKEND", "memory").strip().lower()
+    if kind == "sqlite":
+        db_path = os.environ.get(
+            "AGRIVISION_AUTH_DB",
+            os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "auth.db")
+        )
+        return SQLiteAuthBackend(db_path, max_pending_otps)
+    if kind == "memory":
+        return MemoryAuthBackend(max_pending_otps, otp_ttl, sweep_interval)
+    raise ValueError(f"Unknown AGRIVISION_AUTH_BACKEND: {kind!r}")
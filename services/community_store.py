@@ -0,0 +1,243 @@
+"""
+Community Post Storage for Kerala Smart Farmer
+SQLite-backed store for community posts, likes and comments.
+
+Posts survive restarts, and lookups by id, category or author use indexes
+instead of scanning every post.
+"""
+
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+# Database file location (override with AGRIVISION_COMMUNITY_DB, e.g. /tmp on serverless)
+DEFAULT_DB_PATH = os.environ.get(
+    "AGRIVISION_COMMUNITY_DB",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "community.db")
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS posts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    author TEXT NOT NULL,
+    title TEXT NOT NULL,
+    content TEXT NOT NULL,
+    category TEXT NOT NULL,
+    image_url TEXT,
+    likes INTEGER NOT NULL DEFAULT 0,
+    comment_count INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_posts_category ON posts (category, id);
+CREATE INDEX IF NOT EXISTS idx_posts_author ON posts (author, id);
+
+CREATE TABLE IF NOT EXISTS post_likes (
+    post_id INTEGER NOT NULL REFERENCES posts (id) ON DELETE CASCADE,
+    user TEXT NOT NULL,
+    PRIMARY KEY (post_id, user)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS comments (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    post_id INTEGER NOT NULL REFERENCES posts (id) ON DELETE CASCADE,
+    author TEXT NOT NULL,
+    text TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_comments_post ON comments (post_id, id);
+"""
+
+# SQL statements are module constants so sqlite3's statement cache
+# reuses the prepared form on every call.
+_SQL_INSERT_POST = (
+    "INSERT INTO posts (author, title, content, category, image_url, created_at) "
+    "VALUES (?, ?, ?, ?, ?, ?)"
+)
+# Keyset pagination: "id < cursor" walks the primary key / (category, id)
+# index directly, so fetching a page costs the same however deep it is.
+_POST_COLUMNS = "id, author, title, content, category, image_url, likes, comment_count, created_at"
+_SQL_LIST_POSTS = f"SELECT {_POST_COLUMNS} FROM posts WHERE id < ? ORDER BY id DESC LIMIT ?"
+_SQL_LIST_POSTS_BY_CATEGORY = (
+    f"SELECT {_POST_COLUMNS} FROM posts WHERE category = ? AND id < ? ORDER BY id DESC LIMIT ?"
+)
+_SQL_GET_POST = f"SELECT {_POST_COLUMNS} FROM posts WHERE id = ?"
+_SQL_DELETE_POST = "DELETE FROM posts WHERE id = ? AND author = ?"
+_SQL_INSERT_LIKE = "INSERT OR IGNORE INTO post_likes (post_id, user) VALUES (?, ?)"
+_SQL_BUMP_LIKES = "UPDATE posts SET likes = likes + 1 WHERE id = ?"
+_SQL_USER_LIKES = "SELECT post_id FROM post_likes WHERE user = ? AND post_id IN ({})"
+_SQL_INSERT_COMMENT = "INSERT INTO comments (post_id, author, text, created_at) VALUES (?, ?, ?, ?)"
+_SQL_BUMP_COMMENTS = "UPDATE posts SET comment_count = comment_count + ? WHERE id = ?"
+_SQL_DELETE_COMMENT = "DELETE FROM comments WHERE id = ? AND post_id = ? AND author = ?"
+_SQL_POST_EXISTS = "SELECT 1 FROM posts WHERE id = ?"
+_SQL_LIST_COMMENTS = (
+    "SELECT id, post_id, author, text, created_at FROM comments "
+    "WHERE post_id = ? AND id > ? ORDER BY id LIMIT ?"
+)
+
+# Largest possible SQLite rowid, used as the "newest" starting cursor.
+_MAX_ID = 2 ** 63 - 1
+
+
+def _display_time(iso_timestamp: str) -> str:
+    """Format a stored ISO timestamp for the community page."""
+    return datetime.fromisoformat(iso_timestamp).strftime("%d %b %Y, %I:%M %p")
+
+
+def _post_from_row(row: sqlite3.Row) -> dict:
+    return {
+        "id": row["id"],
+        "author": row["author"],
+        "title": row["title"],
+        "content": row["content"],
+        "category": row["category"],
+        "image_url": row["image_url"],
+        "likes": row["likes"],
+        "comment_count": row["comment_count"],
+        "timestamp": _display_time(row["created_at"]),
+    }
+
+
+def _comment_from_row(row: sqlite3.Row) -> dict:
+    return {
+        "id": row["id"],
+        "post_id": row["post_id"],
+        "author": row["author"],
+        "text": row["text"],
+        "timestamp": _display_time(row["created_at"]),
+    }
+
+
+class CommunityStore:
+    """Persistent store for community posts, likes and comments.
+
+    Each thread gets its own SQLite connection; the database runs in WAL mode
+    so readers are not blocked by a writer.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH):
+        self.db_path = db_path
+        self._local = threading.local()
+        self._connect().executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=10, cached_statements=128)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+        return conn
+
+    # ------------------------------------------------------------------
+    # Posts
+    # ------------------------------------------------------------------
+
+    def create_post(self, author: str, title: str, content: str,
+                    category: str, image_url: Optional[str] = None) -> int:
+        """Insert a new post and return its id."""
+        conn = self._connect()
+        with conn:
+            cur = conn.execute(_SQL_INSERT_POST, (
+                author, title, content, category, image_url or None,
+                datetime.now().isoformat(timespec="seconds"),
+            ))
+        return cur.lastrowid
+
+    def get_post(self, post_id: int) -> Optional[dict]:
+        """Fetch one post by id, or None if it does not exist."""
+        row = self._connect().execute(_SQL_GET_POST, (post_id,)).fetchone()
+        return _post_from_row(row) if row else None
+
+    def list_posts(self, category: Optional[str] = None, before_id: Optional[int] = None,
+                   limit: int = 20) -> Tuple[List[dict], Optional[int]]:
+        """One page of posts, newest first, optionally limited to one category.
+
+        Returns ``(posts, next_cursor)``. Pass ``next_cursor`` back as
+        ``before_id`` to get the following page; it is None on the last page.
+        """
+        conn = self._connect()
+        cursor = before_id if before_id is not None else _MAX_ID
+        if category:
+            rows = conn.execute(_SQL_LIST_POSTS_BY_CATEGORY, (category, cursor, limit + 1))
+        else:
+            rows = conn.execute(_SQL_LIST_POSTS, (cursor, limit + 1))
+        posts = [_post_from_row(row) for row in rows]
+        if len(posts) > limit:
+            posts = posts[:limit]
+            return posts, posts[-1]["id"]
+        return posts, None
+
+    def delete_post(self, post_id: int, author: str) -> bool:
+        """Delete a post (with its likes and comments) if ``author`` owns it."""
+        conn = self._connect()
+        with conn:
+            cur = conn.execute(_SQL_DELETE_POST, (post_id, author))
+        return cur.rowcount > 0
+
+    # ------------------------------------------------------------------
+    # Likes
+    # ------------------------------------------------------------------
+
+    def like_post(self, post_id: int, user: str) -> bool:
+        """Record a like; each user can like a post only once."""
+        conn = self._connect()
+        with conn:
+            if conn.execute(_SQL_POST_EXISTS, (post_id,)).fetchone() is None:
+                return False
+            cur = conn.execute(_SQL_INSERT_LIKE, (post_id, user))
+            if cur.rowcount == 0:
+                return False
+            conn.execute(_SQL_BUMP_LIKES, (post_id,))
+        return True
+
+    def liked_post_ids(self, user: str, post_ids: List[int]) -> set:
+        """Which of ``post_ids`` the given user has liked."""
+        if not post_ids:
+            return set()
+        sql = _SQL_USER_LIKES.format(",".join("?" * len(post_ids)))
+        rows = self._connect().execute(sql, (user, *post_ids))
+        return {row["post_id"] for row in rows}
+
+    # ------------------------------------------------------------------
+    # Comments
+    # ------------------------------------------------------------------
+
+    def add_comment(self, post_id: int, author: str, text: str) -> Optional[int]:
+        """Add a comment to a post; returns the comment id, or None if no such post."""
+        conn = self._connect()
+        with conn:
+            if conn.execute(_SQL_POST_EXISTS, (post_id,)).fetchone() is None:
+                return None
+            cur = conn.execute(_SQL_INSERT_COMMENT, (
+                post_id, author, text, datetime.now().isoformat(timespec="seconds"),
+            ))
+            conn.execute(_SQL_BUMP_COMMENTS, (1, post_id))
+        return cur.lastrowid
+
+    def delete_comment(self, post_id: int, comment_id: int, author: str) -> bool:
+        """Delete a comment if ``author`` wrote it."""
+        conn = self._connect()
+        with conn:
+            cur = conn.execute(_SQL_DELETE_COMMENT, (comment_id, post_id, author))
+            if cur.rowcount == 0:
+                return False
+            conn.execute(_SQL_BUMP_COMMENTS, (-1, post_id))
+        return True
+
+    def list_comments(self, post_id: int, after_id: int = 0,
+                      limit: int = 50) -> Tuple[List[dict], Optional[int]]:
+        """One page of a post's comments, oldest first.
+
+        Returns ``(comments, next_cursor)``; pass ``next_cursor`` back as
+        ``after_id`` for more. It is None when there are no more comments.
+        """
+        rows = self._connect().execute(_SQL_LIST_COMMENTS, (post_id, after_id, limit + 1))
+        comments = [_comment_from_row(row) for row in rows]
+        if len(comments) > limit:
+            comments = comments[:limit]
+            return comments, comments[-1]["id"]
+        return comments, None
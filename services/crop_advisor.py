@@ -1,7 +1,9 @@
 from dataclasses import dataclass
-from typing import List, Dict
+from typing import List, Dict, Set
 
-@dataclass
+from services.memo import invalidate, memoize, normalize_district, normalize_label, normalize_option
+
+@dataclass(frozen=True)
 class CropSuggestion:
     name: str
     season: str
@@ -56,44 +58,84 @@ CROPS_DB = [
 ]
 
 
-def recommend_crops(
-    soil_type: str,
-    land_size_acres: float,
-    district: str,
-    season: str
-) -> List[CropSuggestion]:
-    # Check if district is in Kerala
-    if district.lower().strip() not in KERALA_DISTRICTS:
-        return []  # Return empty list for non-Kerala districts
+# Inverted indexes over CROPS_DB, built once at import time so that scoring a
+# plot is a few dict lookups instead of lowercasing every crop's lists.
+# Each index maps a lowercase key to the positions of matching crops.
+_SOIL_INDEX: Dict[str, Set[int]] = {}
+_DISTRICT_INDEX: Dict[str, Set[int]] = {}
+_ALL_DISTRICT_CROPS: Set[int] = set()
+_HIGH_PROFIT_CROPS: Set[int] = set()
+_CROP_SEASONS: List[str] = []
 
-    matches: List[Dict] = []
 
-    for crop in CROPS_DB:
-        score = 0
+def _build_crop_index() -> None:
+    """(Re)build the lookup indexes from CROPS_DB."""
+    _SOIL_INDEX.clear()
+    _DISTRICT_INDEX.clear()
+    _ALL_DISTRICT_CROPS.clear()
+    _HIGH_PROFIT_CROPS.clear()
+    _CROP_SEASONS.clear()
 
-        if soil_type.lower() in [s.lower() for s in crop["soil"]]:
-            score += 2
+    for idx, crop in enumerate(CROPS_DB):
+        for soil in crop["soil"]:
+            _SOIL_INDEX.setdefault(soil.lower(), set()).add(idx)
+        for district in crop["districts"]:
+            key = district.lower()
+            if key == "all":
+                _ALL_DISTRICT_CROPS.add(idx)
+            else:
+                _DISTRICT_INDEX.setdefault(key, set()).add(idx)
+        if crop["profit_rs_per_ha"] > 100000:
+            _HIGH_PROFIT_CROPS.add(idx)
+        _CROP_SEASONS.append(crop["season"].lower())
 
-        if "all" in [d.lower() for d in crop["districts"]] or \
-           district.lower() in [d.lower() for d in crop["districts"]]:
-            score += 2
+    invalidate("recommend_crops")
 
-        if season.lower() in crop["season"].lower():
-            score += 1
 
-        if land_size_acres <= 2 and crop["profit_rs_per_ha"] > 100000:
-            score += 1
+_build_crop_index()
 
-        if score > 0:
-            matches.append({"score": score, "crop": crop})
 
-    matches.sort(key=lambda x: x["score"], reverse=True)
-    top = matches[:3]
+def _season_matches(season: str, cache: Dict[str, Set[int]]) -> Set[int]:
+    """Crops whose season text contains ``season`` (memoised per call site)."""
+    key = season.lower()
+    matched = cache.get(key)
+    if matched is None:
+        matched = {idx for idx, text in enumerate(_CROP_SEASONS) if key in text}
+        cache[key] = matched
+    return matched
+
+
+def _score_plot(
+    soil_type: str,
+    land_size_acres: float,
+    district: str,
+    season: str,
+    season_cache: Dict[str, Set[int]]
+) -> List[CropSuggestion]:
+    if district.lower().strip() not in KERALA_DISTRICTS:
+        return []
+
+    scores = [0] * len(CROPS_DB)
+    for idx in _SOIL_INDEX.get(soil_type.lower(), ()):
+        scores[idx] += 2
+    for idx in _ALL_DISTRICT_CROPS | _DISTRICT_INDEX.get(district.lower(), set()):
+        scores[idx] += 2
+    for idx in _season_matches(season, season_cache):
+        scores[idx] += 1
+    if land_size_acres <= 2:
+        for idx in _HIGH_PROFIT_CROPS:
+            scores[idx] += 1
+
+    # Highest score first; ties keep CROPS_DB order (same as a stable sort).
+    ranked = sorted(
+        (idx for idx, score in enumerate(scores) if score > 0),
+        key=lambda idx: -scores[idx]
+    )
 
     suggestions: List[CropSuggestion] = []
-    for item in top:
-        c = item["crop"]
-        factor = land_size_acres / 2.47  # acres to hectares
+    factor = land_size_acres / 2.47  # acres to hectares
+    for idx in ranked[:3]:
+        c = CROPS_DB[idx]
         suggestions.append(
             CropSuggestion(
                 name=c["name"],
@@ -104,3 +146,34 @@ def recommend_crops(
             )
         )
     return suggestions
+
+
+@memoize("recommend_crops", {"soil_type": normalize_option, "district": normalize_district,
+                              "season": normalize_label}, maxsize=4096)
+def recommend_crops(
+    soil_type: str,
+    land_size_acres: float,
+    district: str,
+    season: str
+) -> List[CropSuggestion]:
+    return _score_plot(soil_type, land_size_acres, district, season, {})
+
+
+def recommend_crops_batch(plots: List[Dict]) -> List[List[CropSuggestion]]:
+    """Score many plots in one pass over the prebuilt crop index.
+
+    Each plot is a dict with ``soil_type``, ``land_size_acres``, ``district``
+    and ``season`` keys. Results are returned in the same order as ``plots``
+    and match what ``recommend_crops`` gives for each plot on its own.
+    """
+    season_cache: Dict[str, Set[int]] = {}
+    return [
+        _score_plot(
+            plot["soil_type"],
+            plot["land_size_acres"],
+            plot["district"],
+            plot["season"],
+            season_cache
+        )
+        for plot in plots
+    ]
@@ -0,0 +1,334 @@
+"""
+FAO-56 Crop Water Requirement Engine
+Reference evapotranspiration (ET0) by FAO-56 Penman-Monteith, falling back
+to Hargreaves where humidity is missing, and stage-wise crop coefficient
+(Kc) curves for Kerala crops. Everything is vectorized: one call computes
+the irrigation need of N plots over D days.
+
+    ETc = Kc x ET0                        (mm/day)
+    net = max(ETc - effective rain, 0)    (+ percolation for ponded paddy)
+    gross litres = net / application efficiency x area (1 mm on 1 m2 = 1 L)
+
+References: Allen et al. (1998), FAO Irrigation and Drainage Paper 56,
+equations 6-52 and tables 11-12.
+"""
+
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+ArrayLike = Union[float, Sequence[float], np.ndarray]
+
+KERALA_LATITUDE_DEG = 10.0
+
+# Used when a weather input is missing entirely
+DEFAULT_WIND_2M_MS = 2.0  # FAO-56 recommends 2 m/s where no wind data exist
+KRS_COASTAL = 0.19  # Hargreaves radiation coefficient for coastal locations (eq. 50)
+
+# Annual-average Kerala day, for estimates without a forecast
+KERALA_CLIMATE = {"tmax_c": 31.0, "tmin_c": 23.5, "rh_pct": 80.0}
+# IMD state normal rainfall (mm) per month, January first, spread evenly over each month's days
+KERALA_MONTHLY_RAIN_MM = (10, 20, 40, 110, 220, 650, 710, 420, 250, 290, 160, 40)
+KERALA_DAILY_RAIN_MM = np.array(KERALA_MONTHLY_RAIN_MM) / np.array((31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31))
+
+# FAO-56 table 11/12 style curves: stage lengths (days) and Kc values.
+# Pepper (not in FAO-56) follows published Kerala field trials.
+KC_CURVES = {
+    "paddy": {"stages": (30, 30, 60, 30), "kc": (1.05, 1.20, 0.90), "ponded": True},
+    "banana": {"stages": (120, 90, 120, 60), "kc": (0.50, 1.10, 1.00), "ponded": False},
+    "coconut": {"stages": (60, 60, 180, 65), "kc": (0.95, 1.00, 1.00), "ponded": False},
+    "pepper": {"stages": (60, 90, 150, 65), "kc": (0.70, 0.90, 0.80), "ponded": False},
+    "tapioca": {"stages": (20, 40, 90, 60), "kc": (0.30, 0.80, 0.30), "ponded": False},
+    "vegetables": {"stages": (30, 40, 40, 25), "kc": (0.60, 1.15, 0.80), "ponded": False},
+}
+DEFAULT_KC_CURVE = "vegetables"
+
+# Growth stage names used by the forms -> fraction of the way through the season
+STAGE_POSITION = {"seedling": "initial", "vegetative": "development", "flowering": "mid", "maturity": "late"}
+
+# Field application efficiency by soil (surface / basin irrigation)
+APPLICATION_EFFICIENCY = {"sandy": 0.70, "laterite": 0.80, "loam": 0.85, "clay": 0.90}
+DEFAULT_APPLICATION_EFFICIENCY = 0.80
+
+# Deep percolation under ponded paddy (mm/day)
+PADDY_PERCOLATION_MM = {"sandy": 8.0, "laterite": 6.0, "loam": 4.0, "clay": 2.0}
+DEFAULT_PADDY_PERCOLATION_MM = 4.0
+
+# Daily effective rainfall: light showers are intercepted / evaporate, and a
+# share of heavier rain runs off
+EFFECTIVE_RAIN_MIN_MM = 5.0
+EFFECTIVE_RAIN_FRACTION = 0.8
+
+
+# ----------------------------------------------------------------------
+# Reference evapotranspiration
+# ----------------------------------------------------------------------
+
+def _sat_vapour_pressure(t: np.ndarray) -> np.ndarray:
+    """e°(T) in kPa (eq. 11)."""
+    return 0.6108 * np.exp(17.27 * t / (t + 237.3))
+
+
+def extraterrestrial_radiation(lat_deg: ArrayLike, doy: ArrayLike) -> np.ndarray:
+    """Ra in MJ m-2 day-1 (eqs. 21-25)."""
+    phi = np.radians(np.asarray(lat_deg, dtype=np.float64))
+    j = np.asarray(doy, dtype=np.float64)
+    dr = 1 + 0.033 * np.cos(2 * np.pi * j / 365)
+    delta = 0.409 * np.sin(2 * np.pi * j / 365 - 1.39)
+    ws = np.arccos(np.clip(-np.tan(phi) * np.tan(delta), -1.0, 1.0))
+    return (24 * 60 / np.pi) * 0.0820 * dr * (
+        ws * np.sin(phi) * np.sin(delta) + np.cos(phi) * np.cos(delta) * np.sin(ws)
+    )
+
+
+def hargreaves_et0(tmax: ArrayLike, tmin: ArrayLike, lat_deg: ArrayLike, doy: ArrayLike) -> np.ndarray:
+    """ET0 (mm/day) from temperature only (eq. 52)."""
+    tmax = np.asarray(tmax, dtype=np.float64)
+    tmin = np.asarray(tmin, dtype=np.float64)
+    ra = extraterrestrial_radiation(lat_deg, doy)
+    tmean = (tmax + tmin) / 2
+    return np.maximum(0.0023 * (tmean + 17.8) * np.sqrt(np.maximum(tmax - tmin, 0.0)) * 0.408 * ra, 0.0)
+
+
+def penman_monteith_et0(
+    tmax: ArrayLike,
+    tmin: ArrayLike,
+    rh_mean: ArrayLike,
+    lat_deg: ArrayLike,
+    doy: ArrayLike,
+    wind_2m: Optional[ArrayLike] = None,
+    solar_radiation: Optional[ArrayLike] = None,
+    elevation_m: ArrayLike = 10.0
+) -> np.ndarray:
+    """ET0 (mm/day), FAO-56 Penman-Monteith (eq. 6) with daily G = 0.
+
+    Missing wind uses DEFAULT_WIND_2M_MS; missing solar radiation (MJ m-2
+    day-1) is estimated from the temperature range (eq. 50).
+    """
+    tmax = np.asarray(tmax, dtype=np.float64)
+    tmin = np.asarray(tmin, dtype=np.float64)
+    rh = np.asarray(rh_mean, dtype=np.float64)
+    z = np.asarray(elevation_m, dtype=np.float64)
+    u2 = DEFAULT_WIND_2M_MS if wind_2m is None else np.where(np.isnan(wind_2m), DEFAULT_WIND_2M_MS, wind_2m)
+
+    tmean = (tmax + tmin) / 2
+    pressure = 101.3 * ((293 - 0.0065 * z) / 293) ** 5.26
+    gamma = 0.000665 * pressure
+    delta = 4098 * _sat_vapour_pressure(tmean) / (tmean + 237.3) ** 2
+    es = (_sat_vapour_pressure(tmax) + _sat_vapour_pressure(tmin)) / 2
+    ea = es * np.clip(rh, 0.0, 100.0) / 100
+
+    ra = extraterrestrial_radiation(lat_deg, doy)
+    rs_estimate = KRS_COASTAL * np.sqrt(np.maximum(tmax - tmin, 0.0)) * ra
+    rs = rs_estimate if solar_radiation is None else np.where(np.isnan(solar_radiation), rs_estimate, solar_radiation)
+    rso = (0.75 + 2e-5 * z) * ra
+    rns = (1 - 0.23) * rs
+    rnl = (
+        4.903e-9 * ((tmax + 273.16) ** 4 + (tmin + 273.16) ** 4) / 2
+        * (0.34 - 0.14 * np.sqrt(ea))
+        * (1.35 * np.minimum(rs / rso, 1.0) - 0.35)
+    )
+    rn = rns - rnl
+
+    et0 = (0.408 * delta * rn + gamma * 900 / (tmean + 273) * u2 * (es - ea)) / (delta + gamma * (1 + 0.34 * u2))
+    return np.maximum(et0, 0.0)
+
+
+def reference_et0(
+    tmax: ArrayLike,
+    tmin: ArrayLike,
+    lat_deg: ArrayLike,
+    doy: ArrayLike,
+    rh_mean: Optional[ArrayLike] = None,
+    wind_2m: Optional[ArrayLike] = None,
+    solar_radiation: Optional[ArrayLike] = None
+) -> np.ndarray:
+    """Penman-Monteith where humidity is known, Hargreaves elsewhere (element-wise)."""
+    hargreaves = hargreaves_et0(tmax, tmin, lat_deg, doy)
+    if rh_mean is None:
+        return hargreaves
+    rh = np.asarray(rh_mean, dtype=np.float64)
+    with np.errstate(invalid="ignore"):
+        pm = penman_monteith_et0(tmax, tmin, rh, lat_deg, doy, wind_2m, solar_radiation)
+    return np.where(np.isnan(rh), hargreaves, pm)
+
+
+# ----------------------------------------------------------------------
+# Crop coefficients
+# ----------------------------------------------------------------------
+
+def _kc_curve(stages, kc) -> np.ndarray:
+    """Daily Kc over one season (fig. 25): flat, rising, flat, falling."""
+    ini, dev, mid, late = stages
+    kc_ini, kc_mid, kc_end = kc
+    return np.concatenate([
+        np.full(ini, kc_ini),
+        np.linspace(kc_ini, kc_mid, dev, endpoint=False),
+        np.full(mid, kc_mid),
+        np.linspace(kc_mid, kc_end, late),
+    ])
+
+
+CROP_IDS = {crop: i for i, crop in enumerate(KC_CURVES)}
+SEASON_DAYS = np.array([sum(c["stages"]) for c in KC_CURVES.values()])
+# KC_TABLE[crop_id, day_after_planting]; padded with each crop's final Kc
+KC_TABLE = np.array([
+    np.pad(_kc_curve(c["stages"], c["kc"]), (0, int(SEASON_DAYS.max()) - sum(c["stages"])), mode="edge")
+    for c in KC_CURVES.values()
+])
+PONDED = np.array([c["ponded"] for c in KC_CURVES.values()])
+
+
+def crop_id(crop: str) -> int:
+    return CROP_IDS.get(crop.strip().lower(), CROP_IDS[DEFAULT_KC_CURVE])
+
+
+def stage_day(crop: str, stage: str) -> int:
+    """Representative day after planting for a named growth stage (middle of that FAO stage)."""
+    stages = KC_CURVES[list(KC_CURVES)[crop_id(crop)]]["stages"]
+    index = ("initial", "development", "mid", "late").index(STAGE_POSITION.get(stage.strip().lower(), "development"))
+    return sum(stages[:index]) + stages[index] // 2
+
+
+# ----------------------------------------------------------------------
+# Engine
+# ----------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class WaterRequirement:
+    """(plots x days) arrays."""
+    et0_mm: np.ndarray
+    kc: np.ndarray
+    etc_mm: np.ndarray
+    net_mm: np.ndarray
+    gross_liters: np.ndarray
+
+
+def water_requirement(
+    crop_ids: np.ndarray,
+    days_after_planting: np.ndarray,
+    area_m2: np.ndarray,
+    soil: Sequence[str],
+    tmax: np.ndarray,
+    tmin: np.ndarray,
+    rh_mean: Optional[np.ndarray] = None,
+    wind_2m: Optional[np.ndarray] = None,
+    effective_rain_mm: Optional[np.ndarray] = None,
+    start_doy: int = 1,
+    lat_deg: ArrayLike = KERALA_LATITUDE_DEG,
+    weather_rows: Optional[np.ndarray] = None
+) -> WaterRequirement:
+    """Irrigation need of N plots over D days.
+
+    Plot arrays are shaped (N,); weather arrays are (D,) for one weather
+    series shared by all plots, or (N, D) per plot. ``lat_deg`` is a scalar
+    or (N,) per plot. With ``weather_rows`` (N,), the weather arrays and
+    ``lat_deg`` are instead (K, D) / (K,) per station or district, and plot
+    i uses row ``weather_rows[i]``; ET0 is then computed once per row.
+    """
+    crop_ids = np.asarray(crop_ids, dtype=np.int64)
+    n = len(crop_ids)
+    tmax = np.atleast_2d(np.asarray(tmax, dtype=np.float64))
+    d = tmax.shape[1]
+    doy = (start_doy - 1 + np.arange(d)) % 365 + 1
+    lat = np.asarray(lat_deg, dtype=np.float64)
+    lat = lat[:, None] if lat.ndim == 1 else lat
+
+    def per_plot(values):
+        return None if values is None else np.atleast_2d(np.asarray(values, dtype=np.float64))
+
+    et0 = reference_et0(tmax, per_plot(tmin), lat, doy[None, :], per_plot(rh_mean), per_plot(wind_2m))
+    if weather_rows is not None:
+        et0 = et0[weather_rows]
+    et0 = np.broadcast_to(et0, (n, d))
+    day = np.minimum(np.asarray(days_after_planting, dtype=np.int64)[:, None] + np.arange(d), KC_TABLE.shape[1] - 1)
+    kc = KC_TABLE[crop_ids[:, None], day]
+    etc = kc * et0
+
+    rain = 0.0
+    if effective_rain_mm is not None:
+        rain = per_plot(effective_rain_mm)
+        rain = np.broadcast_to(rain if weather_rows is None else rain[weather_rows], (n, d))
+    net = np.maximum(etc + ponding_losses(crop_ids, soil)[:, None] - rain, 0.0)
+    gross = net / application_efficiency(soil)[:, None] * np.asarray(area_m2, dtype=np.float64)[:, None]
+    return WaterRequirement(et0_mm=et0, kc=kc, etc_mm=etc, net_mm=net, gross_liters=gross)
+
+
+def application_efficiency(soil: Sequence[str]) -> np.ndarray:
+    """(N,) field application efficiency per plot's soil type."""
+    return np.array([APPLICATION_EFFICIENCY.get(s.strip().lower(), DEFAULT_APPLICATION_EFFICIENCY) for s in soil])
+
+
+def ponding_losses(crop_ids: np.ndarray, soil: Sequence[str]) -> np.ndarray:
+    """(N,) daily deep percolation (mm) to replace under ponded crops; 0 elsewhere."""
+    percolation = np.array([PADDY_PERCOLATION_MM.get(s.strip().lower(), DEFAULT_PADDY_PERCOLATION_MM) for s in soil])
+    return np.where(PONDED[np.asarray(crop_ids, dtype=np.int64)], percolation, 0.0)
+
+
+def effective_rainfall(rain_mm: ArrayLike) -> np.ndarray:
+    """Rain that reaches the root zone: showers under EFFECTIVE_RAIN_MIN_MM are lost, then 80% counts."""
+    rain = np.asarray(rain_mm, dtype=np.float64)
+    return np.where(rain < EFFECTIVE_RAIN_MIN_MM, 0.0, EFFECTIVE_RAIN_FRACTION * rain)
+
+
+def climate_weather(start: date, days: int) -> Dict[str, np.ndarray]:
+    """Kerala climatology for ``days`` days from ``start``: constant temperatures / humidity, monthly mean rain."""
+    months = np.array([(start + timedelta(days=i)).month for i in range(days)])
+    return {
+        "tmax_c": np.full(days, KERALA_CLIMATE["tmax_c"]),
+        "tmin_c": np.full(days, KERALA_CLIMATE["tmin_c"]),
+        "rh_pct": np.full(days, KERALA_CLIMATE["rh_pct"]),
+        "rain_mm": KERALA_DAILY_RAIN_MM[months - 1],
+    }
+
+
+def district_weather(district: Optional[str], days: int, start: Optional[date] = None) -> Dict:
+    """tmax / tmin / rh / rain (D,) for a district from ``start`` (default today).
+
+    Days the ingested forecast covers use its district means; the rest, such
+    as days of a stale forecast that are already past, use climatology. Also returns "start_doy" and "forecast_days", the number of
+    forecast days used.
+    """
+    grid = None
+    if district:
+        from services.weather_grid import open_weather_grid
+
+        grid = open_weather_grid()
+        if district.strip().lower() not in grid.districts or not grid.dates["forecast"]:
+            grid = None
+    start = start or date.today()
+
+    series = climate_weather(start, days)
+    forecast_days = 0
+    if grid:
+        forecast_start = date.fromisoformat(grid.dates["forecast"][0])
+        offset = (forecast_start - start).days
+        first, last = max(offset, 0), min(offset + len(grid.dates["forecast"]), days)
+        if first < last:
+            for variable in series:
+                values = grid.district_series("forecast", district.strip(), variable)
+                series[variable][first:last] = values[first - offset:last - offset]
+            forecast_days = last - first
+    series["start_doy"] = start.timetuple().tm_yday
+    series["forecast_days"] = forecast_days
+    return series
+
+
+def district_weather_rows(
+    districts: Sequence[Optional[str]],
+    days: int,
+    start: Optional[date] = None
+) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+    """One weather series per distinct district, as (K, D) arrays, and each plot's row (N,).
+
+    Plots without a district share the climatology row. Pass the result to
+    water_requirement(..., weather_rows=rows).
+    """
+    keys = [d.strip().lower() if d else "" for d in districts]
+    names = sorted(set(keys))
+    row = {name: i for i, name in enumerate(names)}
+    series = [district_weather(name or None, days, start) for name in names]
+    weather = {v: np.stack([s[v] for s in series]) for v in ("tmax_c", "tmin_c", "rh_pct", "rain_mm")}
+    return weather, np.array([row[k] for k in keys], dtype=np.int64)
@@ -0,0 +1,168 @@
+"""
+Expiring key-value store used for short-lived auth state (pending OTPs).
+
+Entries carry a time-to-live and the store has a hard size limit, so keys
+that are never read again (e.g. OTPs that are never verified) cannot grow
+memory without bound.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+_MISSING = object()
+
+
+class ExpiringStore:
+    """Thread-safe dict with per-entry TTL and a maximum number of entries.
+
+    - ``get`` / ``set`` / ``pop`` are O(1) dict operations (plus an O(log n)
+      heap push on ``set``).
+    - Expiry order is tracked in a min-heap of ``(expires_at, seq, key)``.
+      Heap entries are not removed when a key is overwritten or popped; they
+      are skipped lazily when they reach the top.
+    - When the store is full, expired entries are swept first and then the
+      entry closest to expiry is evicted to make room.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        default_ttl: float,
+        clock: Callable[[], float] = time.time
+    ):
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._clock = clock
+        self._data: Dict[str, Tuple[Any, float, int]] = {}
+        self._heap: List[Tuple[float, int, str]] = []
+        self._seq = itertools.count()
+        self._lock = threading.RLock()
+        self._sweeper: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+        self.expired_evictions = 0
+        self.capacity_evictions = 0
+
+    # ------------------------------------------------------------------
+    # Mapping operations
+    # ------------------------------------------------------------------
+
+    def get(self, key: str, default: Any = None, expired: Any = _MISSING) -> Any:
+        """The live value, else ``default``.
+
+        If ``expired`` is given, it is returned instead of ``default`` when the
+        entry is still held but past its TTL (it is removed either way).
+        Entries already swept are simply absent.
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            if entry[1] <= self._clock():
+                del self._data[key]
+                self.expired_evictions += 1
+                return default if expired is _MISSING else expired
+            return entry[0]
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        with self._lock:
+            now = self._clock()
+            if key not in self._data and len(self._data) >= self.max_entries:
+                self._sweep_locked(now)
+                while len(self._data) >= self.max_entries:
+                    self._evict_earliest_locked()
+            expires_at = now + (self.default_ttl if ttl is None else ttl)
+            seq = next(self._seq)
+            self._data[key] = (value, expires_at, seq)
+            heapq.heappush(self._heap, (expires_at, seq, key))
+            self._compact_locked()
+
+    def pop(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.pop(key, None)
+            return default if entry is None else entry[0]
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+    # ------------------------------------------------------------------
+    # Expiry
+    # ------------------------------------------------------------------
+
+    def sweep(self) -> int:
+        """Remove all expired entries; returns how many were removed."""
+        with self._lock:
+            return self._sweep_locked(self._clock())
+
+    def start_sweeper(self, interval: float = 30.0) -> None:
+        """Start a daemon thread that calls ``sweep`` every ``interval`` seconds."""
+        with self._lock:
+            if self._sweeper is not None and self._sweeper.is_alive():
+                return
+            self._stop.clear()
+            self._sweeper = threading.Thread(
+                target=self._sweep_loop, args=(interval,), name="expiring-store-sweeper", daemon=True
+            )
+            self._sweeper.start()
+
+    def stop_sweeper(self) -> None:
+        self._stop.set()
+
+    def _sweep_loop(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            self.sweep()
+
+    def _is_current(self, seq: int, key: str) -> bool:
+        entry = self._data.get(key)
+        return entry is not None and entry[2] == seq
+
+    def _sweep_locked(self, now: float) -> int:
+        removed = 0
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            _, seq, key = heapq.heappop(heap)
+            if self._is_current(seq, key):
+                del self._data[key]
+                removed += 1
+        self.expired_evictions += removed
+        return removed
+
+    def _evict_earliest_locked(self) -> None:
+        heap = self._heap
+        while heap:
+            _, seq, key = heapq.heappop(heap)
+            if self._is_current(seq, key):
+                del self._data[key]
+                self.capacity_evictions += 1
+                return
+
+    def _compact_locked(self) -> None:
+        # Overwrites and pops leave stale heap entries behind; rebuild the
+        # heap once they outnumber live entries so it stays O(live).
+        if len(self._heap) > 2 * len(self._data) + 64:
+            self._heap = [(exp, seq, key) for key, (_, exp, seq) in self._data.items()]
+            heapq.heapify(self._heap)
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    def metrics(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "live_entries": len(self._data),
+                "max_entries": self.max_entries,
+                "expired_evictions": self.expired_evictions,
+                "capacity_evictions": self.capacity_evictions,
+                "heap_size": len(self._heap),
+            }
+
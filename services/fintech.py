@@ -3,8 +3,13 @@ Agri-FinTech Services for Kerala Farmers
 Real-world data based on Kerala Government and Central Government schemes.
 """
 
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass
-from typing import List, Dict, Optional
+from functools import lru_cache
+from typing import List, Dict, Optional, Tuple
+
+from services.market_intel import get_price_analytics, on_prices_updated
+from services.price_analytics import volatility_level
 
 # ============================================================================
 # KERALA AGRICULTURAL LOAN SCHEMES (Real Data)
@@ -160,6 +165,20 @@ KERALA_CROP_INSURANCE = {
 # ============================================================================
 # KERALA AGRICULTURAL SUBSIDIES (Real Data)
 # Sources: Kerala Agriculture Department, Central Schemes
+#
+# "eligibility" doubles as the rule for get_subsidy_recommendations. These
+# keys are predicates (all must hold):
+#   land_min_acres, land_max_ha, crops, farmer_categories,
+#   has_irrigation, organic_interest
+# Other eligibility keys are informational only.
+# What the farmer is shown comes from the entry itself: name, description,
+# documents and apply_at, plus "benefit_text" formatted with the entry's own
+# fields and {benefit} / {percent}, computed as named by "benefit" (rupee
+# fields listed in _RUPEE_FIELDS are pre-formatted in lakh notation):
+#   "per_ha"           amount_per_ha x land (ha)
+#   "per_ha_percent"   max_amount_per_ha x land (ha) x amount_percent %
+#   "category_percent" amount_percent, or amount_percent_scst for SC/ST
+# Eligible schemes are listed in table order.
 # ============================================================================
 
 KERALA_SUBSIDIES = [
@@ -167,7 +186,7 @@ KERALA_SUBSIDIES = [
         "id": "pm_kisan",
         "name": "PM-KISAN Samman Nidhi",
         "amount": 6000,
-        "frequency": "Annual (₹2,000 x 3 instalments)",
+        "frequency": "₹2,000 x 3 instalments",
         "eligibility": {
             "land_max_ha": 2.0,  # Small and marginal farmers
             "income_limit": None,
@@ -175,7 +194,8 @@ KERALA_SUBSIDIES = [
         },
         "description": "Direct income support of ₹6,000 per year to all farmer families.",
         "documents": ["Aadhaar", "Land records", "Bank account"],
-        "apply_at": "Common Service Centre / Krishi Bhavan / pmkisan.gov.in"
+        "apply_at": "Common Service Centre / Krishi Bhavan / pmkisan.gov.in",
+        "benefit_text": "₹{amount} per year ({frequency})"
     },
     {
         "id": "drip_irrigation",
@@ -185,11 +205,13 @@ KERALA_SUBSIDIES = [
         "max_amount_per_ha": 100000,
         "eligibility": {
             "land_min_acres": 0.25,
-            "crops": ["Vegetables", "Banana", "Coconut", "Pepper", "Fruit crops"]
+            "crops": ["Vegetables", "Banana", "Coconut", "Pepper", "Arecanut", "Fruit crops"]
         },
         "description": "55% subsidy on drip and sprinkler irrigation systems under Pradhan Mantri Krishi Sinchayee Yojana.",
         "documents": ["Land documents", "Quotation from approved supplier", "Bank account"],
-        "apply_at": "Krishi Bhavan / eMISSION portal"
+        "apply_at": "Krishi Bhavan / eMISSION portal",
+        "benefit": "per_ha_percent",
+        "benefit_text": "Up to ₹{benefit} ({percent}% of cost)"
     },
     {
         "id": "farm_mechanization",
@@ -203,7 +225,9 @@ KERALA_SUBSIDIES = [
         },
         "description": "50-60% subsidy on farm machinery under Sub-Mission on Agricultural Mechanization.",
         "documents": ["Land documents", "Aadhaar", "Quotation", "SC/ST certificate if applicable"],
-        "apply_at": "Krishi Bhavan / agrimachinery.nic.in"
+        "apply_at": "Krishi Bhavan / agrimachinery.nic.in",
+        "benefit": "category_percent",
+        "benefit_text": "Up to ₹{max_amount} ({percent}% of equipment cost)"
     },
     {
         "id": "organic_farming",
@@ -212,27 +236,14 @@ KERALA_SUBSIDIES = [
         "coverage_years": 3,
         "eligibility": {
             "land_min_acres": 0.5,
+            "organic_interest": True,
             "cluster_size": 20  # Minimum 20 farmers in a cluster
         },
         "description": "₹50,000/ha over 3 years for organic farming inputs, certification, and marketing.",
         "documents": ["Cluster formation documents", "Land records", "Commitment letter"],
-        "apply_at": "Krishi Bhavan / Agriculture Department"
-    },
-    {
-        "id": "seed_subsidy",
-        "name": "Certified Seed Subsidy",
-        "amount_percent": 50,
-        "crops": {
-            "Paddy": "₹25/kg subsidy",
-            "Vegetables": "50% subsidy",
-            "Pulses": "₹100/kg subsidy"
-        },
-        "eligibility": {
-            "land_min_acres": 0.1
-        },
-        "description": "Subsidy on certified seeds distributed through Krishi Bhavans and KSSDA.",
-        "documents": ["Ration card / Aadhaar", "Land documents"],
-        "apply_at": "Krishi Bhavan / Kerala State Seed Development Authority"
+        "apply_at": "Krishi Bhavan / Agriculture Department",
+        "benefit": "per_ha",
+        "benefit_text": "₹{benefit} over {coverage_years} years"
     },
     {
         "id": "interest_subvention",
@@ -247,7 +258,8 @@ KERALA_SUBSIDIES = [
         },
         "description": "3% interest subvention on crop loans up to ₹3 lakh. Additional 3% for timely repayment, making effective rate 4%.",
         "documents": ["KCC or crop loan account"],
-        "apply_at": "Automatic through bank"
+        "apply_at": "Automatic through bank",
+        "benefit_text": "Effective interest rate of just {effective_rate:g}% on loans up to ₹{max_loan}"
     },
     {
         "id": "pm_kusum",
@@ -256,14 +268,33 @@ KERALA_SUBSIDIES = [
         "central_share": 30,
         "state_share": 30,
         "farmer_share": 40,
-        "pump_capacity": "Up to 7.5 HP",
+        "pump_capacity": "up to 7.5 HP",
         "eligibility": {
             "land_min_acres": 0.5,
+            "has_irrigation": False,  # For farmers without an irrigation source yet
             "water_source": ["Borewell", "Open well", "Canal"]
         },
         "description": "60% subsidy (30% Central + 30% State) on standalone solar pumps for irrigation.",
         "documents": ["Land documents", "Water source proof", "Aadhaar", "Electricity bill (if replacing electric pump)"],
-        "apply_at": "ANERT / Krishi Bhavan / mnre.gov.in"
+        "apply_at": "ANERT / Krishi Bhavan / mnre.gov.in",
+        "benefit_text": "{amount_percent}% subsidy on solar pump ({pump_capacity})"
+    },
+    {
+        "id": "seed_subsidy",
+        "name": "Certified Seed Subsidy",
+        "amount_percent": 50,
+        "crops": {
+            "Paddy": "₹25/kg subsidy",
+            "Vegetables": "50% subsidy",
+            "Pulses": "₹100/kg subsidy"
+        },
+        "eligibility": {
+            "land_min_acres": 0.1
+        },
+        "description": "Subsidy on certified seeds distributed through Krishi Bhavans and KSSDA.",
+        "documents": ["Ration card / Aadhaar", "Land documents"],
+        "apply_at": "Krishi Bhavan / Kerala State Seed Development Authority",
+        "benefit_text": "{amount_percent}% subsidy on certified seeds"
     }
 ]
 
@@ -288,6 +319,8 @@ KERALA_DISTRICT_RISK = {
     "Kasaragod": {"flood": "medium", "drought": "medium", "pest": "medium"}
 }
 
+# market_volatility is only used for crops without enough price history;
+# otherwise it is derived from the measured price volatility.
 CROP_RISK_FACTORS = {
     "Paddy": {"weather_sensitivity": "high", "pest_risk": "high", "market_volatility": "medium"},
     "Banana": {"weather_sensitivity": "high", "pest_risk": "high", "market_volatility": "high"},
@@ -327,6 +360,8 @@ class InsuranceRecommendation:
     risk_score: str
     recommendation: str
     documents: List[str]
+    market_volatility: str = "medium"
+    price_volatility_pct: Optional[float] = None
 
 @dataclass
 class SubsidyRecommendation:
@@ -338,12 +373,19 @@ class SubsidyRecommendation:
     documents: List[str]
 
 
+@lru_cache(maxsize=1024)
+def annuity_growth(annual_rate: float, tenure_months: int) -> Tuple[float, float]:
+    """Monthly rate and compound growth (1 + r) ** n, cached per (rate, tenure)."""
+    monthly_rate = annual_rate / 12 / 100
+    return monthly_rate, (1 + monthly_rate) ** tenure_months
+
+
 def calculate_emi(principal: int, annual_rate: float, tenure_months: int) -> int:
     """Calculate EMI using standard formula."""
     if annual_rate == 0:
         return principal // tenure_months
-    monthly_rate = annual_rate / 12 / 100
-    emi = principal * monthly_rate * ((1 + monthly_rate) ** tenure_months) / (((1 + monthly_rate) ** tenure_months) - 1)
+    monthly_rate, growth = annuity_growth(annual_rate, tenure_months)
+    emi = principal * monthly_rate * growth / (growth - 1)
     return int(emi)
 
 
@@ -418,6 +460,136 @@ def check_loan_eligibility(
     return eligible_loans
 
 
+# ============================================================================
+# PRECOMPUTED INSURANCE RISK MATRIX
+# Risk score and premium terms for every district x crop x season class,
+# built from the tables above so a request is a single dict lookup.
+# Call rebuild_insurance_risk_matrix() after changing any of those tables.
+# ============================================================================
+
+_DEFAULT_DISTRICT_RISK = {"flood": "medium", "drought": "medium", "pest": "medium"}
+_DEFAULT_CROP_RISK = {"weather_sensitivity": "medium", "pest_risk": "medium", "market_volatility": "medium"}
+_LEVEL_POINTS = {"high": 2, "medium": 1}
+
+# Season classes used for PMFBY premium rates
+SEASON_KHARIF = "kharif"
+SEASON_RABI = "rabi"
+SEASON_COMMERCIAL = "commercial"
+INSURANCE_SEASON_CLASSES = (SEASON_KHARIF, SEASON_RABI, SEASON_COMMERCIAL)
+
+
+@dataclass(frozen=True)
+class InsuranceRiskCell:
+    risk_points: int
+    risk_score: str
+    recommendation: str
+    pmfby_sum_insured_per_ha: int
+    pmfby_premium_rate: float
+    state_max_compensation: int
+    state_premium: int
+    market_volatility: str
+    price_volatility_pct: Optional[float]
+
+
+# {(district or None, crop or None, season_class): InsuranceRiskCell}; None = not in our tables
+INSURANCE_RISK_MATRIX: Dict[Tuple[Optional[str], Optional[str], str], InsuranceRiskCell] = {}
+
+
+def insurance_season_class(season: str) -> str:
+    """Map a free-text season to the PMFBY premium class."""
+    key = season.lower()
+    if key in ("kharif", "monsoon"):
+        return SEASON_KHARIF
+    if key in ("rabi", "winter"):
+        return SEASON_RABI
+    return SEASON_COMMERCIAL
+
+
+def _risk_cell(
+    district: Optional[str],
+    crop: Optional[str],
+    season_class: str,
+    price_volatility: Dict[str, float]
+) -> InsuranceRiskCell:
+    district_risk = KERALA_DISTRICT_RISK.get(district, _DEFAULT_DISTRICT_RISK)
+    crop_risk = CROP_RISK_FACTORS.get(crop, _DEFAULT_CROP_RISK)
+    volatility_pct = price_volatility.get(crop.lower()) if crop else None
+
+    risk_points = (
+        _LEVEL_POINTS.get(district_risk["flood"], 0)
+        + _LEVEL_POINTS.get(district_risk["drought"], 0)
+        + _LEVEL_POINTS.get(crop_risk["weather_sensitivity"], 0)
+        + _LEVEL_POINTS.get(crop_risk["pest_risk"], 0)
+    )
+    if risk_points >= 6:
+        risk_score = "HIGH RISK"
+        recommendation_text = "Strongly recommended to take comprehensive crop insurance."
+    elif risk_points >= 3:
+        risk_score = "MEDIUM RISK"
+        recommendation_text = "Recommended to take crop insurance for protection."
+    else:
+        risk_score = "LOW RISK"
+        recommendation_text = "Optional but advisable to take basic insurance."
+
+    pmfby = KERALA_CROP_INSURANCE["pmfby"]
+    premium_rate = {
+        SEASON_KHARIF: pmfby["premium_kharif"],
+        SEASON_RABI: pmfby["premium_rabi"],
+        SEASON_COMMERCIAL: pmfby["premium_commercial"],
+    }[season_class]
+
+    kerala_scheme = KERALA_CROP_INSURANCE["kerala_state"]
+    max_comp = kerala_scheme["max_compensation"].get(crop, 25000)
+
+    return InsuranceRiskCell(
+        risk_points=risk_points,
+        risk_score=risk_score,
+        recommendation=recommendation_text,
+        pmfby_sum_insured_per_ha=pmfby["sum_insured_per_ha"].get(crop, 40000),
+        pmfby_premium_rate=premium_rate,
+        state_max_compensation=max_comp,
+        state_premium=int(max_comp * kerala_scheme["premium_rate"] / 100),
+        market_volatility=(
+            volatility_level(volatility_pct) if volatility_pct is not None else crop_risk["market_volatility"]
+        ),
+        price_volatility_pct=volatility_pct
+    )
+
+
+def rebuild_insurance_risk_matrix() -> None:
+    """(Re)compute INSURANCE_RISK_MATRIX from the district, crop and insurance tables.
+
+    Also runs whenever market prices change, to pick up the latest price volatility.
+    """
+    price_volatility = {crop.lower(): pct for crop, pct in get_price_analytics().volatility_by_crop().items()}
+    crops = (
+        set(CROP_RISK_FACTORS)
+        | set(KERALA_CROP_INSURANCE["pmfby"]["sum_insured_per_ha"])
+        | set(KERALA_CROP_INSURANCE["kerala_state"]["max_compensation"])
+    )
+    matrix = {}
+    for district in [None, *KERALA_DISTRICT_RISK]:
+        for crop in [None, *crops]:
+            for season_class in INSURANCE_SEASON_CLASSES:
+                matrix[(district, crop, season_class)] = _risk_cell(district, crop, season_class, price_volatility)
+    # Swap in one assignment so concurrent readers never see a half-built matrix.
+    global INSURANCE_RISK_MATRIX
+    INSURANCE_RISK_MATRIX = matrix
+
+
+def lookup_insurance_risk(district: str, crop: str, season: str) -> InsuranceRiskCell:
+    """O(1) risk and premium terms for one district / crop / season."""
+    matrix = INSURANCE_RISK_MATRIX
+    season_class = insurance_season_class(season)
+    cell = matrix.get((district, crop, season_class))
+    if cell is None:
+        # Unknown district and/or crop: fall back to the default-risk entries.
+        known_district = district if (district, None, season_class) in matrix else None
+        known_crop = crop if (None, crop, season_class) in matrix else None
+        cell = matrix[(known_district, known_crop, season_class)]
+    return cell
+
+
 def analyze_crop_insurance_risk(
     crop: str,
     district: str,
@@ -429,44 +601,14 @@ def analyze_crop_insurance_risk(
     recommendations = []
     land_size_ha = land_size_acres * 0.4047  # Convert acres to hectares
     
-    # Get district and crop risk
-    district_risk = KERALA_DISTRICT_RISK.get(district, {"flood": "medium", "drought": "medium", "pest": "medium"})
-    crop_risk = CROP_RISK_FACTORS.get(crop, {"weather_sensitivity": "medium", "pest_risk": "medium", "market_volatility": "medium"})
-    
-    # Calculate overall risk score
-    risk_points = 0
-    if district_risk["flood"] == "high": risk_points += 2
-    elif district_risk["flood"] == "medium": risk_points += 1
-    if district_risk["drought"] == "high": risk_points += 2
-    elif district_risk["drought"] == "medium": risk_points += 1
-    if crop_risk["weather_sensitivity"] == "high": risk_points += 2
-    elif crop_risk["weather_sensitivity"] == "medium": risk_points += 1
-    if crop_risk["pest_risk"] == "high": risk_points += 2
-    elif crop_risk["pest_risk"] == "medium": risk_points += 1
-    
-    if risk_points >= 6:
-        risk_score = "HIGH RISK"
-        recommendation_text = "Strongly recommended to take comprehensive crop insurance."
-    elif risk_points >= 3:
-        risk_score = "MEDIUM RISK"
-        recommendation_text = "Recommended to take crop insurance for protection."
-    else:
-        risk_score = "LOW RISK"
-        recommendation_text = "Optional but advisable to take basic insurance."
+    # District x crop x season risk and premium terms (precomputed)
+    cell = lookup_insurance_risk(district, crop, season)
+    risk_score = cell.risk_score
     
     # PMFBY Recommendation
     pmfby = KERALA_CROP_INSURANCE["pmfby"]
-    sum_insured_per_ha = pmfby["sum_insured_per_ha"].get(crop, 40000)
-    total_sum_insured = int(sum_insured_per_ha * land_size_ha)
-    
-    if season.lower() in ["kharif", "monsoon"]:
-        premium_rate = pmfby["premium_kharif"]
-    elif season.lower() in ["rabi", "winter"]:
-        premium_rate = pmfby["premium_rabi"]
-    else:
-        premium_rate = pmfby["premium_commercial"]
-    
-    premium_amount = int(total_sum_insured * premium_rate / 100)
+    total_sum_insured = int(cell.pmfby_sum_insured_per_ha * land_size_ha)
+    premium_amount = int(total_sum_insured * cell.pmfby_premium_rate / 100)
     
     recommendations.append(InsuranceRecommendation(
         scheme_name=pmfby["name"],
@@ -475,24 +617,26 @@ def analyze_crop_insurance_risk(
         sum_insured=total_sum_insured,
         coverage=pmfby["coverage"],
         risk_score=risk_score,
-        recommendation=recommendation_text,
-        documents=pmfby["documents"]
+        recommendation=cell.recommendation,
+        documents=pmfby["documents"],
+        market_volatility=cell.market_volatility,
+        price_volatility_pct=cell.price_volatility_pct
     ))
     
     # Kerala State Scheme
     kerala_scheme = KERALA_CROP_INSURANCE["kerala_state"]
-    max_comp = kerala_scheme["max_compensation"].get(crop, 25000)
-    state_premium = int(max_comp * kerala_scheme["premium_rate"] / 100)
     
     recommendations.append(InsuranceRecommendation(
         scheme_name=kerala_scheme["name"],
         provider=kerala_scheme["provider"],
-        premium_amount=state_premium,
-        sum_insured=max_comp,
+        premium_amount=cell.state_premium,
+        sum_insured=cell.state_max_compensation,
         coverage=kerala_scheme["coverage"],
         risk_score=risk_score,
         recommendation="Good additional coverage for Kerala-specific risks.",
-        documents=kerala_scheme["documents"]
+        documents=kerala_scheme["documents"],
+        market_volatility=cell.market_volatility,
+        price_volatility_pct=cell.price_volatility_pct
     ))
     
     # Coconut Insurance if applicable
@@ -511,12 +655,172 @@ def analyze_crop_insurance_risk(
             coverage=coconut_scheme["coverage"],
             risk_score=risk_score,
             recommendation=f"Specific coverage for {palms_to_insure} coconut palms.",
-            documents=coconut_scheme["documents"]
+            documents=coconut_scheme["documents"],
+            market_volatility=cell.market_volatility,
+            price_volatility_pct=cell.price_volatility_pct
         ))
     
     return recommendations
 
 
+rebuild_insurance_risk_matrix()
+on_prices_updated(rebuild_insurance_risk_matrix)
+
+
+# ============================================================================
+# COMPILED SUBSIDY RULES
+# KERALA_SUBSIDIES is compiled once into per-predicate indexes of rule
+# positions. Evaluating a farmer intersects a few precomputed sets, so only
+# rules that can match are ever touched.
+# Call compile_subsidy_rules() after changing KERALA_SUBSIDIES.
+# ============================================================================
+
+@dataclass(frozen=True)
+class _CompiledSubsidyRules:
+    all_rules: frozenset
+    by_crop: Dict[str, frozenset]
+    any_crop: frozenset
+    by_category: Dict[str, frozenset]
+    any_category: frozenset
+    land_min_thresholds: List[float]
+    land_min_sets: List[frozenset]  # [i] = rules whose minimum is met by the i smallest thresholds
+    land_max_thresholds: List[float]
+    land_max_sets: List[frozenset]  # [i] = rules whose maximum is >= thresholds[i]
+    needs_no_irrigation: frozenset
+    needs_organic_interest: frozenset
+
+
+_SUBSIDY_RULES: Optional[_CompiledSubsidyRules] = None
+
+
+def compile_subsidy_rules() -> None:
+    """Build the predicate indexes over KERALA_SUBSIDIES."""
+    all_rules = frozenset(range(len(KERALA_SUBSIDIES)))
+    by_crop: Dict[str, set] = {}
+    by_category: Dict[str, set] = {}
+    any_crop, any_category = set(), set()
+    mins, maxes = [], []
+    no_min, no_max = set(), set()
+    needs_no_irrigation, needs_organic = set(), set()
+
+    for pos, entry in enumerate(KERALA_SUBSIDIES):
+        rule = entry.get("eligibility", {})
+        if "crops" in rule:
+            for crop in rule["crops"]:
+                by_crop.setdefault(crop, set()).add(pos)
+        else:
+            any_crop.add(pos)
+        if "farmer_categories" in rule:
+            for category in rule["farmer_categories"]:
+                by_category.setdefault(category, set()).add(pos)
+        else:
+            any_category.add(pos)
+        if "land_min_acres" in rule:
+            mins.append((rule["land_min_acres"], pos))
+        else:
+            no_min.add(pos)
+        if "land_max_ha" in rule:
+            maxes.append((rule["land_max_ha"], pos))
+        else:
+            no_max.add(pos)
+        if rule.get("has_irrigation") is False:
+            needs_no_irrigation.add(pos)
+        if rule.get("organic_interest"):
+            needs_organic.add(pos)
+
+    mins.sort()
+    min_sets = [frozenset(no_min)]
+    for _, pos in mins:
+        min_sets.append(min_sets[-1] | {pos})
+
+    maxes.sort()
+    max_sets = [frozenset(no_max)]
+    for _, pos in reversed(maxes):
+        max_sets.append(max_sets[-1] | {pos})
+    max_sets.reverse()
+
+    global _SUBSIDY_RULES
+    _SUBSIDY_RULES = _CompiledSubsidyRules(
+        all_rules=all_rules,
+        by_crop={k: frozenset(v) for k, v in by_crop.items()},
+        any_crop=frozenset(any_crop),
+        by_category={k: frozenset(v) for k, v in by_category.items()},
+        any_category=frozenset(any_category),
+        land_min_thresholds=[m for m, _ in mins],
+        land_min_sets=min_sets,
+        land_max_thresholds=[m for m, _ in maxes],
+        land_max_sets=max_sets,
+        needs_no_irrigation=frozenset(needs_no_irrigation),
+        needs_organic_interest=frozenset(needs_organic)
+    )
+
+
+def _matching_subsidy_rules(
+    land_size_acres: float,
+    land_size_ha: float,
+    crop: str,
+    farmer_category: str,
+    has_irrigation: bool,
+    organic_interest: bool
+) -> List[int]:
+    rules = _SUBSIDY_RULES
+    candidates = rules.by_crop.get(crop, frozenset()) | rules.any_crop
+    candidates &= rules.by_category.get(farmer_category, frozenset()) | rules.any_category
+    candidates &= rules.land_min_sets[bisect_right(rules.land_min_thresholds, land_size_acres)]
+    candidates &= rules.land_max_sets[bisect_left(rules.land_max_thresholds, land_size_ha)]
+    if has_irrigation:
+        candidates -= rules.needs_no_irrigation
+    if not organic_interest:
+        candidates -= rules.needs_organic_interest
+    return sorted(candidates)
+
+
+# Rupee amounts in KERALA_SUBSIDIES entries that benefit_text may show
+_RUPEE_FIELDS = ("amount", "max_amount", "max_loan", "benefit")
+
+
+def _format_inr(amount: int) -> str:
+    """Indian digit grouping (1,50,000); whole lakhs read as "3 lakh"."""
+    if amount >= 100000 and amount % 100000 == 0:
+        return f"{amount // 100000} lakh"
+    head, tail = str(amount)[:-3], str(amount)[-3:]
+    groups = []
+    while head:
+        groups.insert(0, head[-2:])
+        head = head[:-2]
+    return ",".join(groups + [tail])
+
+
+def _subsidy_recommendation(entry: dict, land_size_ha: float, farmer_category: str) -> SubsidyRecommendation:
+    benefit, percent = 0, entry.get("amount_percent")
+    kind = entry.get("benefit")
+    if kind == "per_ha":
+        benefit = int(entry["amount_per_ha"] * land_size_ha)
+    elif kind == "per_ha_percent":
+        benefit = int(entry["max_amount_per_ha"] * land_size_ha * percent / 100)
+    elif kind == "category_percent" and farmer_category in ["sc", "st"]:
+        percent = entry["amount_percent_scst"]
+
+    fields = {**entry, "benefit": benefit, "percent": percent}
+    for key in _RUPEE_FIELDS:
+        if key in fields:
+            fields[key] = _format_inr(fields[key])
+
+    status = "ELIGIBLE"
+    cluster_size = entry.get("eligibility", {}).get("cluster_size")
+    if cluster_size:
+        status += f" (Need cluster of {cluster_size}+ farmers)"
+
+    return SubsidyRecommendation(
+        scheme_name=entry["name"],
+        potential_benefit=entry["benefit_text"].format(**fields),
+        eligibility_status=status,
+        description=entry["description"],
+        how_to_apply=entry["apply_at"],
+        documents=entry["documents"]
+    )
+
+
 def get_subsidy_recommendations(
     land_size_acres: float,
     crop: str,
@@ -526,87 +830,34 @@ def get_subsidy_recommendations(
     organic_interest: bool
 ) -> List[SubsidyRecommendation]:
     """Get eligible subsidy recommendations for Kerala farmers."""
-    
-    recommendations = []
     land_size_ha = land_size_acres * 0.4047
-    
-    # PM-KISAN (Universal for small/marginal farmers)
-    if land_size_ha <= 2.0:
-        recommendations.append(SubsidyRecommendation(
-            scheme_name="PM-KISAN Samman Nidhi",
-            potential_benefit="₹6,000 per year (₹2,000 x 3 instalments)",
-            eligibility_status="ELIGIBLE" if land_size_ha <= 2.0 else "NOT ELIGIBLE",
-            description="Direct income support transferred to your bank account every 4 months.",
-            how_to_apply="Register at pmkisan.gov.in or visit Krishi Bhavan",
-            documents=["Aadhaar Card", "Land records", "Bank passbook"]
-        ))
-    
-    # Micro Irrigation Subsidy
-    if crop in ["Vegetables", "Banana", "Coconut", "Pepper", "Arecanut"]:
-        subsidy_percent = 55
-        max_benefit = int(100000 * land_size_ha * subsidy_percent / 100)
-        recommendations.append(SubsidyRecommendation(
-            scheme_name="Micro Irrigation Subsidy (PMKSY)",
-            potential_benefit=f"Up to ₹{max_benefit:,} ({subsidy_percent}% of cost)",
-            eligibility_status="ELIGIBLE",
-            description="Subsidy for drip irrigation and sprinkler systems to save water and increase yield.",
-            how_to_apply="Apply through Krishi Bhavan or eMISSION portal",
-            documents=["Land documents", "Quotation from approved supplier", "Aadhaar", "Bank account"]
-        ))
-    
-    # Farm Mechanization
-    if land_size_acres >= 0.5:
-        subsidy_percent = 60 if farmer_category in ["sc", "st"] else 50
-        recommendations.append(SubsidyRecommendation(
-            scheme_name="Farm Mechanization Subsidy (SMAM)",
-            potential_benefit=f"Up to ₹1,50,000 ({subsidy_percent}% of equipment cost)",
-            eligibility_status="ELIGIBLE",
-            description="Subsidy on power tillers, sprayers, pump sets, and other farm machinery.",
-            how_to_apply="Apply at agrimachinery.nic.in or Krishi Bhavan",
-            documents=["Land documents", "Aadhaar", "Quotation", "Caste certificate if SC/ST"]
-        ))
-    
-    # Organic Farming
-    if organic_interest and land_size_acres >= 0.5:
-        benefit = int(50000 * land_size_ha)
-        recommendations.append(SubsidyRecommendation(
-            scheme_name="Organic Farming Subsidy (PKVY)",
-            potential_benefit=f"₹{benefit:,} over 3 years",
-            eligibility_status="ELIGIBLE (Need cluster of 20+ farmers)",
-            description="Support for organic inputs, certification, and marketing. Need to form a cluster with nearby farmers.",
-            how_to_apply="Form a farmer group and apply through Krishi Bhavan",
-            documents=["Cluster formation documents", "Land records", "Commitment letter"]
-        ))
-    
-    # Interest Subvention
-    recommendations.append(SubsidyRecommendation(
-        scheme_name="Interest Subvention on Crop Loans",
-        potential_benefit="Effective interest rate of just 4% on loans up to ₹3 lakh",
-        eligibility_status="ELIGIBLE",
-        description="3% interest subvention + additional 3% for prompt repayment on short-term crop loans.",
-        how_to_apply="Automatic benefit when taking KCC or crop loan from bank",
-        documents=["KCC application or crop loan documents"]
-    ))
-    
-    # PM-KUSUM Solar
-    if land_size_acres >= 0.5 and not has_irrigation:
-        recommendations.append(SubsidyRecommendation(
-            scheme_name="PM-KUSUM Solar Pump Subsidy",
-            potential_benefit="60% subsidy on solar pump (up to 7.5 HP)",
-            eligibility_status="ELIGIBLE",
-            description="Install solar-powered irrigation pump with 60% government subsidy. Save on electricity bills forever.",
-            how_to_apply="Apply through ANERT Kerala or Krishi Bhavan",
-            documents=["Land documents", "Water source proof", "Aadhaar", "Bank account"]
-        ))
-    
-    # Seed Subsidy
-    recommendations.append(SubsidyRecommendation(
-        scheme_name="Certified Seed Subsidy",
-        potential_benefit="50% subsidy on certified seeds",
-        eligibility_status="ELIGIBLE",
-        description="Get quality certified seeds at subsidized rates from Krishi Bhavans.",
-        how_to_apply="Visit Krishi Bhavan during sowing season",
-        documents=["Aadhaar / Ration card", "Land documents"]
-    ))
-    
-    return recommendations
+    matched = _matching_subsidy_rules(
+        land_size_acres, land_size_ha, crop, farmer_category, has_irrigation, organic_interest
+    )
+    return [
+        _subsidy_recommendation(KERALA_SUBSIDIES[pos], land_size_ha, farmer_category)
+        for pos in matched
+    ]
+
+
+def get_subsidy_recommendations_batch(farmers: List[dict]) -> List[List[SubsidyRecommendation]]:
+    """Evaluate many farmers in one call.
+
+    Each farmer is a dict of get_subsidy_recommendations() keyword arguments.
+    Farmers with the same profile share one rule evaluation.
+    """
+    seen: Dict[tuple, List[SubsidyRecommendation]] = {}
+    results = []
+    for farmer in farmers:
+        key = (
+            farmer["land_size_acres"], farmer["crop"], farmer.get("district", ""),
+            farmer.get("farmer_category", "general"),
+            bool(farmer.get("has_irrigation", True)), bool(farmer.get("organic_interest", False))
+        )
+        if key not in seen:
+            seen[key] = get_subsidy_recommendations(*key)
+        results.append(seen[key])
+    return results
+
+
+compile_subsidy_rules()
@@ -1,7 +1,9 @@
 from dataclasses import dataclass
 
+from services.memo import memoize, normalize_label
 
-@dataclass
+
+@dataclass(frozen=True)
 class PlantPrediction:
     crop: str
     land_size_acres: float
@@ -40,7 +42,16 @@ CROP_GROWTH_DB = {
     },
 }
 
+# Used for crops not in CROP_GROWTH_DB
+DEFAULT_GROWTH = {
+    "yield_t_per_acre": 2.0,
+    "days_to_harvest": 150,
+    "price_rs_per_ton": 25000,
+    "notes": "Generic estimate used (crop not in database)."
+}
+
 
+@memoize("predict_growth", {"crop": normalize_label})
 def predict_growth(crop: str, land_size_acres: float) -> PlantPrediction:
     """Return a rough plant growth and profit prediction for a crop.
 
@@ -52,10 +63,10 @@ def predict_growth(crop: str, land_size_acres: float) -> PlantPrediction:
     # If crop not in our table, fall back to a generic assumption.
     if not info:
         # Generic: moderate yield and price
-        yield_t_per_acre = 2.0
-        days_to_harvest = 150
-        price_rs_per_ton = 25000
-        notes = "Generic estimate used (crop not in database)."
+        yield_t_per_acre = DEFAULT_GROWTH["yield_t_per_acre"]
+        days_to_harvest = DEFAULT_GROWTH["days_to_harvest"]
+        price_rs_per_ton = DEFAULT_GROWTH["price_rs_per_ton"]
+        notes = DEFAULT_GROWTH["notes"]
     else:
         yield_t_per_acre = info["yield_t_per_acre"]
         days_to_harvest = info["days_to_harvest"]
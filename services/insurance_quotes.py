@@ -0,0 +1,95 @@
+"""
+Bulk Crop Insurance Quoting for Kerala Co-operatives
+Prices PMFBY, Kerala State and Coconut Palm cover for a whole member list.
+
+Risk and premium terms come from the precomputed INSURANCE_RISK_MATRIX;
+amounts are computed with NumPy and match ``analyze_crop_insurance_risk``.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from services.fintech import KERALA_CROP_INSURANCE, lookup_insurance_risk
+
+
+@dataclass
+class InsuranceQuoteTable:
+    """One entry per member in every column."""
+    risk_score: List[str]
+    pmfby_sum_insured: np.ndarray
+    pmfby_premium: np.ndarray
+    state_sum_insured: np.ndarray
+    state_premium: np.ndarray
+    coconut_palms: np.ndarray
+    coconut_sum_insured: np.ndarray
+    coconut_premium: np.ndarray
+
+    @property
+    def total_premium(self) -> np.ndarray:
+        return self.pmfby_premium + self.state_premium + self.coconut_premium
+
+    def to_columns(self) -> Dict[str, list]:
+        """Plain lists, ready for JSON."""
+        return {
+            "risk_score": self.risk_score,
+            "pmfby_sum_insured": self.pmfby_sum_insured.tolist(),
+            "pmfby_premium": self.pmfby_premium.tolist(),
+            "state_sum_insured": self.state_sum_insured.tolist(),
+            "state_premium": self.state_premium.tolist(),
+            "coconut_palms": self.coconut_palms.tolist(),
+            "coconut_sum_insured": self.coconut_sum_insured.tolist(),
+            "coconut_premium": self.coconut_premium.tolist(),
+            "total_premium": self.total_premium.tolist(),
+        }
+
+
+def quote_insurance_bulk(
+    district: Sequence[str],
+    crop: Sequence[str],
+    land_size_acres: Sequence[float],
+    season: Sequence[str]
+) -> InsuranceQuoteTable:
+    """Quote all three insurance schemes for every member (equal-length columns)."""
+    n = len(land_size_acres)
+    if not (len(district) == len(crop) == len(season) == n):
+        raise ValueError("All member columns must have the same length.")
+
+    # A co-operative has few distinct district/crop/season combinations,
+    # so look each one up once and gather by index.
+    cell_index: Dict[tuple, int] = {}
+    cells = []
+    member_cell = np.empty(n, dtype=np.int64)
+    for i, key in enumerate(zip(district, crop, season)):
+        idx = cell_index.get(key)
+        if idx is None:
+            idx = cell_index[key] = len(cells)
+            cells.append(lookup_insurance_risk(*key))
+        member_cell[i] = idx
+
+    sum_per_ha = np.array([c.pmfby_sum_insured_per_ha for c in cells], dtype=np.int64)[member_cell]
+    premium_rate = np.array([c.pmfby_premium_rate for c in cells], dtype=np.float64)[member_cell]
+    state_max = np.array([c.state_max_compensation for c in cells], dtype=np.int64)[member_cell]
+    state_premium = np.array([c.state_premium for c in cells], dtype=np.int64)[member_cell]
+
+    land = np.asarray(land_size_acres, dtype=np.float64)
+    land_ha = land * 0.4047
+    pmfby_sum = np.trunc(sum_per_ha * land_ha).astype(np.int64)
+    pmfby_premium = np.trunc(pmfby_sum * premium_rate / 100).astype(np.int64)
+
+    coconut = KERALA_CROP_INSURANCE["coconut_insurance"]
+    is_coconut = np.array([str(c).lower() == "coconut" for c in crop], dtype=bool)
+    palms = np.minimum(np.trunc(land * 70).astype(np.int64), coconut["max_palms"])
+    palms = np.where(is_coconut, palms, 0)
+
+    return InsuranceQuoteTable(
+        risk_score=[cells[i].risk_score for i in member_cell],
+        pmfby_sum_insured=pmfby_sum,
+        pmfby_premium=pmfby_premium,
+        state_sum_insured=state_max,
+        state_premium=state_premium,
+        coconut_palms=palms,
+        coconut_sum_insured=palms * coconut["sum_insured_per_palm"],
+        coconut_premium=np.trunc(palms * coconut["premium_per_palm"]).astype(np.int64)
+    )
@@ -1,44 +1,96 @@
 from dataclasses import dataclass
+from typing import Optional
 
-@dataclass
+import numpy as np
+
+from services.evapotranspiration import (
+    application_efficiency,
+    crop_id,
+    district_weather,
+    effective_rainfall,
+    stage_day,
+    water_requirement,
+)
+from services.memo import memoize, normalize_district, normalize_label, normalize_option
+from services.soil_water import total_available_water
+
+# Days of forecast the daily plan averages over
+PLAN_HORIZON_DAYS = 7
+
+# Share of the crop's water need the rain is expected to meet, when no forecast is used
+RAIN_CHANCE_COVER = {"low": 0.0, "medium": 0.25, "high": 0.5}
+
+# Largest plot the scheduler form accepts (100 ha)
+MAX_PLOT_AREA_M2 = 1_000_000
+
+@dataclass(frozen=True)
 class IrrigationPlan:
     crop: str
     water_liters_per_day: int
     frequency: str
     notes: str
+    area_m2: float = 100.0
+    et0_mm_per_day: Optional[float] = None
+    kc: Optional[float] = None
+    liters_per_irrigation: Optional[int] = None
 
 
-def plan_irrigation(crop: str, stage: str, soil_type: str, weather_rain_chance: str) -> IrrigationPlan:
-    base_need = {
-        "paddy": 50,
-        "banana": 40,
-        "coconut": 30,
-        "pepper": 20
-    }
-    per_sq_m = base_need.get(crop.lower(), 30)
-
-    if stage == "seedling":
-        per_sq_m *= 0.7
-    elif stage == "flowering":
-        per_sq_m *= 1.2
-
-    if soil_type == "sandy":
-        per_sq_m *= 1.2
-    elif soil_type == "clay":
-        per_sq_m *= 0.8
+@memoize("plan_irrigation", {"crop": normalize_label, "stage": normalize_option,
+                              "soil_type": normalize_option, "weather_rain_chance": normalize_option,
+                              "district": lambda d: normalize_district(d) if d else None}, ttl=900)
+def plan_irrigation(
+    crop: str,
+    stage: str,
+    soil_type: str,
+    weather_rain_chance: str,
+    area_m2: float = 100.0,
+    district: Optional[str] = None
+) -> IrrigationPlan:
+    """Single-plot plan from the FAO-56 engine (services/evapotranspiration.py).
 
-    if weather_rain_chance == "high":
-        per_sq_m *= 0.5
+    With a district, its weather forecast (including rain) drives the plan;
+    otherwise Kerala climatology reduced by the farmer's rain chance estimate.
+    """
+    weather = district_weather(district, PLAN_HORIZON_DAYS)
+    crop_ids = np.array([crop_id(crop)])
+    need = water_requirement(
+        crop_ids=crop_ids,
+        days_after_planting=np.array([stage_day(crop, stage)]),
+        area_m2=np.array([area_m2]),
+        soil=[soil_type],
+        tmax=weather["tmax_c"],
+        tmin=weather["tmin_c"],
+        rh_mean=weather["rh_pct"],
+        # Without a forecast, the farmer's rain chance stands in for rain.
+        effective_rain_mm=effective_rainfall(weather["rain_mm"]) if weather["forecast_days"] else None,
+        start_doy=weather["start_doy"]
+    )
+    cover = 1.0 if weather["forecast_days"] else 1 - RAIN_CHANCE_COVER.get(weather_rain_chance, 0.0)
+    liters = float(need.gross_liters.mean()) * cover
 
-    total_liters = int(per_sq_m * 100)
-
-    frequency = "Daily" if weather_rain_chance == "low" else "On non-rainy days"
+    # Irrigate each time the root zone has used its readily available water
+    _, raw = total_available_water(crop_ids, [soil_type])
+    daily_mm = float(need.net_mm.mean()) * cover
+    per_irrigation = None
+    if daily_mm <= 0:
+        frequency = "Not needed while the forecast rain lasts"
+    elif raw[0] < 2 * daily_mm:
+        frequency = "Daily" if weather_rain_chance == "low" else "On non-rainy days"
+    else:
+        frequency = f"Every {int(raw[0] // daily_mm)} days"
+        per_irrigation = int(raw[0] / application_efficiency([soil_type])[0] * area_m2)
+        if weather_rain_chance != "low":
+            frequency += ", skipping rainy days"
 
     notes = "Use mulching to reduce evaporation and schedule irrigation early morning or late evening."
 
     return IrrigationPlan(
         crop=crop,
-        water_liters_per_day=total_liters,
+        water_liters_per_day=int(liters),
         frequency=frequency,
-        notes=notes
-)
+        notes=notes,
+        area_m2=area_m2,
+        et0_mm_per_day=round(float(need.et0_mm.mean()), 2),
+        kc=round(float(need.kc.mean()), 2),
+        liters_per_irrigation=per_irrigation
+    )
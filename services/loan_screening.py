@@ -0,0 +1,168 @@
+"""
+Bulk Loan Pre-Screening for Kerala Co-operative Banks
+Evaluates the KERALA_AGRI_LOANS rules for many applicants at once with NumPy.
+
+Results match ``check_loan_eligibility`` exactly; they are laid out as
+columns (applicants x loan products) instead of one dataclass per loan.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from services.amortization import emi_vector
+from services.fintech import KERALA_AGRI_LOANS, LoanEligibility
+
+# Reason flags, one bit per rule outcome. The "not eligible" flags follow the
+# rule order of check_loan_eligibility: when several fail, the last one names
+# the reason.
+REASON_LAND = 1
+REASON_CROP = 2
+REASON_COLLATERAL = 4
+REASON_INCOME_LIMITED = 8
+REASON_DEBT_REDUCED = 16
+
+_UNIVERSAL_CROPS = ("All crops", "All agricultural purposes")
+
+
+@dataclass
+class LoanScreeningTable:
+    """Eligibility and EMI for every applicant x loan product.
+
+    All 2-D arrays have shape ``(n_applicants, n_loans)``; column ``j``
+    refers to ``loan_ids[j]`` (the order of KERALA_AGRI_LOANS).
+    """
+    loan_ids: List[str]
+    crops: np.ndarray
+    eligible: np.ndarray
+    max_eligible_amount: np.ndarray
+    monthly_emi: np.ndarray
+    total_repayment: np.ndarray
+    reason_flags: np.ndarray
+
+    def reason(self, applicant: int, loan: int) -> str:
+        """The same explanation text ``check_loan_eligibility`` would give."""
+        spec = KERALA_AGRI_LOANS[loan]
+        flags = int(self.reason_flags[applicant, loan])
+        if flags & REASON_COLLATERAL:
+            text = "Collateral required for this loan amount."
+        elif flags & REASON_CROP:
+            text = f"This loan is not available for {self.crops[applicant]} cultivation."
+        elif flags & REASON_LAND:
+            text = f"Minimum {spec['min_land_acres']} acres of land required."
+        else:
+            text = "You are eligible for this loan."
+        if flags & REASON_INCOME_LIMITED:
+            text += " Amount limited based on income."
+        if flags & REASON_DEBT_REDUCED:
+            text += " Reduced due to existing debt."
+        return text
+
+    def for_applicant(self, applicant: int) -> List[LoanEligibility]:
+        """One applicant's row as ``LoanEligibility`` objects, sorted like the single-farmer API."""
+        results = []
+        for j, spec in enumerate(KERALA_AGRI_LOANS):
+            results.append(LoanEligibility(
+                loan_name=spec["name"],
+                provider=spec["provider"],
+                eligible=bool(self.eligible[applicant, j]),
+                max_eligible_amount=int(self.max_eligible_amount[applicant, j]),
+                interest_rate=spec["interest_rate"],
+                tenure_months=spec["tenure_months"],
+                monthly_emi=int(self.monthly_emi[applicant, j]),
+                total_repayment=int(self.total_repayment[applicant, j]),
+                documents_required=spec["documents"],
+                apply_at=spec["apply_at"],
+                reason=self.reason(applicant, j)
+            ))
+        results.sort(key=lambda x: (not x.eligible, x.interest_rate))
+        return results
+
+    def to_columns(self) -> Dict[str, list]:
+        """Plain lists, ready for JSON."""
+        return {
+            "loan_ids": self.loan_ids,
+            "eligible": self.eligible.tolist(),
+            "max_eligible_amount": self.max_eligible_amount.tolist(),
+            "monthly_emi": self.monthly_emi.tolist(),
+            "total_repayment": self.total_repayment.tolist(),
+            "reason_flags": self.reason_flags.tolist(),
+        }
+
+
+def screen_loans_bulk(
+    land_size_acres: Sequence[float],
+    annual_income: Sequence[int],
+    existing_loans: Sequence[int],
+    has_collateral: Sequence[bool],
+    loan_amount_needed: Sequence[int],
+    crop: Sequence[str]
+) -> LoanScreeningTable:
+    """Pre-screen many applicants against every Kerala agri loan product.
+
+    Inputs are equal-length columns, one entry per applicant.
+    """
+    land = np.asarray(land_size_acres, dtype=np.float64)
+    income = np.asarray(annual_income, dtype=np.int64)
+    existing = np.asarray(existing_loans, dtype=np.int64)
+    collateral = np.asarray(has_collateral, dtype=bool)
+    needed = np.asarray(loan_amount_needed, dtype=np.int64)
+    crops = np.asarray(crop, dtype=str)
+
+    n = len(land)
+    if not all(len(col) == n for col in (income, existing, collateral, needed, crops)):
+        raise ValueError("All applicant columns must have the same length.")
+
+    n_loans = len(KERALA_AGRI_LOANS)
+    eligible = np.ones((n, n_loans), dtype=bool)
+    max_amount = np.zeros((n, n_loans), dtype=np.int64)
+    emi = np.zeros((n, n_loans), dtype=np.int64)
+    flags = np.zeros((n, n_loans), dtype=np.uint8)
+
+    # Loan-independent terms
+    income_limit = income * 4
+    heavy_debt = (existing > 0) & (existing / np.maximum(income, 1) > 0.5)
+
+    for j, spec in enumerate(KERALA_AGRI_LOANS):
+        amount = np.minimum(spec["max_amount"], needed)
+
+        land_fail = land < spec["min_land_acres"]
+        if any(c in spec["eligible_crops"] for c in _UNIVERSAL_CROPS):
+            crop_fail = np.zeros(n, dtype=bool)
+        else:
+            crop_fail = ~np.isin(crops, spec["eligible_crops"])
+        if spec["collateral_required"]:
+            collateral_fail = ~collateral & (needed > spec["collateral_limit"])
+        else:
+            collateral_fail = np.zeros(n, dtype=bool)
+
+        income_limited = income_limit < amount
+        amount = np.where(income_limited, income_limit, amount)
+        amount = np.where(heavy_debt, np.trunc(amount * 0.5).astype(np.int64), amount)
+
+        ok = ~(land_fail | crop_fail | collateral_fail)
+        col_emi = emi_vector(amount, spec["interest_rate"], spec["tenure_months"])
+
+        eligible[:, j] = ok
+        max_amount[:, j] = np.where(ok, amount, 0)
+        emi[:, j] = np.where(ok, col_emi, 0)
+        flags[:, j] = (
+            land_fail * REASON_LAND
+            | crop_fail * REASON_CROP
+            | collateral_fail * REASON_COLLATERAL
+            | income_limited * REASON_INCOME_LIMITED
+            | heavy_debt * REASON_DEBT_REDUCED
+        )
+
+    tenures = np.array([spec["tenure_months"] for spec in KERALA_AGRI_LOANS], dtype=np.int64)
+
+    return LoanScreeningTable(
+        loan_ids=[spec["id"] for spec in KERALA_AGRI_LOANS],
+        crops=crops,
+        eligible=eligible,
+        max_eligible_amount=max_amount,
+        monthly_emi=emi,
+        total_repayment=emi * tenures,
+        reason_flags=flags
+    )
@@ -0,0 +1,205 @@
+"""
+Market Locations and Nearest-Market Search for Kerala
+Coordinates for markets and for district / village centroids, a uniform
+grid index over the markets for nearest-N queries, and a simple transport
+cost model used to rank markets by net realisation (price minus the cost
+of getting a kilogram of produce there).
+
+The grid has cells of GRID_CELL_DEG degrees. A query scans cells in
+growing rings around the farmer and stops as soon as no unvisited cell can
+hold a closer market, so it only touches the markets nearby.
+"""
+
+import csv
+import math
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Collection, Dict, Iterable, List, Optional, Tuple
+
+from services.memo import normalize_district, normalize_label
+
+# District headquarters (lat, lon)
+DISTRICT_CENTROIDS = {
+    "Thiruvananthapuram": (8.5241, 76.9366),
+    "Kollam": (8.8932, 76.6141),
+    "Pathanamthitta": (9.2648, 76.7870),
+    "Alappuzha": (9.4981, 76.3388),
+    "Kottayam": (9.5916, 76.5222),
+    "Idukki": (9.8500, 76.9400),
+    "Ernakulam": (9.9816, 76.2999),
+    "Thrissur": (10.5276, 76.2144),
+    "Palakkad": (10.7867, 76.6548),
+    "Malappuram": (11.0510, 76.0711),
+    "Kozhikode": (11.2588, 75.7804),
+    "Wayanad": (11.6085, 76.0830),
+    "Kannur": (11.8745, 75.3704),
+    "Kasaragod": (12.4996, 74.9869),
+}
+
+# Market yards (lat, lon); extend with load_locations() for a full mandi list
+MARKET_LOCATIONS = {
+    "Alappuzha Mandi": (9.4950, 76.3290),
+    "Kottayam Market": (9.5880, 76.5210),
+    "Trivandrum Market": (8.4830, 76.9470),
+    "Kollam Market": (8.8880, 76.5950),
+    "Ernakulam Market": (9.9700, 76.2860),
+    "Thrissur Market": (10.5160, 76.2170),
+    "Palakkad Market": (10.7750, 76.6510),
+    "Kozhikode Market": (11.2500, 75.7800),
+    "Kannur Market": (11.8700, 75.3600),
+}
+
+# Village / town centroids, keyed by normalize_label(name); filled by load_locations()
+PLACE_CENTROIDS: Dict[str, Tuple[float, float]] = {}
+
+GRID_CELL_DEG = 0.25
+EARTH_RADIUS_KM = 6371.0
+
+# Roads in Kerala are roughly a third longer than the straight line.
+ROAD_DISTANCE_FACTOR = 1.3
+
+# Transport cost per kg: loading / unloading plus a per-km freight rate
+# (small-lot pickup or tempo hire).
+TRANSPORT_FIXED_RS_PER_KG = 0.5
+TRANSPORT_RS_PER_KG_KM = 0.015
+
+NEARBY_MARKET_COUNT = 10
+NEARBY_MARKET_RADIUS_KM = 150.0
+
+
+def haversine_km(a: Tuple[float, float], b: Tuple[float, float]) -> float:
+    lat1, lon1 = map(math.radians, a)
+    lat2, lon2 = map(math.radians, b)
+    h = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(h))
+
+
+def road_distance_km(a: Tuple[float, float], b: Tuple[float, float]) -> float:
+    return haversine_km(a, b) * ROAD_DISTANCE_FACTOR
+
+
+def transport_cost_rs_per_kg(distance_km: float) -> float:
+    return round(TRANSPORT_FIXED_RS_PER_KG + TRANSPORT_RS_PER_KG_KM * distance_km, 2)
+
+
+@dataclass(frozen=True)
+class NearbyMarket:
+    market: str
+    distance_km: float
+
+
+class GridIndex:
+    """Points bucketed into GRID_CELL_DEG x GRID_CELL_DEG cells for nearest-N search."""
+
+    def __init__(self, points: Dict[str, Tuple[float, float]], cell_deg: float = GRID_CELL_DEG):
+        self.cell_deg = cell_deg
+        self.points = dict(points)
+        self._cells: Dict[Tuple[int, int], List[str]] = defaultdict(list)
+        for name, (lat, lon) in self.points.items():
+            self._cells[self._cell(lat, lon)].append(name)
+        self._bounds = None
+        if self._cells:
+            rows = [c[0] for c in self._cells]
+            cols = [c[1] for c in self._cells]
+            self._bounds = (min(rows), max(rows), min(cols), max(cols))
+
+    def _cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        return math.floor(lat / self.cell_deg), math.floor(lon / self.cell_deg)
+
+    def _ring(self, center: Tuple[int, int], r: int) -> Iterable[Tuple[int, int]]:
+        ci, cj = center
+        if r == 0:
+            yield center
+            return
+        for j in range(cj - r, cj + r + 1):
+            yield ci - r, j
+            yield ci + r, j
+        for i in range(ci - r + 1, ci + r):
+            yield i, cj - r
+            yield i, cj + r
+
+    def nearest(
+        self,
+        origin: Tuple[float, float],
+        n: int,
+        max_km: float,
+        include: Optional[Collection[str]] = None
+    ) -> List[NearbyMarket]:
+        """Up to ``n`` points within ``max_km`` (straight line) of ``origin``, closest first.
+
+        ``include`` restricts the search to the named points.
+        """
+        if self._bounds is None:
+            return []
+        center = self._cell(*origin)
+        # Smallest width of a cell in km near the origin (longitude degrees shrink with latitude)
+        cell_km = self.cell_deg * 111.0 * math.cos(math.radians(abs(origin[0]) + self.cell_deg))
+        found: List[Tuple[float, str]] = []
+        lo_i, hi_i, lo_j, hi_j = self._bounds
+        last_ring = max(abs(center[0] - lo_i), abs(center[0] - hi_i), abs(center[1] - lo_j), abs(center[1] - hi_j))
+        ring = 0
+        while ring <= last_ring:
+            for cell in self._ring(center, ring):
+                for name in self._cells.get(cell, ()):
+                    if include is not None and name not in include:
+                        continue
+                    found.append((haversine_km(origin, self.points[name]), name))
+            # Every cell outside this ring is at least ``ring * cell_km`` away.
+            bound = ring * cell_km
+            found.sort()
+            if bound > max_km or (len(found) >= n and found[n - 1][0] <= bound):
+                break
+            ring += 1
+        return [NearbyMarket(name, km) for km, name in found[:n] if km <= max_km]
+
+
+_market_index: Optional[GridIndex] = None
+
+
+def market_index() -> GridIndex:
+    global _market_index
+    if _market_index is None:
+        _market_index = GridIndex(MARKET_LOCATIONS)
+    return _market_index
+
+
+def locate(place: str) -> Optional[Tuple[float, float]]:
+    """Centroid of a district (aliases allowed) or of a loaded village / town."""
+    district = normalize_district(place)
+    if district in DISTRICT_CENTROIDS:
+        return DISTRICT_CENTROIDS[district]
+    return PLACE_CENTROIDS.get(normalize_label(place))
+
+
+def nearby_markets(place: str, n: int = NEARBY_MARKET_COUNT, max_km: float = NEARBY_MARKET_RADIUS_KM,
+                   markets: Optional[Iterable[str]] = None) -> Optional[List[NearbyMarket]]:
+    """The ``n`` markets closest to ``place`` by road, or None if the place is unknown.
+
+    ``markets`` (names, any case) limits the search to those markets, e.g. the
+    ones that have a price for the crop.
+    """
+    origin = locate(place)
+    if origin is None:
+        return None
+    include = None
+    if markets is not None:
+        wanted = {m.strip().lower() for m in markets}
+        include = {name for name in MARKET_LOCATIONS if name.lower() in wanted}
+    return [
+        NearbyMarket(m.market, round(m.distance_km * ROAD_DISTANCE_FACTOR, 1))
+        for m in market_index().nearest(origin, n, max_km / ROAD_DISTANCE_FACTOR, include)
+    ]
+
+
+def load_locations(path: str, kind: str = "market") -> int:
+    """Add ``name,lat,lon`` rows from a CSV as markets (``kind="market"``) or village / town centroids."""
+    global _market_index
+    target = MARKET_LOCATIONS if kind == "market" else PLACE_CENTROIDS
+    count = 0
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            name = row["name"].strip()
+            target[name if kind == "market" else normalize_label(name)] = (float(row["lat"]), float(row["lon"]))
+            count += 1
+    _market_index = None
+    return count
@@ -1,33 +1,151 @@
+import math
+import os
 from dataclasses import dataclass
-from typing import List
+from datetime import date
+from typing import Callable, List, Optional
 
-@dataclass
+from services.market_geo import MARKET_LOCATIONS, nearby_markets, transport_cost_rs_per_kg
+from services.market_store import MarketPriceStore, load_csv
+from services.price_analytics import PriceAnalytics, PriceTrend
+from services.memo import invalidate, memoize, normalize_district, normalize_label
+
+@dataclass(frozen=True)
 class MarketPrice:
     market: str
     crop: str
     price_rs_per_kg: float
-    distance_km: int
+    distance_km: Optional[float]
+    price_date: Optional[date] = None
+    # Price minus transport cost to the market; None when the farmer's location is unknown
+    transport_cost_rs_per_kg: Optional[float] = None
+    net_price_rs_per_kg: Optional[float] = None
 
 
 MOCK_PRICES = [
-    {"market": "Alappuzha Mandi", "crop": "Paddy", "price": 25, "distance": 10},
-    {"market": "Kottayam Market", "crop": "Paddy", "price": 24, "distance": 30},
-    {"market": "Trivandrum Market", "crop": "Banana", "price": 40, "distance": 15},
-    {"market": "Kollam Market", "crop": "Banana", "price": 38, "distance": 25},
+    {"market": "Alappuzha Mandi", "crop": "Paddy", "price": 25},
+    {"market": "Kottayam Market", "crop": "Paddy", "price": 24},
+    {"market": "Trivandrum Market", "crop": "Banana", "price": 40},
+    {"market": "Kollam Market", "crop": "Banana", "price": 38},
 ]
 
+# A CSV price dump, or a directory written by MarketPriceStore.save (memory-mapped)
+MARKET_DATA_PATH = os.environ.get("AGRIVISION_MARKET_DATA", "")
+
+_store: Optional[MarketPriceStore] = None
+_analytics: Optional[PriceAnalytics] = None
+
+# Called with no arguments whenever prices change (e.g. to rebuild tables derived from volatility)
+_price_listeners: List[Callable[[], None]] = []
+
+
+def _load_default_store() -> MarketPriceStore:
+    if MARKET_DATA_PATH and os.path.isdir(MARKET_DATA_PATH):
+        return MarketPriceStore.load(MARKET_DATA_PATH)
+    if MARKET_DATA_PATH:
+        return load_csv(MARKET_DATA_PATH)
+    return MarketPriceStore.from_records(MOCK_PRICES, date.today())
+
+
+def get_price_store() -> MarketPriceStore:
+    global _store
+    if _store is None:
+        _store = _load_default_store()
+    return _store
+
+
+def get_price_analytics() -> PriceAnalytics:
+    global _analytics
+    if _analytics is None:
+        _analytics = PriceAnalytics.from_store(get_price_store())
+    return _analytics
+
+
+def on_prices_updated(callback: Callable[[], None]) -> None:
+    _price_listeners.append(callback)
 
+
+def _prices_updated() -> None:
+    invalidate("get_best_market")
+    for callback in _price_listeners:
+        callback()
+
+
+def set_price_store(store: MarketPriceStore) -> None:
+    """Swap in a new price store (e.g. one reloaded from disk); analytics are rebuilt from it."""
+    global _store, _analytics
+    _store = store
+    _analytics = PriceAnalytics.from_store(store)
+    _prices_updated()
+
+
+def add_prices(new_prices: MarketPriceStore) -> None:
+    """Merge a new price dump into the store and refresh analytics for just the crops and dates it covers."""
+    global _store
+    analytics = get_price_analytics()
+    merged = get_price_store().merged_with(new_prices)
+    analytics.refresh(merged, new_prices)
+    _store = merged
+    _prices_updated()
+
+
+def get_price_trend(crop: str) -> Optional[PriceTrend]:
+    return get_price_analytics().trend(crop)
+
+
+@memoize("get_best_market", {"crop": normalize_label, "district": normalize_district}, ttl=900)
 def get_best_market(crop: str, district: str) -> List[MarketPrice]:
-    results: List[MarketPrice] = []
-    for row in MOCK_PRICES:
-        if row["crop"].lower() == crop.lower():
-            results.append(
-                MarketPrice(
-                    market=row["market"],
-                    crop=row["crop"],
-                    price_rs_per_kg=row["price"],
-                    distance_km=row["distance"]
-                )
+    """Markets near ``district`` that price ``crop``, ranked by net realisation per kg.
+
+    When none of them is within reach, every priced market with known
+    coordinates is ranked instead. Priced markets without coordinates follow,
+    by raw price and without distance. For an unknown place every market
+    with a price is listed, by raw price.
+    """
+    quotes = get_price_store().latest_prices(crop)
+    priced = [quote.market for quote in quotes]
+    nearby = nearby_markets(district, markets=priced)
+    if nearby is None:
+        results: List[MarketPrice] = [
+            MarketPrice(
+                market=quote.market,
+                crop=quote.crop,
+                price_rs_per_kg=quote.price_rs_per_kg,
+                distance_km=None,
+                price_date=quote.price_date
             )
-    results.sort(key=lambda x: x.price_rs_per_kg, reverse=True)
-    return results
+            for quote in quotes
+        ]
+        results.sort(key=lambda x: x.price_rs_per_kg, reverse=True)
+        return results
+    if not nearby:
+        nearby = nearby_markets(district, n=len(priced), max_km=math.inf, markets=priced)
+
+    located = {name.lower() for name in MARKET_LOCATIONS}
+    distances = {m.market.lower(): m.distance_km for m in nearby}
+    results = []
+    unlocated: List[MarketPrice] = []
+    for quote in quotes:
+        distance = distances.get(quote.market.lower())
+        if distance is None:
+            if quote.market.lower() not in located:
+                unlocated.append(MarketPrice(
+                    market=quote.market,
+                    crop=quote.crop,
+                    price_rs_per_kg=quote.price_rs_per_kg,
+                    distance_km=None,
+                    price_date=quote.price_date
+                ))
+            continue
+        cost = transport_cost_rs_per_kg(distance)
+        results.append(MarketPrice(
+            market=quote.market,
+            crop=quote.crop,
+            price_rs_per_kg=quote.price_rs_per_kg,
+            distance_km=distance,
+            price_date=quote.price_date,
+            transport_cost_rs_per_kg=cost,
+            net_price_rs_per_kg=round(quote.price_rs_per_kg - cost, 2)
+        ))
+    results.sort(key=lambda x: x.net_price_rs_per_kg, reverse=True)
+    unlocated.sort(key=lambda x: x.price_rs_per_kg, reverse=True)
+    return results + unlocated
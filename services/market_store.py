@@ -0,0 +1,359 @@
+"""
+Columnar Market Price Store for Kerala Mandis
+Daily market x commodity x date prices held in NumPy columns.
+
+Rows are kept sorted by (crop, date, market), with a per-crop offset index
+over them, so a crop's prices for a date range are found with two binary
+searches. Markets and crops are stored as small integer ids. Prices are
+stored as integer paise, so they round-trip exactly.
+
+Large price dumps are streamed in from CSV in chunks (``load_csv``).
+``save`` writes one .npy file per column, and ``MarketPriceStore.load``
+memory-maps them again without parsing anything.
+"""
+
+import csv
+import io
+import json
+import os
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Union
+
+import numpy as np
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+_DATE_FORMATS = ("%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y", "%d-%b-%Y")
+
+# Accepted CSV header names (case-insensitive, spaces treated as "_") per column
+CSV_COLUMNS = {
+    "market": ("market", "market_name", "mandi"),
+    "crop": ("crop", "commodity"),
+    "date": ("date", "arrival_date", "price_date"),
+    "price_rs_per_kg": ("price_rs_per_kg", "price"),
+    # Agmarknet-style dumps quote the modal price per quintal (100 kg)
+    "price_rs_per_quintal": ("modal_price", "modal_price_rs_per_quintal", "price_rs_per_quintal"),
+}
+
+CSV_CHUNK_ROWS = 200_000
+
+# Largest price the int32 paise column can hold
+MAX_PRICE_RS_PER_KG = np.iinfo(np.int32).max / 100
+
+# A market's "latest" price must be at most this many days older than the
+# newest price for the crop.
+LATEST_LOOKBACK_DAYS = 14
+
+_COLUMNS = ("crop_id", "day", "market_id", "price_paise")
+
+
+def to_day(value: Union[str, date]) -> int:
+    """Days since 1970-01-01 for a date or a date string in any of _DATE_FORMATS."""
+    if isinstance(value, date):
+        return value.toordinal() - _EPOCH_ORDINAL
+    text = value.strip()
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).toordinal() - _EPOCH_ORDINAL
+        except ValueError:
+            continue
+    raise ValueError(f"Unrecognised date: {value!r}")
+
+
+def from_day(day: int) -> date:
+    return date.fromordinal(int(day) + _EPOCH_ORDINAL)
+
+
+def _rupees(paise: int) -> float:
+    # Whole-rupee prices come back as ints so they display as "25", not "25.0".
+    return paise // 100 if paise % 100 == 0 else paise / 100
+
+
+@dataclass(frozen=True)
+class PriceQuote:
+    market: str
+    crop: str
+    price_rs_per_kg: float
+    price_date: date
+
+
+class MarketPriceStore:
+    """Market x crop x date prices, sorted by (crop, date, market)."""
+
+    def __init__(self, crops: List[str], markets: List[str], columns: Dict[str, np.ndarray]):
+        self.crops = list(crops)
+        self.markets = list(markets)
+        self.crop_id = columns["crop_id"]
+        self.day = columns["day"]
+        self.market_id = columns["market_id"]
+        self.price_paise = columns["price_paise"]
+        # Malformed rows load_csv skipped while building this store
+        self.skipped_rows = 0
+        self._crop_lookup = {name.strip().lower(): i for i, name in enumerate(self.crops)}
+        self._market_lookup = {name.strip().lower(): i for i, name in enumerate(self.markets)}
+        # crop_offsets[c]:crop_offsets[c + 1] is crop c's slice of every column
+        self.crop_offsets = np.searchsorted(self.crop_id, np.arange(len(self.crops) + 1)).astype(np.int64)
+
+    def __len__(self) -> int:
+        return len(self.day)
+
+    # ------------------------------------------------------------------
+    # Building
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_columns(cls, crops: List[str], markets: List[str], crop_id, day, market_id, price_paise) -> "MarketPriceStore":
+        """Sort raw id columns into store order; for duplicate (crop, date, market) rows the last one wins."""
+        crop_id = np.asarray(crop_id, dtype=np.int32)
+        day = np.asarray(day, dtype=np.int32)
+        market_id = np.asarray(market_id, dtype=np.int32)
+        price_paise = np.asarray(price_paise, dtype=np.int32)
+
+        order = np.lexsort((np.arange(len(day)), market_id, day, crop_id))
+        crop_id, day, market_id, price_paise = crop_id[order], day[order], market_id[order], price_paise[order]
+        if len(day):
+            last = np.ones(len(day), dtype=bool)
+            last[:-1] = (crop_id[1:] != crop_id[:-1]) | (day[1:] != day[:-1]) | (market_id[1:] != market_id[:-1])
+            crop_id, day, market_id, price_paise = crop_id[last], day[last], market_id[last], price_paise[last]
+
+        return cls(crops, markets, {
+            "crop_id": crop_id, "day": day, "market_id": market_id, "price_paise": price_paise,
+        })
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict], price_date: Union[str, date]) -> "MarketPriceStore":
+        """Build from MOCK_PRICES-style dicts (market, crop, price) all quoted on ``price_date``."""
+        loader = _ColumnBuilder()
+        day = to_day(price_date)
+        for row in records:
+            loader.add(row["market"], row["crop"], day, row["price"])
+        return loader.build()
+
+    def merged_with(self, other: "MarketPriceStore") -> "MarketPriceStore":
+        """A new store holding both stores' rows; ``other`` wins on duplicates (e.g. a newer daily dump)."""
+        builder = _ColumnBuilder(self.crops, self.markets)
+        crop_map = np.array([builder.crop_index(name) for name in other.crops], dtype=np.int32)
+        market_map = np.array([builder.market_index(name) for name in other.markets], dtype=np.int32)
+        return MarketPriceStore.from_columns(
+            builder.crops, builder.markets,
+            np.concatenate([self.crop_id, crop_map[other.crop_id]]) if len(other) else self.crop_id,
+            np.concatenate([self.day, other.day]),
+            np.concatenate([self.market_id, market_map[other.market_id]]) if len(other) else self.market_id,
+            np.concatenate([self.price_paise, other.price_paise]),
+        )
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def _crop_slice(self, crop: str):
+        cid = self._crop_lookup.get(crop.strip().lower())
+        if cid is None:
+            return None, 0, 0
+        return cid, int(self.crop_offsets[cid]), int(self.crop_offsets[cid + 1])
+
+    def _quotes(self, cid: int, rows: np.ndarray) -> List[PriceQuote]:
+        return [
+            PriceQuote(
+                market=self.markets[self.market_id[r]],
+                crop=self.crops[cid],
+                price_rs_per_kg=_rupees(int(self.price_paise[r])),
+                price_date=from_day(self.day[r])
+            )
+            for r in rows
+        ]
+
+    def latest_prices(
+        self,
+        crop: str,
+        as_of: Optional[Union[str, date]] = None,
+        lookback_days: int = LATEST_LOOKBACK_DAYS,
+        markets: Optional[Iterable[str]] = None
+    ) -> List[PriceQuote]:
+        """Each market's most recent price for ``crop`` (on or before ``as_of``).
+
+        Two binary searches find the window of the last ``lookback_days``
+        before the crop's newest price; only that window is scanned.
+        ``markets`` restricts the result to the named markets.
+        """
+        cid, lo, hi = self._crop_slice(crop)
+        if cid is None or lo == hi:
+            return []
+        days = self.day[lo:hi]
+        end = hi if as_of is None else lo + int(np.searchsorted(days, to_day(as_of), side="right"))
+        if end == lo:
+            return []
+        start = lo + int(np.searchsorted(days, int(self.day[end - 1]) - lookback_days, side="left"))
+
+        # Rows are date-ordered, so each market's last row in the window is its latest.
+        window = self.market_id[start:end][::-1]
+        _, first_from_end = np.unique(window, return_index=True)
+        rows = np.sort(end - 1 - first_from_end)
+        if markets is not None:
+            wanted = [self._market_lookup[k] for k in (m.strip().lower() for m in markets) if k in self._market_lookup]
+            rows = rows[np.isin(self.market_id[rows], wanted)]
+        return self._quotes(cid, rows)
+
+    def prices_on(self, crop: str, on: Union[str, date]) -> List[PriceQuote]:
+        """All markets' prices for ``crop`` on one date."""
+        cid, lo, hi = self._crop_slice(crop)
+        if cid is None:
+            return []
+        days = self.day[lo:hi]
+        day = to_day(on)
+        start = lo + int(np.searchsorted(days, day, side="left"))
+        end = lo + int(np.searchsorted(days, day, side="right"))
+        return self._quotes(cid, np.arange(start, end))
+
+    def history(
+        self,
+        crop: str,
+        start: Optional[Union[str, date]] = None,
+        end: Optional[Union[str, date]] = None
+    ) -> Dict[str, np.ndarray]:
+        """Column views (day, market_id, price_paise) of a crop's rows in [start, end]."""
+        cid, lo, hi = self._crop_slice(crop)
+        if cid is not None:
+            days = self.day[lo:hi]
+            if end is not None:
+                hi = lo + int(np.searchsorted(days, to_day(end), side="right"))
+            if start is not None:
+                lo = lo + int(np.searchsorted(days, to_day(start), side="left"))
+        else:
+            lo = hi = 0
+        return {
+            "day": self.day[lo:hi],
+            "market_id": self.market_id[lo:hi],
+            "price_paise": self.price_paise[lo:hi],
+        }
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def save(self, directory: str) -> None:
+        """Write one .npy file per column plus the crop / market names."""
+        os.makedirs(directory, exist_ok=True)
+        for name in _COLUMNS:
+            np.save(os.path.join(directory, f"{name}.npy"), getattr(self, name))
+        with open(os.path.join(directory, "names.json"), "w", encoding="utf-8") as f:
+            json.dump({"crops": self.crops, "markets": self.markets}, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, directory: str, mmap: bool = True) -> "MarketPriceStore":
+        """Open a saved store; with ``mmap`` the columns are paged in from disk on demand."""
+        with open(os.path.join(directory, "names.json"), encoding="utf-8") as f:
+            names = json.load(f)
+        columns = {
+            name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r" if mmap else None)
+            for name in _COLUMNS
+        }
+        return cls(names["crops"], names["markets"], columns)
+
+
+class _ColumnBuilder:
+    """Accumulates rows as id columns, flushing to NumPy every ``chunk_rows`` rows."""
+
+    def __init__(self, crops: Optional[List[str]] = None, markets: Optional[List[str]] = None,
+                 chunk_rows: int = CSV_CHUNK_ROWS):
+        self.crops: List[str] = []
+        self.markets: List[str] = []
+        self._crop_ids: Dict[str, int] = {}
+        self._market_ids: Dict[str, int] = {}
+        for name in crops or ():
+            self.crop_index(name)
+        for name in markets or ():
+            self.market_index(name)
+        self.chunk_rows = chunk_rows
+        self._chunks: List[np.ndarray] = []
+        self._pending: List[tuple] = []
+
+    def crop_index(self, name: str) -> int:
+        key = name.strip().lower()
+        idx = self._crop_ids.get(key)
+        if idx is None:
+            idx = self._crop_ids[key] = len(self.crops)
+            self.crops.append(name.strip())
+        return idx
+
+    def market_index(self, name: str) -> int:
+        key = name.strip().lower()
+        idx = self._market_ids.get(key)
+        if idx is None:
+            idx = self._market_ids[key] = len(self.markets)
+            self.markets.append(name.strip())
+        return idx
+
+    def add(self, market: str, crop: str, day: int, price_rs_per_kg: float) -> None:
+        self._pending.append((
+            self.crop_index(crop), day, self.market_index(market), int(round(float(price_rs_per_kg) * 100))
+        ))
+        if len(self._pending) >= self.chunk_rows:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self._pending:
+            self._chunks.append(np.array(self._pending, dtype=np.int64).reshape(-1, 4))
+            self._pending = []
+
+    def build(self) -> MarketPriceStore:
+        self._flush()
+        rows = np.concatenate(self._chunks) if self._chunks else np.empty((0, 4), dtype=np.int64)
+        return MarketPriceStore.from_columns(self.crops, self.markets, rows[:, 0], rows[:, 1], rows[:, 2], rows[:, 3])
+
+
+def _header_map(header: List[str]) -> Dict[str, int]:
+    normalised = [h.strip().lower().replace(" ", "_") for h in header]
+    found = {}
+    for column, aliases in CSV_COLUMNS.items():
+        for alias in aliases:
+            if alias in normalised:
+                found[column] = normalised.index(alias)
+                break
+    missing = [c for c in ("market", "crop", "date") if c not in found]
+    if missing or ("price_rs_per_kg" not in found and "price_rs_per_quintal" not in found):
+        raise ValueError(f"CSV header is missing columns: {', '.join(missing) or 'price'}.")
+    return found
+
+
+def load_csv(source: Union[str, io.TextIOBase], chunk_rows: int = CSV_CHUNK_ROWS) -> MarketPriceStore:
+    """Stream a price dump (path or open text file) into a store.
+
+    Rows are parsed one at a time and packed into NumPy chunks, so memory
+    stays near the size of the final columns. Malformed rows (missing
+    fields, a blank market or crop, an unrecognised date, or a price that is
+    not a finite, non-negative number) are skipped and counted in the
+    store's ``skipped_rows``.
+    """
+    if isinstance(source, str):
+        with open(source, newline="", encoding="utf-8") as f:
+            return load_csv(f, chunk_rows)
+
+    reader = csv.reader(source)
+    cols = _header_map(next(reader))
+    market_col, crop_col, date_col = cols["market"], cols["crop"], cols["date"]
+    per_quintal = "price_rs_per_kg" not in cols
+    price_col = cols["price_rs_per_quintal"] if per_quintal else cols["price_rs_per_kg"]
+
+    builder = _ColumnBuilder(chunk_rows=chunk_rows)
+    days: Dict[str, int] = {}
+    skipped = 0
+    for row in reader:
+        if not row:
+            continue
+        try:
+            market, crop, text = row[market_col], row[crop_col], row[date_col]
+            price = float(row[price_col]) / (100 if per_quintal else 1)
+            # NaN fails both comparisons
+            if not (market.strip() and crop.strip() and 0 <= price <= MAX_PRICE_RS_PER_KG):
+                raise ValueError(row)
+            day = days.get(text)
+            if day is None:
+                day = days[text] = to_day(text)
+        except (ValueError, IndexError):
+            skipped += 1
+            continue
+        builder.add(market, crop, day, price)
+    store = builder.build()
+    store.skipped_rows = skipped
+    return store
@@ -0,0 +1,164 @@
+"""
+Shared Result Cache for the Advisory Services
+Memoizes the pure advisory functions (crop advice, fertilizer, irrigation,
+growth, market) behind a bounded LRU with optional TTL.
+
+Arguments are normalised (case, whitespace, district aliases) and the
+function is called with the normalised values. Results are shared between
+callers, so result dataclasses are frozen and lists are stored as tuples.
+"""
+
+import functools
+import inspect
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+# Common alternate names for Kerala districts -> official name
+DISTRICT_ALIASES = {
+    "trivandrum": "Thiruvananthapuram",
+    "tvm": "Thiruvananthapuram",
+    "quilon": "Kollam",
+    "alleppey": "Alappuzha",
+    "cochin": "Ernakulam",
+    "kochi": "Ernakulam",
+    "trichur": "Thrissur",
+    "palghat": "Palakkad",
+    "calicut": "Kozhikode",
+    "cannanore": "Kannur",
+    "kasargod": "Kasaragod",
+    "kasargode": "Kasaragod",
+}
+
+
+def normalize_label(value: str) -> str:
+    """Collapse whitespace and title-case free text such as crop or season names."""
+    return " ".join(str(value).split()).title()
+
+
+def normalize_option(value: str) -> str:
+    """Collapse whitespace and lower-case a fixed option such as soil type or stage."""
+    return " ".join(str(value).split()).lower()
+
+
+def normalize_district(value: str) -> str:
+    """Official district name for common aliases; otherwise a tidy title-cased label."""
+    label = normalize_label(value)
+    return DISTRICT_ALIASES.get(label.lower(), label)
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+class MemoCache:
+    """Thread-safe LRU of at most ``maxsize`` entries, each optionally expiring after ``ttl`` seconds."""
+
+    def __init__(self, name: str, maxsize: int, ttl: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: tuple):
+        """Return ``(True, value)`` on a hit, ``(False, None)`` on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at is None or expires_at > self._clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, value
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+            return False, None
+
+    def put(self, key: tuple, value: Any) -> None:
+        with self._lock:
+            expires_at = self._clock() + self.ttl if self.ttl is not None else None
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+# All memoized services, by name
+CACHES: Dict[str, MemoCache] = {}
+
+
+def memoize(name: str, normalizers: Optional[Dict[str, Callable]] = None,
+            maxsize: int = 1024, ttl: Optional[float] = None):
+    """Decorator that caches a pure service function.
+
+    ``normalizers`` maps parameter names to functions applied to that
+    argument before it is used as part of the key (and passed to the function).
+    """
+    normalizers = normalizers or {}
+
+    def decorator(func):
+        signature = inspect.signature(func)
+        cache = CACHES[name] = MemoCache(name, maxsize, ttl)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            for param, normalize in normalizers.items():
+                bound.arguments[param] = normalize(bound.arguments[param])
+            key = tuple(bound.arguments.values())
+
+            found, value = cache.get(key)
+            if found:
+                return value
+            value = _freeze(func(*bound.args, **bound.kwargs))
+            cache.put(key, value)
+            return value
+
+        wrapper.cache = cache
+        wrapper.uncached = func
+        return wrapper
+
+    return decorator
+
+
+def invalidate(name: Optional[str] = None) -> None:
+    """Clear one service's cache (by name) or, with no name, all of them."""
+    if name is None:
+        for cache in CACHES.values():
+            cache.clear()
+    elif name in CACHES:
+        CACHES[name].clear()
+
+
+def cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Counters for every memoized service."""
+    return {name: cache.stats() for name, cache in CACHES.items()}
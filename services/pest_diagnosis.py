@@ -1,5 +1,6 @@
 from dataclasses import dataclass
-from typing import List, Dict
+from collections import deque
+from typing import List, Dict, Iterable, Tuple
 
 
 @dataclass
@@ -65,6 +66,81 @@ _DISEASE_DB: List[Dict] = [
 ]
 
 
+class _KeywordAutomaton:
+    """Aho-Corasick matcher over a fixed set of keywords.
+
+    One left-to-right pass over a text reports every keyword that occurs in
+    it, however many keywords there are.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+        self.keywords: List[str] = []
+
+        for kw in keywords:
+            state = 0
+            for ch in kw:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                    self._goto[state][ch] = nxt
+                state = nxt
+            self._out[state].append(len(self.keywords))
+            self.keywords.append(kw)
+
+        # Breadth-first pass to fill failure links and merge outputs.
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def find(self, text: str) -> set:
+        """Return the ids of all keywords found in ``text``."""
+        found = set()
+        state = 0
+        goto, fail, out = self._goto, self._fail, self._out
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                found.update(out[state])
+        return found
+
+
+# Per-crop matchers built from _DISEASE_DB: {crop: (automaton, keyword_id -> entry positions)}
+_CROP_MATCHERS: Dict[str, Tuple[_KeywordAutomaton, List[List[int]]]] = {}
+
+
+def _build_matchers() -> None:
+    """(Re)build the per-crop keyword automata from _DISEASE_DB."""
+    by_crop: Dict[str, Dict[str, List[int]]] = {}
+    for pos, entry in enumerate(_DISEASE_DB):
+        keyword_entries = by_crop.setdefault(entry["crop"], {})
+        for kw in entry["keywords"]:
+            # A keyword listed twice for the same entry counts twice, as before.
+            keyword_entries.setdefault(kw, []).append(pos)
+
+    _CROP_MATCHERS.clear()
+    for crop, keyword_entries in by_crop.items():
+        automaton = _KeywordAutomaton(keyword_entries.keys())
+        _CROP_MATCHERS[crop] = (automaton, [keyword_entries[kw] for kw in automaton.keywords])
+
+
+_build_matchers()
+
+
 def diagnose_pest_mock(crop: str, symptom_text: str) -> PestDiagnosis:
     """Simple rule-based diagnosis using crop + text symptoms.
 
@@ -77,16 +153,18 @@ def diagnose_pest_mock(crop: str, symptom_text: str) -> PestDiagnosis:
     best_match = None
     best_score = 0
 
-    for entry in _DISEASE_DB:
-        if entry["crop"] != ckey:
-            continue
-        score = 0
-        for kw in entry["keywords"]:
-            if kw in text:
-                score += 1
-        if score > best_score:
-            best_score = score
-            best_match = entry
+    matcher = _CROP_MATCHERS.get(ckey)
+    if matcher:
+        automaton, keyword_entries = matcher
+        scores: Dict[int, int] = {}
+        for kw_id in automaton.find(text):
+            for pos in keyword_entries[kw_id]:
+                scores[pos] = scores.get(pos, 0) + 1
+        # Earliest entry wins ties, matching the original DB-order scan.
+        for pos in sorted(scores):
+            if scores[pos] > best_score:
+                best_score = scores[pos]
+                best_match = _DISEASE_DB[pos]
 
     if best_match and best_score > 0:
         confidence = 60 + best_score * 10
@@ -108,3 +186,8 @@ def diagnose_pest_mock(crop: str, symptom_text: str) -> PestDiagnosis:
         organic_option="Use neem oil spray (2-3 ml/litre) as a general preventive measure and improve field hygiene.",
         caution="Avoid random pesticide mixing. Always follow recommended dose and safety instructions.",
     )
+
+
+def diagnose_pest_batch(cases: Iterable[Tuple[str, str]]) -> List[PestDiagnosis]:
+    """Diagnose many (crop, symptom_text) pairs, in the given order."""
+    return [diagnose_pest_mock(crop, symptoms) for crop, symptoms in cases]
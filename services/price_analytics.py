@@ -0,0 +1,270 @@
+"""
+Market Price Trend Analytics
+Rolling mean, rolling volatility, seasonal index and a short-horizon
+forecast for every crop's price series, all computed with whole-array
+NumPy operations over a crops x days matrix.
+
+The matrix holds, for each crop and day, the sum and count of market
+prices. Only those two arrays are updated when a new price dump arrives
+(``refresh``), and only for the crop / day cells it touches. The derived
+series are then recomputed for the affected crops, which is cheap next to
+re-reading millions of price rows.
+"""
+
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from services.market_store import MarketPriceStore, from_day
+
+ROLLING_WINDOW_DAYS = 30
+# Fewer daily returns than this in the window gives no volatility figure.
+MIN_VOLATILITY_RETURNS = 5
+
+# Seasonal indices need at least a year of history to separate season from trend.
+SEASONAL_MIN_DAYS = 365
+
+FORECAST_DAYS = 7
+FORECAST_FIT_DAYS = 60
+MIN_FORECAST_POINTS = 7
+
+# Annualised volatility (%) upper bounds for the "low" and "medium" levels
+VOLATILITY_LEVELS = (("low", 25.0), ("medium", 50.0))
+
+
+def volatility_level(volatility_pct: float) -> str:
+    for level, upper in VOLATILITY_LEVELS:
+        if volatility_pct < upper:
+            return level
+    return "high"
+
+
+@dataclass(frozen=True)
+class PriceTrend:
+    crop: str
+    as_of: date
+    latest_price_rs_per_kg: float
+    rolling_mean_rs_per_kg: float
+    volatility_pct: Optional[float]
+    volatility_level: Optional[str]
+    seasonal_index: Tuple[float, ...]  # January .. December, 1.0 = average month
+    forecast_rs_per_kg: Tuple[float, ...]  # the next FORECAST_DAYS days
+
+
+# ----------------------------------------------------------------------
+# Vectorized series helpers; every function works on all rows at once.
+# ----------------------------------------------------------------------
+
+def _forward_fill(a: np.ndarray) -> np.ndarray:
+    idx = np.where(np.isnan(a), 0, np.arange(a.shape[1]))
+    np.maximum.accumulate(idx, axis=1, out=idx)
+    return a[np.arange(a.shape[0])[:, None], idx]
+
+
+def _rolling_sum(a: np.ndarray, window: int) -> np.ndarray:
+    c = np.cumsum(a, axis=1)
+    c[:, window:] = c[:, window:] - c[:, :-window]
+    return c
+
+
+def _rolling_mean(a: np.ndarray, window: int) -> np.ndarray:
+    """Mean of the non-missing values in each trailing window (NaN if there are none)."""
+    present = ~np.isnan(a)
+    total = _rolling_sum(np.where(present, a, 0.0), window)
+    count = _rolling_sum(present.astype(np.float64), window)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(count > 0, total / count, np.nan)
+
+
+def _rolling_volatility(a: np.ndarray, window: int) -> np.ndarray:
+    """Annualised % std of daily log returns; returns across missing days are skipped."""
+    log_price = np.log(a)
+    returns = np.full_like(a, np.nan)
+    returns[:, 1:] = log_price[:, 1:] - log_price[:, :-1]
+    present = ~np.isnan(returns)
+    r = np.where(present, returns, 0.0)
+    n = _rolling_sum(present.astype(np.float64), window)
+    s1 = _rolling_sum(r, window)
+    s2 = _rolling_sum(r * r, window)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        var = (s2 - s1 * s1 / n) / (n - 1)
+    vol = np.sqrt(np.clip(var, 0.0, None)) * np.sqrt(365.0) * 100.0
+    return np.where(n >= MIN_VOLATILITY_RETURNS, vol, np.nan)
+
+
+def _seasonal_index(a: np.ndarray, months: np.ndarray) -> np.ndarray:
+    """(rows x 12) ratio of each calendar month's mean price to the average month."""
+    one_hot = np.zeros((a.shape[1], 12))
+    one_hot[np.arange(a.shape[1]), months] = 1.0
+    present = ~np.isnan(a)
+    month_sum = np.where(present, a, 0.0) @ one_hot
+    month_count = present.astype(np.float64) @ one_hot
+    with np.errstate(invalid="ignore", divide="ignore"):
+        month_mean = month_sum / month_count
+        index = month_mean / np.nanmean(np.where(month_count > 0, month_mean, np.nan), axis=1, keepdims=True)
+    index = np.where(np.isfinite(index), index, 1.0)
+    enough = present.sum(axis=1) >= SEASONAL_MIN_DAYS
+    return np.where(enough[:, None], index, 1.0)
+
+
+def _forecast(a: np.ndarray, seasonal: np.ndarray, months: np.ndarray, future_months: np.ndarray) -> np.ndarray:
+    """Log-linear trend over the last FORECAST_FIT_DAYS of the deseasonalised series, reseasonalised."""
+    rows = np.arange(a.shape[0])[:, None]
+    tail = a[:, -FORECAST_FIT_DAYS:] / seasonal[rows, months[None, -FORECAST_FIT_DAYS:]]
+    y = np.log(tail)
+    present = ~np.isnan(y)
+    x = np.broadcast_to(np.arange(tail.shape[1], dtype=np.float64), tail.shape)
+    n = present.sum(axis=1)
+    y0 = np.where(present, y, 0.0)
+    x0 = np.where(present, x, 0.0)
+    sx, sy = x0.sum(axis=1), y0.sum(axis=1)
+    sxx, sxy = (x0 * x0).sum(axis=1), (x0 * y0).sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        slope = (n * sxy - sx * sy) / (n * sxx - sx * sx)
+        intercept = (sy - slope * sx) / n
+    steps = tail.shape[1] - 1 + np.arange(1, len(future_months) + 1)
+    trend = np.exp(intercept[:, None] + slope[:, None] * steps[None, :])
+
+    # Too little recent data for a trend: carry the last known price forward.
+    last = _forward_fill(a)[:, -1]
+    flat = np.broadcast_to(last[:, None], trend.shape) / seasonal[rows, months[None, -1:]]
+    fit_ok = (n >= MIN_FORECAST_POINTS) & np.isfinite(slope)
+    return np.where(fit_ok[:, None], trend, flat) * seasonal[rows, future_months[None, :]]
+
+
+def _months(day0: int, ndays: int) -> np.ndarray:
+    days = np.arange(day0, day0 + ndays).astype("datetime64[D]")
+    return days.astype("datetime64[M]").astype(np.int64) % 12
+
+
+class PriceAnalytics:
+    """Per-crop daily price statistics derived from a MarketPriceStore."""
+
+    def __init__(self, window: int = ROLLING_WINDOW_DAYS):
+        self.window = window
+        self.crops: List[str] = []
+        self._crop_ids: Dict[str, int] = {}
+        self.day0 = 0
+        self.price_sum = np.zeros((0, 0))
+        self.price_count = np.zeros((0, 0), dtype=np.int64)
+        self._derived: Dict[str, np.ndarray] = {}
+
+    @property
+    def ndays(self) -> int:
+        return self.price_sum.shape[1]
+
+    @classmethod
+    def from_store(cls, store: MarketPriceStore, window: int = ROLLING_WINDOW_DAYS) -> "PriceAnalytics":
+        analytics = cls(window)
+        analytics.refresh(store, store)
+        return analytics
+
+    def refresh(self, store: MarketPriceStore, new_prices: MarketPriceStore) -> None:
+        """Update for the crops and dates in ``new_prices``, reading their current rows from ``store``.
+
+        ``store`` must already include ``new_prices`` (see MarketPriceStore.merged_with).
+        """
+        if not len(new_prices):
+            return
+        first = int(new_prices.day.min())
+        last = int(new_prices.day.max())
+        grew = self._ensure_days(first, last)
+
+        touched = []
+        for crop in new_prices.crops:
+            cid = self._crop_ids.get(crop.lower())
+            if cid is None:
+                cid = self._add_crop(crop)
+            touched.append(cid)
+            rows = store.history(crop, from_day(first), from_day(last))
+            col = rows["day"] - first
+            span = slice(first - self.day0, last - self.day0 + 1)
+            self.price_sum[cid, span] = np.bincount(col, weights=rows["price_paise"], minlength=last - first + 1) / 100.0
+            self.price_count[cid, span] = np.bincount(col, minlength=last - first + 1)
+
+        self._recompute(None if grew or not self._derived else np.unique(touched))
+
+    def _add_crop(self, crop: str) -> int:
+        cid = self._crop_ids[crop.lower()] = len(self.crops)
+        self.crops.append(crop)
+        self.price_sum = np.vstack([self.price_sum, np.zeros((1, self.ndays))])
+        self.price_count = np.vstack([self.price_count, np.zeros((1, self.ndays), dtype=np.int64)])
+        for name, values in self._derived.items():
+            self._derived[name] = np.vstack([values, np.full((1,) + values.shape[1:], np.nan)])
+        return cid
+
+    def _ensure_days(self, first: int, last: int) -> bool:
+        """Widen the day axis to cover [first, last]; True if it grew."""
+        if self.ndays == 0:
+            self.day0 = first
+            self.price_sum = np.zeros((len(self.crops), last - first + 1))
+            self.price_count = np.zeros((len(self.crops), last - first + 1), dtype=np.int64)
+            return True
+        before = max(0, self.day0 - first)
+        after = max(0, last - (self.day0 + self.ndays - 1))
+        if not before and not after:
+            return False
+        self.price_sum = np.pad(self.price_sum, ((0, 0), (before, after)))
+        self.price_count = np.pad(self.price_count, ((0, 0), (before, after)))
+        self.day0 -= before
+        return True
+
+    def _recompute(self, crop_ids: Optional[np.ndarray]) -> None:
+        """Derived series for ``crop_ids`` (all crops when None)."""
+        rows = np.arange(len(self.crops)) if crop_ids is None else crop_ids
+        with np.errstate(invalid="ignore", divide="ignore"):
+            daily = self.price_sum[rows] / self.price_count[rows]
+        daily[self.price_count[rows] == 0] = np.nan
+
+        months = _months(self.day0, self.ndays)
+        future_months = _months(self.day0 + self.ndays, FORECAST_DAYS)
+        seasonal = _seasonal_index(daily, months)
+        derived = {
+            "daily": daily,
+            "rolling_mean": _rolling_mean(daily, self.window),
+            "volatility": _rolling_volatility(daily, self.window),
+            "seasonal": seasonal,
+            "forecast": _forecast(daily, seasonal, months, future_months),
+        }
+        if crop_ids is None:
+            self._derived = derived
+        else:
+            for name, values in derived.items():
+                self._derived[name][rows] = values
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def trend(self, crop: str) -> Optional[PriceTrend]:
+        cid = self._crop_ids.get(crop.strip().lower())
+        if cid is None or not self._derived:
+            return None
+        d = self._derived
+        last = _forward_fill(d["daily"][cid:cid + 1])[0]
+        observed = np.flatnonzero(~np.isnan(d["daily"][cid]))
+        if not len(observed):
+            return None
+        end = observed[-1]
+        vol = d["volatility"][cid, end]
+        return PriceTrend(
+            crop=self.crops[cid],
+            as_of=from_day(self.day0 + end),
+            latest_price_rs_per_kg=round(float(last[end]), 2),
+            rolling_mean_rs_per_kg=round(float(d["rolling_mean"][cid, end]), 2),
+            volatility_pct=None if np.isnan(vol) else round(float(vol), 1),
+            volatility_level=None if np.isnan(vol) else volatility_level(float(vol)),
+            seasonal_index=tuple(round(float(v), 3) for v in d["seasonal"][cid]),
+            forecast_rs_per_kg=tuple(round(float(v), 2) for v in d["forecast"][cid])
+        )
+
+    def volatility_by_crop(self) -> Dict[str, float]:
+        """Latest annualised volatility (%) for every crop that has enough history."""
+        result = {}
+        for crop in self.crops:
+            trend = self.trend(crop)
+            if trend is not None and trend.volatility_pct is not None:
+                result[trend.crop] = trend.volatility_pct
+        return result
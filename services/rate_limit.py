@@ -0,0 +1,79 @@
+"""
+Rate Limiting for Kerala Smart Farmer
+Token-bucket limiters with a fixed memory budget.
+"""
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Tuple
+
+
+class TokenBucketLimiter:
+    """Per-key token bucket limiter with bounded memory.
+
+    Each key gets a bucket of ``capacity`` tokens that refills at
+    ``refill_per_second``; a request spends one token. Buckets live in an LRU
+    of at most ``max_keys`` entries, so memory stays fixed no matter how many
+    distinct keys a client sends. Every check is O(1).
+
+    Limits are per process; with several workers each enforces its own share.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        capacity: float,
+        refill_per_second: float,
+        max_keys: int,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.name = name
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.max_keys = max_keys
+        self._clock = clock
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.allowed = 0
+        self.rejected = 0
+        self.evicted_keys = 0
+
+    def allow(self, key: str) -> Tuple[bool, int]:
+        """Spend a token for ``key``.
+
+        Returns ``(allowed, retry_after_seconds)``; retry_after is 0 when allowed.
+        """
+        with self._lock:
+            now = self._clock()
+            state = self._buckets.get(key)
+            if state is None:
+                tokens = self.capacity
+                if len(self._buckets) >= self.max_keys:
+                    self._buckets.popitem(last=False)
+                    self.evicted_keys += 1
+            else:
+                tokens, last = state
+                tokens = min(self.capacity, tokens + (now - last) * self.refill_per_second)
+                self._buckets.move_to_end(key)
+
+            if tokens >= 1:
+                self._buckets[key] = (tokens - 1, now)
+                self.allowed += 1
+                return True, 0
+
+            self._buckets[key] = (tokens, now)
+            self.rejected += 1
+            return False, math.ceil((1 - tokens) / self.refill_per_second)
+
+    def metrics(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "allowed": self.allowed,
+                "rejected": self.rejected,
+                "tracked_keys": len(self._buckets),
+                "max_keys": self.max_keys,
+                "evicted_keys": self.evicted_keys,
+            }
@@ -1,6 +1,8 @@
 from dataclasses import dataclass
 
-@dataclass
+from services.memo import memoize, normalize_label, normalize_option
+
+@dataclass(frozen=True)
 class FertilizerPlan:
     crop: str
     nitrogen_kg: float
@@ -10,6 +12,7 @@ class FertilizerPlan:
     tips: str
 
 
+@memoize("calculate_fertilizer", {"crop": normalize_label, "soil_organic_matter": normalize_option})
 def calculate_fertilizer(crop: str, soil_organic_matter: str, land_size_acres: float) -> FertilizerPlan:
     base_npk = {
         "paddy":  (40, 20, 20),
@@ -0,0 +1,240 @@
+"""
+Gridded Weather Data for Kerala
+Ingests gridded observation and forecast files into .npy arrays that are
+memory-mapped at runtime, together with per-district daily aggregates
+computed once at ingestion.
+
+Source files (one per dataset, ``observed`` and ``forecast``) are either
+    <dataset>.csv  long format: date, lat, lon, rain_mm, rh_pct, tmax_c, tmin_c
+    <dataset>.f32  raw little-endian float32 in (day, variable, lat, lon)
+                   order, described by <dataset>.json (lat0, lon0, step,
+                   nlat, nlon, dates, variables)
+``data/weather/sample`` holds a small sample dataset used when no other
+source is configured.
+
+Each grid cell is assigned to the nearest district centroid within
+DISTRICT_RADIUS_KM; a district's daily value is the mean over its cells.
+"""
+
+import csv
+import json
+import os
+import shutil
+import tempfile
+from bisect import bisect_left
+from dataclasses import asdict, dataclass
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from services.market_geo import DISTRICT_CENTROIDS, haversine_km
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLE_SOURCE_DIR = os.path.join(ROOT, "data", "weather", "sample")
+
+# Where source files are read from and where the ingested arrays are written
+WEATHER_SOURCE_DIR = os.environ.get("AGRIVISION_WEATHER_SOURCE", SAMPLE_SOURCE_DIR)
+WEATHER_DATA_DIR = os.environ.get(
+    "AGRIVISION_WEATHER_DIR", os.path.join(tempfile.gettempdir(), "agrivision-weather")
+)
+
+WEATHER_VARIABLES = ("rain_mm", "rh_pct", "tmax_c", "tmin_c")
+DATASETS = ("observed", "forecast")
+DISTRICTS = tuple(DISTRICT_CENTROIDS)
+
+DISTRICT_RADIUS_KM = 35.0
+
+
+@dataclass(frozen=True)
+class GridSpec:
+    lat0: float
+    lon0: float
+    step: float
+    nlat: int
+    nlon: int
+
+    def cell_centers(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(lat, lon) of every cell, each shaped (nlat, nlon)."""
+        lats = self.lat0 + self.step * np.arange(self.nlat)
+        lons = self.lon0 + self.step * np.arange(self.nlon)
+        return np.meshgrid(lats, lons, indexing="ij")
+
+    def cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        i = int(round((lat - self.lat0) / self.step))
+        j = int(round((lon - self.lon0) / self.step))
+        if not (0 <= i < self.nlat and 0 <= j < self.nlon):
+            raise ValueError(f"({lat}, {lon}) is outside the weather grid.")
+        return i, j
+
+
+# ----------------------------------------------------------------------
+# Source readers: each returns (grid, dates, values[day, variable, lat, lon])
+# ----------------------------------------------------------------------
+
+def read_grid_csv(path: str) -> Tuple[GridSpec, List[str], np.ndarray]:
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        header = [h.strip().lower() for h in next(reader)]
+        cols = [header.index(name) for name in ("date", "lat", "lon", *WEATHER_VARIABLES)]
+        rows = [[row[c] for c in cols] for row in reader if row]
+
+    columns = list(zip(*rows))
+    dates = sorted(set(columns[0]))
+    lat = np.array(columns[1], dtype=np.float64)
+    lon = np.array(columns[2], dtype=np.float64)
+    lats, lons = np.unique(lat), np.unique(lon)
+    step = float(np.min(np.diff(lats))) if len(lats) > 1 else float(np.min(np.diff(lons)))
+    grid = GridSpec(float(lats[0]), float(lons[0]), step,
+                    int(round((lats[-1] - lats[0]) / step)) + 1, int(round((lons[-1] - lons[0]) / step)) + 1)
+
+    day_index = {d: k for k, d in enumerate(dates)}
+    day = np.array([day_index[d] for d in columns[0]])
+    i = np.rint((lat - grid.lat0) / step).astype(int)
+    j = np.rint((lon - grid.lon0) / step).astype(int)
+    values = np.full((len(dates), len(WEATHER_VARIABLES), grid.nlat, grid.nlon), np.nan, dtype=np.float32)
+    for v in range(len(WEATHER_VARIABLES)):
+        values[day, v, i, j] = np.array(columns[3 + v], dtype=np.float32)
+    return grid, dates, values
+
+
+def read_grid_binary(path: str) -> Tuple[GridSpec, List[str], np.ndarray]:
+    with open(os.path.splitext(path)[0] + ".json", encoding="utf-8") as f:
+        header = json.load(f)
+    grid = GridSpec(header["lat0"], header["lon0"], header["step"], header["nlat"], header["nlon"])
+    shape = (len(header["dates"]), len(header["variables"]), grid.nlat, grid.nlon)
+    raw = np.memmap(path, dtype="<f4", mode="r", shape=shape)
+    # Reorder the file's variables to WEATHER_VARIABLES.
+    order = [header["variables"].index(name) for name in WEATHER_VARIABLES]
+    return grid, list(header["dates"]), np.asarray(raw[:, order], dtype=np.float32)
+
+
+def _read_source(source_dir: str, dataset: str) -> Tuple[GridSpec, List[str], np.ndarray]:
+    binary = os.path.join(source_dir, f"{dataset}.f32")
+    if os.path.exists(binary):
+        return read_grid_binary(binary)
+    return read_grid_csv(os.path.join(source_dir, f"{dataset}.csv"))
+
+
+# ----------------------------------------------------------------------
+# Ingestion
+# ----------------------------------------------------------------------
+
+def district_weights(grid: GridSpec) -> np.ndarray:
+    """(nlat * nlon, n_districts) weights; each district's column sums to 1."""
+    lat, lon = grid.cell_centers()
+    cells = list(zip(lat.ravel(), lon.ravel()))
+    distance = np.array([[haversine_km(cell, DISTRICT_CENTROIDS[d]) for d in DISTRICTS] for cell in cells])
+    nearest = distance.argmin(axis=1)
+    weights = np.zeros_like(distance)
+    inside = distance[np.arange(len(cells)), nearest] <= DISTRICT_RADIUS_KM
+    weights[np.flatnonzero(inside), nearest[inside]] = 1.0
+    return weights / np.maximum(weights.sum(axis=0, keepdims=True), 1.0)
+
+
+def district_means(values: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """(n_districts, days, variables) means over each district's cells, ignoring missing cells."""
+    flat = values.reshape(values.shape[0] * values.shape[1], -1)
+    present = ~np.isnan(flat)
+    total = np.where(present, flat, 0.0) @ weights
+    share = present @ weights
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = np.where(share > 0, total / share, np.nan)
+    return means.reshape(values.shape[0], values.shape[1], -1).transpose(2, 0, 1).astype(np.float32)
+
+
+def _swap_in(staging: str, output_dir: str) -> None:
+    """Make ``output_dir`` a symlink to ``staging`` with one rename, then drop the previous version."""
+    previous = os.path.realpath(output_dir) if os.path.islink(output_dir) else None
+    link = staging + ".link"
+    try:
+        os.symlink(staging, link, target_is_directory=True)
+    except (OSError, NotImplementedError):
+        # No symlinks (e.g. Windows without developer mode): two renames, with a
+        # moment in between where the dataset is missing rather than half-written.
+        old = staging + ".old"
+        if os.path.lexists(output_dir):
+            os.replace(output_dir, old)
+        os.replace(staging, output_dir)
+        shutil.rmtree(old, ignore_errors=True)
+        return
+    if os.path.isdir(output_dir) and not os.path.islink(output_dir):
+        # A plain folder from an earlier layout cannot be replaced by a link.
+        previous = staging + ".old"
+        os.replace(output_dir, previous)
+    os.replace(link, output_dir)
+    if previous and previous != staging:
+        shutil.rmtree(previous, ignore_errors=True)
+
+
+def ingest(source_dir: str = WEATHER_SOURCE_DIR, output_dir: str = WEATHER_DATA_DIR) -> None:
+    """Convert the source files into memory-mappable arrays plus district aggregates.
+
+    Each run writes to its own sibling folder, and ``output_dir`` is then
+    switched to it atomically, so readers never see a half-written dataset
+    and concurrent runs do not write over each other.
+    """
+    output_dir = os.path.abspath(output_dir.rstrip(os.sep))
+    parent = os.path.dirname(output_dir)
+    os.makedirs(parent, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=os.path.basename(output_dir) + "-", dir=parent)
+
+    meta = {"variables": list(WEATHER_VARIABLES), "districts": list(DISTRICTS), "datasets": {}}
+    for dataset in DATASETS:
+        grid, dates, values = _read_source(source_dir, dataset)
+        np.save(os.path.join(staging, f"{dataset}.npy"), values)
+        np.save(os.path.join(staging, f"{dataset}_districts.npy"), district_means(values, district_weights(grid)))
+        meta["datasets"][dataset] = {"grid": asdict(grid), "dates": dates}
+    with open(os.path.join(staging, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+
+    _swap_in(staging, output_dir)
+
+
+def _source_mtime(source_dir: str) -> float:
+    return max((os.path.getmtime(os.path.join(source_dir, name)) for name in os.listdir(source_dir)), default=0.0)
+
+
+class WeatherGrid:
+    """Memory-mapped gridded data and district aggregates for the ingested datasets."""
+
+    def __init__(self, directory: str):
+        with open(os.path.join(directory, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        self.variables: Dict[str, int] = {name: i for i, name in enumerate(meta["variables"])}
+        self.districts: Dict[str, int] = {name.lower(): i for i, name in enumerate(meta["districts"])}
+        self.grids = {name: GridSpec(**info["grid"]) for name, info in meta["datasets"].items()}
+        self.dates = {name: info["dates"] for name, info in meta["datasets"].items()}
+        self.cells = {
+            name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r") for name in meta["datasets"]
+        }
+        # (n_districts, days, variables)
+        self.district_daily = {
+            name: np.load(os.path.join(directory, f"{name}_districts.npy"), mmap_mode="r") for name in meta["datasets"]
+        }
+
+    def value(self, dataset: str, variable: str, day: int, lat: float, lon: float) -> float:
+        """One cell's value; a single array read."""
+        i, j = self.grids[dataset].cell(lat, lon)
+        return float(self.cells[dataset][day, self.variables[variable], i, j])
+
+    def district_series(self, dataset: str, district: str, variable: str) -> np.ndarray:
+        """Daily district means of one variable (a view into the memory map)."""
+        return self.district_daily[dataset][self.districts[district.lower()], :, self.variables[variable]]
+
+    def window(self, dataset: str, start: date, days: int) -> slice:
+        """Day indexes of ``dataset`` that fall in ``days`` days from ``start``; empty if it has none."""
+        dates = self.dates[dataset]
+        first = bisect_left(dates, start.isoformat())
+        last = bisect_left(dates, (start + timedelta(days=days)).isoformat())
+        return slice(first, last)
+
+
+@lru_cache(maxsize=1)
+def open_weather_grid() -> WeatherGrid:
+    """The ingested dataset, (re)ingesting first if it is missing or older than its source files."""
+    meta = os.path.join(WEATHER_DATA_DIR, "meta.json")
+    if not os.path.exists(meta) or os.path.getmtime(meta) < _source_mtime(WEATHER_SOURCE_DIR):
+        ingest()
+    return WeatherGrid(WEATHER_DATA_DIR)
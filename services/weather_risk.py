@@ -1,6 +1,25 @@
+"""
+Weather & Risk Alerts for Kerala Districts
+Alerts are derived from the ingested weather grids (services/weather_grid.py):
+forecast rainfall, humidity and temperature and the past week's observed
+rainfall, averaged per district, are compared with per-crop thresholds.
+
+Every district x crop combination is evaluated at once when the data is
+loaded (and again when the date changes), so a request is a dictionary
+lookup plus one list index. When no ingested forecast covers today, the
+latest forecast window is used and the alerts are flagged as stale.
+"""
+
 from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from services.memo import normalize_district
+from services.weather_grid import DISTRICTS, open_weather_grid
 
-@dataclass
+@dataclass(frozen=True)
 class WeatherAlert:
     type: str
     level: str
@@ -13,31 +32,155 @@ KERALA_DISTRICTS = [
     "malappuram", "kozhikode", "wayanad", "kannur", "kasaragod"
 ]
 
+# Forecast days from today the rain / humidity / heat checks look ahead
+ALERT_WINDOW_DAYS = 3
+
+# Observed days before today the waterlogging check adds up
+OBSERVED_WINDOW_DAYS = 7
+
+# heavy_rain / moderate_rain: forecast rain over ALERT_WINDOW_DAYS (mm); 195 mm is
+# three days of IMD "heavy rain" (64.5 mm/day). disease_rh: mean forecast
+# humidity (%) that favours fungal disease. saturated: observed rain over the
+# past week (mm) beyond which fields are waterlogged. heat: forecast max (C).
+DEFAULT_WEATHER_THRESHOLDS = {
+    "heavy_rain_mm": 195.0, "moderate_rain_mm": 15.0, "disease_rh_pct": 92.0,
+    "saturated_mm": 500.0, "heat_tmax_c": 36.0,
+}
+
+CROP_WEATHER_THRESHOLDS = {
+    "Paddy": {"saturated_mm": 800.0, "heat_tmax_c": 38.0},
+    "Banana": {"disease_rh_pct": 87.0},
+    "Pepper": {"disease_rh_pct": 87.0},
+    "Cardamom": {"disease_rh_pct": 87.0},
+    "Vegetables": {"heavy_rain_mm": 150.0, "disease_rh_pct": 88.0, "saturated_mm": 400.0},
+    "Tapioca": {"saturated_mm": 400.0},
+}
+
+_HEAVY_RAIN = WeatherAlert(
+    type="rain",
+    level="high",
+    message="Heavy rainfall expected in the next 3 days. Avoid waterlogging in fields."
+)
+_MODERATE_RAIN = WeatherAlert(
+    type="rain",
+    level="medium",
+    message="Moderate showers likely. Plan irrigation accordingly."
+)
+_WATERLOGGING = WeatherAlert(
+    type="waterlogging",
+    level="high",
+    message="Soils are already saturated from the past week's rain. Clear field drains before the next spell."
+)
+_DISEASE = WeatherAlert(
+    type="disease-risk",
+    level="medium",
+    message="High humidity may trigger fungal diseases. Monitor leaves for spots."
+)
+_HEAT = WeatherAlert(
+    type="heat",
+    level="medium",
+    message="Hot days ahead. Irrigate in the early morning or evening and mulch to save soil moisture."
+)
+
+
+@dataclass(frozen=True)
+class _AlertTable:
+    crops: Dict[str, int]  # lower-case crop -> row; unknown crops use the last row (defaults)
+    alerts: Tuple[Tuple[Tuple[WeatherAlert, ...], ...], ...]  # [district][crop]
+    built_for: date  # the day the table was evaluated for
+    forecast_from: date  # first forecast day the checks looked at
+    stale: bool  # no forecast covered built_for, so the latest ingested window was used
+
+
+def _thresholds(name: str) -> np.ndarray:
+    """(crops + 1) thresholds for one check; the last entry is the default."""
+    values = [CROP_WEATHER_THRESHOLDS[c].get(name, DEFAULT_WEATHER_THRESHOLDS[name]) for c in CROP_WEATHER_THRESHOLDS]
+    return np.array(values + [DEFAULT_WEATHER_THRESHOLDS[name]])
+
+
+def build_alert_table(today: Optional[date] = None) -> _AlertTable:
+    """Evaluate every district x crop against the thresholds in one pass of array comparisons.
 
-def get_mock_weather_and_risk(district: str, crop: str) -> list[WeatherAlert]:
+    The checks use forecast days from ``today`` (default: the current date)
+    and observations from the week before it. If the forecast has no day
+    from ``today`` on, the window at the start of the latest forecast is
+    used instead and the table is marked stale.
+    """
+    today = today or date.today()
+    grid = open_weather_grid()
+    start = today
+    ahead = grid.window("forecast", start, ALERT_WINDOW_DAYS)
+    stale = ahead.start == ahead.stop and bool(grid.dates["forecast"])
+    if stale:
+        start = date.fromisoformat(grid.dates["forecast"][0])
+        ahead = grid.window("forecast", start, ALERT_WINDOW_DAYS)
+    past = grid.window("observed", start - timedelta(days=OBSERVED_WINDOW_DAYS), OBSERVED_WINDOW_DAYS)
+    forecast = np.array([
+        [grid.district_series("forecast", d, v)[ahead] for v in ("rain_mm", "rh_pct", "tmax_c")]
+        for d in DISTRICTS
+    ])  # (districts, 3, days)
+    rain = forecast[:, 0].sum(axis=1)[:, None]
+    if forecast.shape[2]:
+        rh = forecast[:, 1].mean(axis=1)[:, None]
+        tmax = forecast[:, 2].max(axis=1)[:, None]
+    else:  # NaN fails every threshold
+        rh = tmax = np.full((len(DISTRICTS), 1), np.nan)
+    observed_rain = np.array([grid.district_series("observed", d, "rain_mm")[past].sum() for d in DISTRICTS])[:, None]
+
+    heavy = rain >= _thresholds("heavy_rain_mm")
+    checks = (
+        (heavy, _HEAVY_RAIN),
+        (~heavy & (rain >= _thresholds("moderate_rain_mm")), _MODERATE_RAIN),
+        (heavy & (observed_rain >= _thresholds("saturated_mm")), _WATERLOGGING),
+        (rh >= _thresholds("disease_rh_pct"), _DISEASE),
+        (tmax >= _thresholds("heat_tmax_c"), _HEAT),
+    )
+    alerts = tuple(
+        tuple(
+            tuple(alert for mask, alert in checks if mask[d, c])
+            for c in range(len(CROP_WEATHER_THRESHOLDS) + 1)
+        )
+        for d in range(len(DISTRICTS))
+    )
+    crops = {crop.lower(): i for i, crop in enumerate(CROP_WEATHER_THRESHOLDS)}
+    return _AlertTable(crops=crops, alerts=alerts, built_for=today, forecast_from=start, stale=stale)
+
+
+_table: Optional[_AlertTable] = None
+_DISTRICT_ROWS = {d.lower(): i for i, d in enumerate(DISTRICTS)}
+
+
+def reload_weather() -> None:
+    """Re-read the weather data (e.g. after a new forecast was ingested) and rebuild all alerts."""
+    global _table
+    open_weather_grid.cache_clear()
+    _table = build_alert_table()
+
+
+def _current_table() -> _AlertTable:
+    """The alert table, rebuilt once the day it was evaluated for is over."""
+    global _table
+    if _table is None or _table.built_for != date.today():
+        _table = build_alert_table()
+    return _table
+
+
+def weather_status() -> Dict:
+    """Which forecast the alerts are based on, and whether it is out of date."""
+    table = _current_table()
+    return {"forecast_from": table.forecast_from.isoformat(), "stale": table.stale}
+
+
+def get_weather_and_risk(district: str, crop: str) -> List[WeatherAlert]:
+    district = normalize_district(district).lower()
     # Check if district is in Kerala
-    if district.lower().strip() not in KERALA_DISTRICTS:
+    if district not in KERALA_DISTRICTS:
         return []  # Return empty list for non-Kerala districts
 
-    alerts = []
-
-    if district.lower() in ["idukki", "wayanad"]:
-        alerts.append(WeatherAlert(
-            type="rain",
-            level="high",
-            message="Heavy rainfall expected in the next 3 days. Avoid waterlogging in fields."
-        ))
-        if crop.lower() in ["pepper", "cardamom", "banana"]:
-            alerts.append(WeatherAlert(
-                type="disease-risk",
-                level="medium",
-                message="High humidity may trigger fungal diseases. Monitor leaves for spots."
-            ))
-    else:
-        alerts.append(WeatherAlert(
-            type="rain",
-            level="medium",
-            message="Moderate showers likely. Plan irrigation accordingly."
-        ))
-
-    return alerts
+    table = _current_table()
+    column = table.crops.get(" ".join(crop.split()).lower(), len(CROP_WEATHER_THRESHOLDS))
+    return list(table.alerts[_DISTRICT_ROWS[district]][column])
+
+
+# Name used before alerts were derived from weather data
+get_mock_weather_and_risk = get_weather_and_risk
@@ -0,0 +1,12 @@
+document.addEventListener('DOMContentLoaded', function () {
+var toastEl = document.querySelector('.flash-toast');
+if (toastEl && window.bootstrap && bootstrap.Alert) {
+setTimeout(function () {
+try {
+var alert = bootstrap.Alert.getOrCreateInstance(toastEl);
+alert.close();
+} catch (e) {
+}
+}, 4000);
+}
+});
\ No newline at end of file
@@ -0,0 +1,206 @@
+let currentMobile = '';
+let isNewUser = true;
+let countdownInterval = null;
+document.getElementById('mobile-form').addEventListener('submit', async function(e) {
+e.preventDefault();
+const mobile = document.getElementById('mobile-number').value.trim();
+if (!/^[6-9][0-9]{9}$/.test(mobile)) {
+showAlert('Please enter a valid 10-digit mobile number starting with 6, 7, 8, or 9.', 'danger');
+return;
+}
+const btn = document.getElementById('send-otp-btn');
+const spinner = document.getElementById('spinner1');
+btn.disabled = true;
+spinner.style.display = 'inline-block';
+try {
+const formData = new FormData();
+formData.append('mobile', mobile);
+formData.append('action', 'send_otp');
+const response = await fetch('/auth/send-otp', {
+method: 'POST',
+body: formData
+});
+const data = await response.json();
+if (data.success) {
+currentMobile = mobile;
+isNewUser = !data.is_registered;
+document.getElementById('display-mobile').textContent = '+91 ******' + mobile.slice(-4);
+const badge = document.getElementById('user-type-badge');
+if (isNewUser) {
+badge.textContent = '🆕 New User - Sign Up';
+badge.className = 'user-type-badge badge-new';
+document.getElementById('name-input-section').style.display = 'block';
+} else {
+badge.textContent = '👋 Welcome Back - Login';
+badge.className = 'user-type-badge badge-existing';
+document.getElementById('name-input-section').style.display = 'none';
+}
+if (data.otp_for_demo) {
+document.getElementById('demo-otp-value').textContent = data.otp_for_demo;
+}
+goToStep2();
+showAlert(data.message, 'success');
+startResendCountdown();
+} else {
+showAlert(data.message, 'danger');
+}
+} catch (error) {
+showAlert('Network error. Please try again.', 'danger');
+} finally {
+btn.disabled = false;
+spinner.style.display = 'none';
+}
+});
+document.getElementById('otp-form').addEventListener('submit', async function(e) {
+e.preventDefault();
+const otpInputs = document.querySelectorAll('.otp-input');
+let otp = '';
+otpInputs.forEach(input => otp += input.value);
+if (otp.length !== 6) {
+showAlert('Please enter the complete 6-digit OTP.', 'danger');
+return;
+}
+const name = document.getElementById('user-name').value.trim();
+const btn = document.getElementById('verify-otp-btn');
+const spinner = document.getElementById('spinner2');
+btn.disabled = true;
+spinner.style.display = 'inline-block';
+try {
+const formData = new FormData();
+formData.append('mobile', currentMobile);
+formData.append('otp', otp);
+formData.append('name', name);
+formData.append('action', 'verify_otp');
+const response = await fetch('/auth/verify-otp', {
+method: 'POST',
+body: formData
+});
+const data = await response.json();
+if (data.success) {
+showAlert(data.message, 'success');
+setTimeout(() => {
+window.location.href = '/';
+}, 1000);
+} else {
+showAlert(data.message, 'danger');
+otpInputs.forEach(input => input.value = '');
+otpInputs[0].focus();
+}
+} catch (error) {
+showAlert('Network error. Please try again.', 'danger');
+} finally {
+btn.disabled = false;
+spinner.style.display = 'none';
+}
+});
+const otpInputs = document.querySelectorAll('.otp-input');
+otpInputs.forEach((input, index) => {
+input.addEventListener('input', function(e) {
+this.value = this.value.replace(/[^0-9]/g, '');
+if (this.value && index < otpInputs.length - 1) {
+otpInputs[index + 1].focus();
+}
+});
+input.addEventListener('keydown', function(e) {
+if (e.key === 'Backspace' && !this.value && index > 0) {
+otpInputs[index - 1].focus();
+}
+});
+input.addEventListener('paste', function(e) {
+e.preventDefault();
+const pastedData = e.clipboardData.getData('text').replace(/[^0-9]/g, '');
+for (let i = 0; i < Math.min(pastedData.length, 6); i++) {
+otpInputs[i].value = pastedData[i];
+}
+const focusIndex = Math.min(pastedData.length, 5);
+otpInputs[focusIndex].focus();
+});
+});
+document.getElementById('mobile-number').addEventListener('input', function(e) {
+this.value = this.value.replace(/[^0-9]/g, '');
+});
+function goToStep2() {
+document.getElementById('step1-form').style.display = 'none';
+document.getElementById('step2-form').style.display = 'block';
+document.getElementById('step1-indicator').classList.remove('active');
+document.getElementById('step1-indicator').classList.add('completed');
+document.getElementById('divider1').classList.add('completed');
+document.getElementById('step2-indicator').classList.add('active');
+document.querySelector('.otp-input').focus();
+}
+function goBackToStep1() {
+document.getElementById('step1-form').style.display = 'block';
+document.getElementById('step2-form').style.display = 'none';
+document.getElementById('step1-indicator').classList.add('active');
+document.getElementById('step1-indicator').classList.remove('completed');
+document.getElementById('divider1').classList.remove('completed');
+document.getElementById('step2-indicator').classList.remove('active');
+clearCountdown();
+document.querySelectorAll('.otp-input').forEach(input => input.value = '');
+}
+function startResendCountdown() {
+let seconds = 60;
+const resendBtn = document.getElementById('resend-btn');
+const countdown = document.getElementById('countdown');
+resendBtn.classList.add('disabled');
+resendBtn.innerHTML = 'Resend in <span id="countdown">60</span>s';
+countdown.textContent = seconds;
+countdownInterval = setInterval(() => {
+seconds--;
+document.getElementById('countdown').textContent = seconds;
+if (seconds <= 0) {
+clearInterval(countdownInterval);
+resendBtn.classList.remove('disabled');
+resendBtn.innerHTML = 'Resend OTP';
+}
+}, 1000);
+}
+function clearCountdown() {
+if (countdownInterval) {
+clearInterval(countdownInterval);
+countdownInterval = null;
+}
+}
+async function resendOTP() {
+const resendBtn = document.getElementById('resend-btn');
+if (resendBtn.classList.contains('disabled')) return;
+try {
+const formData = new FormData();
+formData.append('mobile', currentMobile);
+formData.append('action', 'send_otp');
+const response = await fetch('/auth/send-otp', {
+method: 'POST',
+body: formData
+});
+const data = await response.json();
+if (data.success) {
+if (data.otp_for_demo) {
+document.getElementById('demo-otp-value').textContent = data.otp_for_demo;
+}
+showAlert('New OTP sent successfully!', 'success');
+startResendCountdown();
+} else {
+showAlert(data.message, 'danger');
+}
+} catch (error) {
+showAlert('Failed to resend OTP. Please try again.', 'danger');
+}
+}
+function showAlert(message, type) {
+const container = document.getElementById('alert-container');
+const alertHtml = `
+<div class="alert alert-${type} alert-custom alert-dismissible fade show" role="alert">
+<i class="fas fa-${type === 'success' ? 'check-circle' : 'exclamation-circle'} me-2"></i>
+${message}
+<button type="button" class="btn-close" data-bs-dismiss="alert"></button>
+</div>
+`;
+container.innerHTML = alertHtml;
+setTimeout(() => {
+const alert = container.querySelector('.alert');
+if (alert) {
+alert.classList.remove('show');
+setTimeout(() => container.innerHTML = '', 300);
+}
+}, 5000);
+}
\ No newline at end of file